@@ -0,0 +1,80 @@
+import os
+import re
+import time
+import shutil
+import subprocess
+import tempfile
+from PyQt6.QtGui import QColor
+from ui.burning import RENDITION_BITRATES, build_subtitle_filter, burn_config_from_settings
+from benchmarks.bench_srt import synthetic_srt
+from benchmarks.common import SAMPLE_VIDEO
+
+# Encoders worth comparing, with the options the burn page would use
+ENCODERS = {
+    "libx264": ["-crf", "23", "-preset", "fast"],
+    "h264_videotoolbox": ["-b:v", f"{RENDITION_BITRATES[1080]}k"],
+    "hevc_videotoolbox": ["-b:v", f"{RENDITION_BITRATES[1080]}k"],
+    "libx265": ["-crf", "28", "-preset", "fast"],
+}
+
+FRAME_RE = re.compile(r"frame=\s*(\d+)")
+
+class _DefaultSettings:
+    """Stand-in for QSettings that returns every default, so results don't depend on saved styling."""
+
+    def value(self, key, default=None):
+        return default
+
+def default_burn_config():
+    """The burn page's default styling, in the shape pipeline.burn_stage passes to BurningWorker."""
+    _, config = burn_config_from_settings(_DefaultSettings())
+    config["font_color"] = QColor(config["font_color"])
+    return config
+
+def available_encoders():
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-encoders"],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    listed = {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1}
+    return [name for name in ENCODERS if name in listed]
+
+def burn(video_path, vf, encoder, seconds):
+    """Encode `seconds` of burned video to the null muxer; returns (frames, wall)."""
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-i", video_path, "-t", str(seconds),
+        "-vf", vf, "-c:v", encoder,
+    ] + ENCODERS[encoder] + ["-pix_fmt", "yuv420p", "-an", "-f", "null", "-"]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(tail[0])
+    frames = FRAME_RE.findall(result.stderr)
+    return (int(frames[-1]) if frames else 0), wall
+
+def run(writer, seconds=20, encoders=None, video_path=SAMPLE_VIDEO):
+    if not shutil.which("ffmpeg"):
+        writer.skip("burn", "ffmpeg not found")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        srt_path = os.path.join(tmp, "bench.srt")
+        with open(srt_path, "w", encoding="utf-8") as f:
+            f.write(synthetic_srt(max(10, seconds // 2)))
+        # Same filter chain as the burn page with default styling
+        vf = build_subtitle_filter(srt_path, default_burn_config(), video_path)
+
+        for encoder in encoders or available_encoders():
+            try:
+                frames, wall = burn(video_path, vf, encoder, seconds)
+            except RuntimeError as e:
+                writer.skip("burn", f"{encoder}: {e}")
+                continue
+            writer.write("burn", "burn_clip", {
+                "encoder": encoder, "clip_s": seconds, "filter": vf.split("=", 1)[0],
+            }, {
+                "wall_s": round(wall, 3),
+                "frames": frames,
+                "fps": round(frames / wall, 1) if wall else None,
+                "speed_x": round(seconds / wall, 2) if wall else None,
+            })
@@ -0,0 +1,66 @@
+import os
+import random
+import tempfile
+from subtitles import format_srt_time, parse_srt, write_srt, resegment
+from benchmarks.common import measure, summarize
+
+WORDS = ("the quick brown fox jumps over a lazy dog while seven hungry "
+         "zebras quietly watch from behind an old wooden fence").split()
+
+def synthetic_srt(cues, seed=0):
+    """SRT text with `cues` two-line cues of random words."""
+    rng = random.Random(seed)
+    parts = []
+    t = 0.0
+    for i in range(1, cues + 1):
+        start, end = t, t + rng.uniform(1.0, 4.0)
+        t = end + rng.uniform(0.05, 0.5)
+        line1 = " ".join(rng.choices(WORDS, k=rng.randint(3, 7)))
+        line2 = " ".join(rng.choices(WORDS, k=rng.randint(3, 7)))
+        parts.append(f"{i}\n{format_srt_time(start)} --> {format_srt_time(end)}\n{line1}\n{line2}\n")
+    return "\n".join(parts)
+
+def synthetic_segments(segments, seed=0):
+    """whisper-style segments with word timestamps, for resegment()."""
+    rng = random.Random(seed)
+    result = []
+    t = 0.0
+    for i in range(segments):
+        words = []
+        for word in rng.choices(WORDS, k=rng.randint(8, 20)):
+            duration = rng.uniform(0.15, 0.5)
+            words.append({"word": " " + word, "start": t, "end": t + duration, "probability": 0.9})
+            t += duration + rng.uniform(0.0, 0.1)
+        if rng.random() < 0.5:
+            words[-1]["word"] += "."
+        t += rng.uniform(0.2, 1.5)
+        result.append({
+            "id": i, "start": words[0]["start"], "end": words[-1]["end"],
+            "text": "".join(w["word"] for w in words), "words": words,
+        })
+    return result
+
+def run(writer, cues=100_000, repeat=3):
+    content = synthetic_srt(cues)
+    size = len(content.encode("utf-8"))
+
+    times, parsed = measure(lambda: parse_srt(content), repeat)
+    metrics = summarize(times)
+    metrics["cues_per_s"] = round(len(parsed) / metrics["median_s"])
+    writer.write("srt", "parse", {"cues": cues, "bytes": size}, metrics)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.srt")
+        times, _ = measure(lambda: write_srt(parsed, path), repeat)
+        metrics = summarize(times)
+        metrics["cues_per_s"] = round(len(parsed) / metrics["median_s"])
+        metrics["mb_per_s"] = round(os.path.getsize(path) / 1024 / 1024 / metrics["median_s"], 1)
+        writer.write("srt", "write", {"cues": cues}, metrics)
+
+    # Roughly three cues per whisper segment
+    segments = synthetic_segments(max(1, cues // 3))
+    times, resegmented = measure(lambda: resegment(segments), repeat)
+    metrics = summarize(times)
+    metrics["cues_out"] = len(resegmented)
+    metrics["segments_per_s"] = round(len(segments) / metrics["median_s"])
+    writer.write("srt", "resegment", {"segments": len(segments)}, metrics)
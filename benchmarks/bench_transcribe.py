@@ -0,0 +1,89 @@
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+from instrumentation import Recorder
+from model_inventory import standard_filename, get_inventory
+from transcription_backends import BACKENDS, get_backend
+from benchmarks.common import SAMPLE_VIDEO
+
+# profile -> (backend, use the int8 checkpoint)
+PROFILES = {
+    "whisper": ("whisper", False),
+    "whisper-int8": ("whisper", True),
+    "faster-whisper": ("faster-whisper", False),
+}
+
+def extract_clip(video_path, seconds, target_path):
+    """16 kHz mono WAV of the first `seconds` of the video, so decode cost is comparable."""
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", "-i", video_path, "-t", str(seconds),
+         "-ac", "1", "-ar", "16000", target_path],
+        check=True
+    )
+
+def resolve_model(model, quantized):
+    """Model name (or checkpoint path) the backend should load, or None if missing."""
+    if not quantized:
+        return model
+    # The inventory names int8 checkpoints "<stem>-int8"
+    entry = get_inventory().find(standard_filename(model)[:-len(".pt")] + "-int8")
+    return entry["path"] if entry and entry["present"] else None
+
+def stage_times(recorder, stage):
+    return [s["wall_s"] for s in recorder.all() if s["stage"] == stage]
+
+def run(writer, models=("tiny", "base"), profiles=("whisper",), seconds=60, repeat=2,
+        video_path=SAMPLE_VIDEO, threads=None):
+    if not shutil.which("ffmpeg"):
+        writer.skip("transcribe", "ffmpeg not found")
+        return
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = os.path.join(tmp, "clip.wav")
+        extract_clip(video_path, seconds, clip)
+
+        for profile in profiles:
+            if profile not in PROFILES:
+                writer.skip("transcribe", f"unknown profile '{profile}' (choose from {', '.join(PROFILES)})")
+                continue
+            backend_name, quantized = PROFILES[profile]
+            if not BACKENDS[backend_name].is_available():
+                writer.skip("transcribe", f"{profile}: backend not installed")
+                continue
+            backend = get_backend(backend_name)
+            options = {"language": "en"}
+            if backend_name == "whisper":
+                options["fp16"] = False # CPU; avoids the fp16 warning
+
+            for model in models:
+                model_ref = resolve_model(model, quantized)
+                if model_ref is None:
+                    writer.skip("transcribe", f"{profile}/{model}: no int8 checkpoint (quantize it on the Models page)")
+                    continue
+
+                recorder = Recorder()
+                metrics = recorder.job("benchmark", f"{profile}/{model}")
+                for _ in range(repeat):
+                    # First run includes the model load; later runs hit the cache
+                    backend.transcribe(model_ref, clip, metrics=metrics, **options)
+
+                inference = stage_times(recorder, "inference")
+                rtfs = [s["realtime_factor"] for s in recorder.all()
+                        if s["stage"] == "inference" and s["realtime_factor"]]
+                load = stage_times(recorder, "model_load")
+                spans = recorder.all()
+                writer.write("transcribe", "transcribe_clip", {
+                    "model": model, "profile": profile, "clip_s": seconds,
+                    "threads": threads or "default",
+                }, {
+                    "runs": repeat,
+                    "model_load_s": round(load[0], 3) if load else None,
+                    "inference_median_s": round(statistics.median(inference), 3),
+                    "realtime_factor": round(statistics.median(rtfs), 4) if rtfs else None,
+                    "process_peak_rss_mb": max(s["process_peak_rss_mb"] for s in spans),
+                })
@@ -0,0 +1,42 @@
+import os
+import time
+import tempfile
+from ui.translation import TranslationWorker
+from benchmarks.bench_srt import synthetic_srt
+from benchmarks.mock_openai import MockOpenAIServer
+
+def run(writer, cues=500, latencies=(0.05, 0.3), jitter=0.0, tokens_per_second=0, drop_rate=0.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        srt_path = os.path.join(tmp, "bench.srt")
+        with open(srt_path, "w", encoding="utf-8") as f:
+            f.write(synthetic_srt(cues))
+
+        for latency in latencies:
+            server = MockOpenAIServer(latency=latency, jitter=jitter, tokens_per_second=tokens_per_second,
+                                      drop_rate=drop_rate).start()
+            try:
+                results = []
+                errors = []
+                worker = TranslationWorker("mock-key", srt_path, "Uppercase", model="mock", base_url=server.base_url)
+                worker.finished.connect(results.append)
+                worker.error.connect(errors.append)
+
+                start = time.perf_counter()
+                worker.run() # Synchronously, on this thread
+                wall = time.perf_counter() - start
+            finally:
+                server.stop()
+
+            if errors:
+                writer.skip("translation", f"latency {latency}: {errors[0]}")
+                continue
+            translated = results[0] if results else ""
+            writer.write("translation", "translate_srt", {
+                "cues": cues, "latency_s": latency, "jitter_s": jitter, "tokens_per_second": tokens_per_second,
+                "drop_rate": drop_rate,
+            }, {
+                "wall_s": round(wall, 3),
+                "cues_per_s": round(cues / wall, 1),
+                "requests": server.requests,
+                "output_bytes": len(translated.encode("utf-8")),
+            })
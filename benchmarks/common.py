@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_VIDEO = os.path.join(REPO_ROOT, "1219_1770106322.mp4")
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+def git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+def environment():
+    """Where the numbers came from; stored with every result."""
+    env = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import torch
+        env["torch"] = torch.__version__
+        env["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    return env
+
+def measure(fn, repeat=3):
+    """Wall times of `repeat` calls to fn(); the last return value is kept."""
+    times = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    return times, value
+
+def summarize(times):
+    return {
+        "runs": len(times),
+        "min_s": round(min(times), 4),
+        "median_s": round(statistics.median(times), 4),
+    }
+
+class ResultWriter:
+    """Appends one JSON object per measurement to a .jsonl file.
+
+    Each line has suite, name, params (what was measured) and metrics (the
+    numbers); the same (suite, name, params) across runs is comparable.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.env = environment()
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, suite, name, params, metrics):
+        record = {
+            "suite": suite,
+            "name": name,
+            "params": params,
+            "metrics": metrics,
+            "started_at": self.started_at,
+            "env": self.env,
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        shown = ", ".join(f"{k}={v}" for k, v in metrics.items())
+        print(f"[{suite}] {name} {params}: {shown}", flush=True)
+        return record
+
+    def skip(self, suite, reason):
+        print(f"[{suite}] skipped: {reason}", file=sys.stderr, flush=True)
+
+def result_key(record):
+    return (record["suite"], record["name"], json.dumps(record["params"], sort_keys=True))
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,178 @@
+"""Local stand-in for an OpenAI-compatible /chat/completions endpoint.
+
+Replies after a fixed latency (plus optional jitter) with the user message
+"translated" by upper-casing it. JSON batch requests ({"segments": [...]})
+get {"translations": [...]} back by ID; drop_rate leaves some out to
+exercise re-requesting missing IDs. stream=True requests get SSE chunks
+paced by tokens_per_second.
+
+    python -m benchmarks.mock_openai --port 8099 --latency 0.3
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RATE_LIMIT_REQUESTS = 10000 # Advertised in x-ratelimit-* headers
+STREAM_CHUNK_CHARS = 16 # Characters per streamed delta
+
+class MockOpenAIServer:
+    def __init__(self, port=0, latency=0.2, jitter=0.0, tokens_per_second=0, drop_rate=0.0, json_mode=True):
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second # 0 = reply is instant after latency
+        self.drop_rate = drop_rate # Share of batch segments left out of each reply
+        self.json_mode = json_mode # False = reject response_format like some local servers
+        self.requests = 0
+        self.aborted = 0 # Streams the client hung up on
+        self.batches = [] # (IDs asked for, IDs returned) per JSON batch request
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self.make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive, like the real APIs
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                request = json.loads(body)
+                with server.lock:
+                    server.requests += 1
+                if "response_format" in request and not server.json_mode:
+                    data = json.dumps({"error": {"message": "response_format is not supported"}}).encode("utf-8")
+                    self.send_response(400)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+                if request.get("stream"):
+                    self.stream_reply(request)
+                    return
+                reply = server.reply_for(request)
+                data = json.dumps(reply).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("x-ratelimit-limit-requests", str(RATE_LIMIT_REQUESTS))
+                self.send_header("x-ratelimit-remaining-requests", str(max(0, RATE_LIMIT_REQUESTS - server.requests)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def stream_reply(self, request):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for chunk in server.stream_chunks(request):
+                        self.write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.write_chunk(b"data: [DONE]\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    with server.lock:
+                        server.aborted += 1
+                    self.close_connection = True
+
+            def write_chunk(self, data):
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def stream_chunks(self, request):
+        """chat.completion.chunk dicts: the first after the latency, the rest paced by tokens_per_second."""
+        messages = request.get("messages", [])
+        completion = self.translate(messages[-1]["content"] if messages else "")
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        base = {"id": f"chatcmpl-mock-{self.requests}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": request.get("model", "mock")}
+        for start in range(0, len(completion), STREAM_CHUNK_CHARS):
+            piece = completion[start:start + STREAM_CHUNK_CHARS]
+            if self.tokens_per_second:
+                time.sleep(len(piece) / 4 / self.tokens_per_second)
+            yield dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+        yield dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+
+    def reply_for(self, request):
+        messages = request.get("messages", [])
+        text = messages[-1]["content"] if messages else ""
+        completion = self.translate(text)
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = len(completion) // 4
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if self.tokens_per_second:
+            delay += completion_tokens / self.tokens_per_second
+        time.sleep(delay)
+
+        return {
+            "id": f"chatcmpl-mock-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def translate(self, text):
+        try:
+            segments = json.loads(text)["segments"]
+        except (ValueError, TypeError, KeyError):
+            return text.upper()
+        kept = [s for s in segments if random.random() >= self.drop_rate]
+        with self.lock:
+            self.batches.append(([s["id"] for s in segments], [s["id"] for s in kept]))
+        return json.dumps({"translations": [{"id": s["id"], "text": s["text"].upper()} for s in kept]},
+                          ensure_ascii=False)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before each reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, up to this many seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=0, help="Simulated generation speed (0 = instant)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of batch segments left out of replies")
+    parser.add_argument("--no-json-mode", action="store_true", help="Reject response_format with HTTP 400")
+    args = parser.parse_args()
+    server = MockOpenAIServer(args.port, args.latency, args.jitter, args.tokens_per_second,
+                              args.drop_rate, not args.no_json_mode)
+    print(f"Mock OpenAI server on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,102 @@
+"""Run the benchmark suites and append the results to a .jsonl file.
+
+    python -m benchmarks.run                          # every suite, default sizes
+    python -m benchmarks.run --suite srt --cues 100000
+    python -m benchmarks.run --suite transcribe --models tiny,base --profiles whisper,whisper-int8
+    python -m benchmarks.run --baseline benchmarks/results/before.jsonl
+
+Run from the repository root. Each line of the output is one measurement:
+{suite, name, params, metrics, started_at, env}.
+"""
+import os
+import sys
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.common import RESULTS_DIR, SAMPLE_VIDEO, ResultWriter, load_results, result_key
+
+SUITES = ["srt", "translation", "transcribe", "burn"]
+
+def split_list(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+def compare(baseline_path, current_path):
+    """Print the change of every numeric metric present in both files."""
+    baseline = {result_key(r): r for r in load_results(baseline_path)}
+    print(f"\nCompared with {baseline_path}:")
+    for record in load_results(current_path):
+        old = baseline.get(result_key(record))
+        if not old:
+            continue
+        for metric, value in record["metrics"].items():
+            before = old["metrics"].get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(before, (int, float)) or not before:
+                continue
+            change = (value - before) / before * 100
+            print(f"  {record['suite']}/{record['name']} {record['params']} {metric}: "
+                  f"{before} -> {value} ({change:+.1f}%)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MacWhisper benchmark suite")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"Comma-separated subset of {SUITES}")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.jsonl)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--video", default=SAMPLE_VIDEO)
+    # srt
+    parser.add_argument("--cues", type=int, default=100_000, help="Synthetic cues for the SRT suite")
+    # translation
+    parser.add_argument("--translation-cues", type=int, default=500)
+    parser.add_argument("--latency", default="0.05,0.3", help="Mock server latencies (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0)
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of segments the mock leaves out of replies")
+    # transcribe
+    parser.add_argument("--models", default="tiny,base")
+    parser.add_argument("--profiles", default="whisper", help="whisper, whisper-int8, faster-whisper")
+    parser.add_argument("--clip-seconds", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    # burn
+    parser.add_argument("--burn-seconds", type=int, default=20)
+    parser.add_argument("--encoders", default=None, help="Default: every supported encoder ffmpeg has")
+    args = parser.parse_args(argv)
+
+    suites = split_list(args.suite)
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suite(s): {', '.join(sorted(unknown))}")
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".jsonl")
+    writer = ResultWriter(output)
+
+    # Imported lazily so e.g. the SRT suite runs without torch installed
+    if "srt" in suites:
+        from benchmarks import bench_srt
+        bench_srt.run(writer, cues=args.cues, repeat=args.repeat)
+    if "translation" in suites:
+        from benchmarks import bench_translation
+        bench_translation.run(writer, cues=args.translation_cues,
+                              latencies=[float(v) for v in split_list(args.latency)],
+                              jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+                              drop_rate=args.drop_rate)
+    if "transcribe" in suites:
+        from benchmarks import bench_transcribe
+        bench_transcribe.run(writer, models=split_list(args.models), profiles=split_list(args.profiles),
+                             seconds=args.clip_seconds, repeat=args.repeat,
+                             video_path=args.video, threads=args.threads)
+    if "burn" in suites:
+        from benchmarks import bench_burn
+        bench_burn.run(writer, seconds=args.burn_seconds,
+                       encoders=split_list(args.encoders) if args.encoders else None,
+                       video_path=args.video)
+
+    print(f"\nResults written to {output}")
+    if args.baseline:
+        compare(args.baseline, output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+KILL_GRACE = 2 # Seconds between SIGTERM and SIGKILL for a cancelled process group
+POLL_INTERVAL = 0.1
+
+class Cancelled(Exception):
+    """Raised inside a job once its CancelToken has been cancelled."""
+
+class CancelToken:
+    """Stop flag shared by everything one job runs.
+
+    Calling the token returns whether it has been cancelled, so it can be
+    passed anywhere a should_stop callable is expected. Work that blocks
+    without polling (a request waiting on the server, an ffmpeg process)
+    registers a callback with on_cancel() that interrupts it from the
+    thread calling cancel().
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.callbacks = []
+
+    def __call__(self):
+        return self.event.is_set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass # Interrupting is best effort; the flag is already set
+
+    def raise_if_cancelled(self):
+        if self.event.is_set():
+            raise Cancelled("Cancelled.")
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds; returns True as soon as the token is cancelled."""
+        return self.event.wait(timeout)
+
+    @contextmanager
+    def on_cancel(self, callback):
+        """Run callback if the token is cancelled while the block runs (or already was)."""
+        with self.lock:
+            fire = self.event.is_set()
+            if not fire:
+                self.callbacks.append(callback)
+        if fire:
+            callback()
+        try:
+            yield
+        finally:
+            with self.lock:
+                if callback in self.callbacks:
+                    self.callbacks.remove(callback)
+
+def on_cancel(should_stop, callback):
+    """should_stop.on_cancel(callback) for a CancelToken; plain should_stop callables can only be polled."""
+    if isinstance(should_stop, CancelToken):
+        return should_stop.on_cancel(callback)
+    return nullcontext()
+
+def interruptible_sleep(seconds, should_stop):
+    """time.sleep that returns early once should_stop() turns true."""
+    if isinstance(should_stop, CancelToken):
+        should_stop.wait(seconds)
+        return
+    deadline = time.monotonic() + seconds
+    while not should_stop() and time.monotonic() < deadline:
+        time.sleep(max(0, min(POLL_INTERVAL, deadline - time.monotonic())))
+
+def call_cancellable(fn, should_stop, discard=None):
+    """Return fn(), but raise Cancelled as soon as should_stop() turns true.
+
+    For blocking calls that can't be interrupted from outside (an HTTP
+    request waiting on the server): fn runs on a helper thread which is
+    abandoned on cancel. If it still returns a result, discard(result) is
+    called on it (e.g. closing a streamed response so its pooled
+    connection is released).
+    """
+    done = threading.Event()
+    lock = threading.Lock()
+    outcome = {}
+
+    def target():
+        try:
+            result = fn()
+        except BaseException as e:
+            outcome["error"] = e
+        else:
+            with lock:
+                outcome["result"] = result
+                abandoned = outcome.get("abandoned", False)
+            if abandoned and discard:
+                discard(result)
+        finally:
+            done.set()
+
+    threading.Thread(target=target, daemon=True).start()
+    while not done.wait(POLL_INTERVAL):
+        if should_stop():
+            with lock:
+                outcome["abandoned"] = True
+                arrived = "result" in outcome
+            if arrived and discard:
+                discard(outcome["result"]) # Came back just as we gave up
+            raise Cancelled("Cancelled.")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+def shutdown_socket(sock):
+    """Wake a thread blocked reading sock (closing it from another thread doesn't)."""
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass # Already closed
+
+def signal_group(process, sig):
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass # Already gone
+
+def terminate_group(process, grace=KILL_GRACE):
+    """SIGTERM the process and everything it spawned; SIGKILL whatever is left after grace seconds.
+
+    Doesn't wait, so it is safe to call from the GUI thread.
+    """
+    if process.poll() is not None:
+        return
+    signal_group(process, signal.SIGTERM)
+
+    def kill_if_alive():
+        if process.poll() is None:
+            signal_group(process, signal.SIGKILL)
+
+    timer = threading.Timer(grace, kill_if_alive)
+    timer.daemon = True
+    timer.start()
+
+@contextmanager
+def process_group(cmd, should_stop=None, **popen_args):
+    """Popen cmd as the leader of a new process group.
+
+    The whole group is terminated when should_stop (a CancelToken) is
+    cancelled, and killed if the block exits while it is still running.
+    """
+    if os.name == "posix":
+        popen_args["start_new_session"] = True
+    process = subprocess.Popen(cmd, **popen_args)
+    try:
+        with on_cancel(should_stop, lambda: terminate_group(process)):
+            yield process
+    finally:
+        if process.poll() is None:
+            signal_group(process, signal.SIGKILL)
+            process.wait()
+        if process.stdout:
+            process.stdout.close()
+
+def remove_quietly(*paths):
+    for path in paths:
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
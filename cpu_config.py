@@ -0,0 +1,96 @@
+import os
+import threading
+from contextlib import contextmanager
+from PyQt6.QtCore import QSettings
+
+_slots_lock = threading.Lock()
+_active_slots = set()
+
+def parse_cpu_list(text):
+    """'0-3,6' -> [0, 1, 2, 3, 6]; blank or 'auto' -> []."""
+    cpus = set()
+    text = (text or "").strip().lower()
+    if not text or text == "auto":
+        return []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.update(range(int(lo), int(hi) + 1))
+        elif part:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+@contextmanager
+def transcription_slot():
+    """Reserve the lowest free slot number for the duration of a job."""
+    with _slots_lock:
+        slot = 0
+        while slot in _active_slots:
+            slot += 1
+        _active_slots.add(slot)
+    try:
+        yield slot
+    finally:
+        with _slots_lock:
+            _active_slots.discard(slot)
+
+def resolve_thread_config(slot):
+    """Turn the Settings values into concrete thread counts / CPU set for a job.
+
+    The CPUs (the affinity list, or every CPU when it is blank or 'auto')
+    are split evenly between the configured number of concurrent jobs (or
+    the number actually running, if higher) and this job gets the share for
+    its slot, so concurrent jobs never oversubscribe the cores. 0 threads
+    means "the size of that share".
+    """
+    settings = QSettings("MacWhisper", "Config")
+    intra = int(settings.value("torch_intra_threads", 0))
+    inter = int(settings.value("torch_interop_threads", 0))
+    concurrent = int(settings.value("concurrent_transcriptions", 1))
+    pinned = parse_cpu_list(settings.value("cpu_affinity", ""))
+
+    with _slots_lock:
+        jobs = max(1, concurrent, len(_active_slots))
+
+    pool = pinned or available_cpus()
+    share = max(1, len(pool) // jobs)
+    # More jobs than CPUs wraps around, so slots past the end still get a single core
+    start = ((slot % jobs) * share) % len(pool)
+    cpus = pool[start:start + share]
+    if not pinned and (jobs == 1 or not hasattr(os, "sched_setaffinity")):
+        cpus = [] # Auto with a single job (or no affinity support): leave placement to the OS
+
+    return {
+        "intra_threads": intra or share,
+        "interop_threads": inter or max(1, min(4, share // 2)),
+        "cpus": cpus,
+    }
+
+def apply_thread_config(config, log=None):
+    """Apply a resolved config to the calling (worker) thread."""
+    log = log or (lambda msg: None)
+    import torch
+
+    # OpenMP thread counts are per calling thread, so this doesn't touch other jobs
+    torch.set_num_threads(config["intra_threads"])
+    try:
+        torch.set_num_interop_threads(config["interop_threads"])
+    except RuntimeError:
+        # Only settable once per process, before any inter-op work has run
+        pass
+
+    if config["cpus"]:
+        if hasattr(os, "sched_setaffinity"):
+            # pid 0 is the calling thread on Linux
+            os.sched_setaffinity(0, config["cpus"])
+        else:
+            log("CPU affinity isn't supported on this platform; ignoring it.")
+
+    log(f"CPU threads: intra-op {config['intra_threads']}, inter-op {torch.get_num_interop_threads()}"
+        + (f", CPUs {config['cpus']}" if config["cpus"] else ""))
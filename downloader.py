@@ -0,0 +1,229 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import requests
+from cancellation import on_cancel, shutdown_socket
+
+CHUNK_SIZE = 1024 * 1024 # 1 MB writes
+PARALLEL_THRESHOLD = 64 * 1024 * 1024 # Split files larger than this across connections
+DEFAULT_CONNECTIONS = 4
+PROGRESS_INTERVAL = 0.25 # Seconds between progress callbacks
+CHECKPOINT_INTERVAL = 1.0 # Seconds between fsync + resume-state saves per connection
+
+class DownloadCancelled(Exception):
+    pass
+
+def expected_sha256_from_url(url):
+    """Whisper's model URLs embed the SHA-256 as a path segment."""
+    m = re.search(r"/([0-9a-f]{64})/", url)
+    return m.group(1) if m else None
+
+def sha256_of(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class _Progress:
+    """Thread-safe byte counter that reports at most every PROGRESS_INTERVAL."""
+
+    def __init__(self, total, already, callback):
+        self.total = total
+        self.done = already
+        self.callback = callback
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.start_bytes = already
+        self.last_report = 0
+
+    def add(self, n, force=False):
+        with self.lock:
+            self.done += n
+            now = time.monotonic()
+            if not self.callback or (not force and now - self.last_report < PROGRESS_INTERVAL):
+                return
+            self.last_report = now
+            elapsed = max(now - self.started, 1e-6)
+            rate = (self.done - self.start_bytes) / elapsed
+            self.callback(self.done, self.total, rate)
+
+def download_file(url, target_path, expected_sha256=None, progress=None,
+                  connections=DEFAULT_CONNECTIONS, should_stop=None, log=None):
+    """Download url to target_path via "<target>.part", resuming where possible.
+
+    Large files on servers that accept ranges are fetched over several
+    connections. The result is SHA-256 verified (when a hash is known) and
+    renamed into place atomically. progress(done, total, bytes_per_sec) is
+    called from worker threads. Cancelling (should_stop, or a CancelToken
+    which also interrupts reads mid-chunk) raises DownloadCancelled and
+    keeps the .part file so the next attempt resumes.
+    """
+    log = log or (lambda msg: None)
+    should_stop = should_stop or (lambda: False)
+    part_path = target_path + ".part"
+    state_path = part_path + ".json"
+    os.makedirs(os.path.dirname(os.path.abspath(target_path)), exist_ok=True)
+
+    session = requests.Session()
+    try:
+        head = session.head(url, allow_redirects=True, timeout=30)
+        total = int(head.headers.get("content-length", 0)) if head.ok else 0
+        ranges_ok = head.ok and head.headers.get("accept-ranges", "").lower() == "bytes"
+
+        if ranges_ok and total >= PARALLEL_THRESHOLD and connections > 1:
+            _download_parallel(session, url, part_path, state_path, total, connections, progress, should_stop, log)
+        else:
+            _download_single(session, url, part_path, total, progress, should_stop, log)
+    except Exception as e:
+        if should_stop() and not isinstance(e, DownloadCancelled):
+            # The read failed because cancelling closed the connection under it
+            raise DownloadCancelled("Download cancelled.") from None
+        raise
+    finally:
+        session.close()
+
+    if expected_sha256:
+        log("Verifying SHA-256 checksum...")
+        actual = sha256_of(part_path)
+        if actual != expected_sha256:
+            os.remove(part_path)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            raise ValueError(f"Checksum mismatch for {os.path.basename(target_path)}: "
+                             f"expected {expected_sha256}, got {actual}. The partial file was removed.")
+
+    os.replace(part_path, target_path)
+    if os.path.exists(state_path):
+        os.remove(state_path)
+    return target_path
+
+def _interrupt(response):
+    """Cancel callback that unblocks a read on this response's socket (held by urllib3's http.client response)."""
+    try:
+        sock = response.raw._fp.fp.raw._sock
+    except AttributeError:
+        sock = None # Unknown internals; the per-chunk check still stops it
+    return lambda: shutdown_socket(sock)
+
+def _download_single(session, url, part_path, total, progress, should_stop, log):
+    existing = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {"Range": f"bytes={existing}-"} if existing else {}
+
+    with session.get(url, stream=True, headers=headers, timeout=30) as response, \
+            on_cancel(should_stop, _interrupt(response)):
+        if response.status_code == 416:
+            # Already have everything the server can give us
+            return
+        response.raise_for_status()
+
+        if existing and response.status_code == 206:
+            log(f"Resuming download at {existing/1024/1024:.1f} MB")
+            mode = 'ab'
+        else:
+            existing = 0
+            mode = 'wb'
+        if not total:
+            total = existing + int(response.headers.get("content-length", 0))
+
+        counter = _Progress(total, existing, progress)
+        with open(part_path, mode) as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if should_stop():
+                    raise DownloadCancelled("Download cancelled.")
+                if chunk:
+                    f.write(chunk)
+                    counter.add(len(chunk))
+        counter.add(0, force=True)
+
+def _download_parallel(session, url, part_path, state_path, total, connections, progress, should_stop, log):
+    # Per-range progress lives next to the .part file so restarts can resume
+    state = None
+    if os.path.exists(part_path) and os.path.exists(state_path):
+        try:
+            with open(state_path, 'r') as f:
+                state = json.load(f)
+            if state.get("url") != url or state.get("total") != total:
+                state = None
+        except (OSError, ValueError):
+            state = None
+
+    if state is None:
+        step = total // connections
+        ranges = []
+        for i in range(connections):
+            start = i * step
+            end = total - 1 if i == connections - 1 else start + step - 1
+            ranges.append([start, end, 0])
+        state = {"url": url, "total": total, "ranges": ranges}
+        with open(part_path, 'wb') as f:
+            f.truncate(total)
+    else:
+        log(f"Resuming parallel download ({sum(r[2] for r in state['ranges'])/1024/1024:.1f} MB done)")
+
+    lock = threading.Lock()
+    errors = []
+    counter = _Progress(total, sum(r[2] for r in state["ranges"]), progress)
+    log(f"Downloading over {len(state['ranges'])} connections...")
+
+    def save_state():
+        # Atomic, so a crash mid-write can't leave a truncated sidecar
+        tmp_path = state_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, state_path)
+
+    def checkpoint(rng, f, done):
+        # Data reaches the disk before the sidecar claims it, so a resume never skips missing bytes
+        f.flush()
+        os.fsync(f.fileno())
+        with lock:
+            rng[2] = done
+            save_state()
+
+    def fetch(rng):
+        try:
+            start, end, done = rng
+            if start + done > end:
+                return
+            headers = {"Range": f"bytes={start + done}-{end}"}
+            with session.get(url, stream=True, headers=headers, timeout=30) as response, \
+                    on_cancel(should_stop, _interrupt(response)):
+                if response.status_code != 206:
+                    raise IOError(f"Server ignored range request (HTTP {response.status_code}).")
+                with open(part_path, 'r+b') as f:
+                    f.seek(start + done)
+                    last_checkpoint = time.monotonic()
+                    try:
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if should_stop() or errors:
+                                return
+                            if chunk:
+                                f.write(chunk)
+                                done += len(chunk)
+                                counter.add(len(chunk))
+                                if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                                    checkpoint(rng, f, done)
+                                    last_checkpoint = time.monotonic()
+                    finally:
+                        # Also on stop or a dropped connection: keep what was written
+                        checkpoint(rng, f, done)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch, args=(rng,), daemon=True) for rng in state["ranges"]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if should_stop():
+        raise DownloadCancelled("Download cancelled.")
+    if errors:
+        raise errors[0]
+    counter.add(0, force=True)
@@ -0,0 +1,113 @@
+import sys
+import time
+import json
+import itertools
+import threading
+import resource
+from contextlib import contextmanager
+from PyQt6.QtCore import QObject, pyqtSignal
+
+MAX_SPANS = 5000 # Oldest spans are dropped beyond this
+
+def process_peak_rss_mb():
+    """Peak resident memory of the whole process so far (never goes down; shared by concurrent jobs)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def thread_cpu_seconds():
+    """CPU time of the calling thread only, so concurrent stages don't count each other's work.
+
+    Work handed to other threads or processes (torch's intra-op pool,
+    ffmpeg) isn't included.
+    """
+    return time.thread_time()
+
+class Recorder(QObject):
+    """Collects finished spans from every worker; span_recorded fires for each."""
+    span_recorded = pyqtSignal(dict)
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.spans = []
+        self.ids = itertools.count(1)
+
+    def add(self, record):
+        with self.lock:
+            self.spans.append(record)
+            del self.spans[:-MAX_SPANS]
+        self.span_recorded.emit(record)
+
+    def all(self):
+        with self.lock:
+            return list(self.spans)
+
+    def clear(self):
+        with self.lock:
+            self.spans = []
+
+    def export_jsonl(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in self.all():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def job(self, kind, label=""):
+        return JobMetrics(self, f"{kind}-{int(time.time())}-{next(self.ids)}", kind, label)
+
+class JobMetrics:
+    """Span factory for one job. Use `with metrics.span("stage") as s:` and
+    fill s["bytes"] / s["media_seconds"] inside the block if known then."""
+
+    def __init__(self, recorder, job_id, kind, label):
+        self.recorder = recorder
+        self.job_id = job_id
+        self.kind = kind
+        self.label = label
+
+    @contextmanager
+    def span(self, stage, **fields):
+        record = {
+            "job_id": self.job_id,
+            "job_type": self.kind,
+            "label": self.label,
+            "stage": stage,
+            "bytes": None,
+            "media_seconds": None,
+        }
+        record.update(fields)
+        wall_start = time.perf_counter()
+        cpu_start = thread_cpu_seconds()
+        record["started_at"] = time.time()
+        try:
+            yield record
+            record["status"] = "ok"
+        except BaseException as e:
+            record["status"] = f"error: {e}"
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall_start, 4)
+            record["cpu_s"] = round(thread_cpu_seconds() - cpu_start, 4)
+            record["process_peak_rss_mb"] = round(process_peak_rss_mb(), 1)
+            media = record.get("media_seconds")
+            # <1 means faster than realtime
+            record["realtime_factor"] = round(record["wall_s"] / media, 4) if media else None
+            self.recorder.add(record)
+
+class _NullMetrics:
+    """Stand-in when a caller doesn't pass metrics; spans are not recorded."""
+
+    @contextmanager
+    def span(self, stage, **fields):
+        yield dict(fields)
+
+NULL_METRICS = _NullMetrics()
+
+_recorder = None
+
+def get_recorder():
+    """The shared Recorder (created on first use, on the GUI thread)."""
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder()
+    return _recorder
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+JOB_DB_PATH = os.path.expanduser("~/.cache/macwhisper/jobs.db")
+
+# Statuses a job can be resumed from after a restart
+UNFINISHED = ("queued", "running")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    label TEXT NOT NULL DEFAULT '',
+    inputs TEXT NOT NULL DEFAULT '{}',
+    options TEXT NOT NULL DEFAULT '{}',
+    stage TEXT NOT NULL DEFAULT '',
+    stage_status TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'queued',
+    artifacts TEXT NOT NULL DEFAULT '{}',
+    timings TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+JSON_FIELDS = ("inputs", "options", "artifacts", "timings")
+
+class JobStore:
+    """SQLite table of jobs (type, inputs, options, stage, artifacts, timings).
+
+    Safe to use from worker threads; every call is a short transaction, so a
+    crash loses at most the stage that was running.
+    """
+
+    def __init__(self, path=JOB_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def row_to_job(self, row):
+        job = dict(row)
+        for field in JSON_FIELDS:
+            job[field] = json.loads(job[field] or "{}")
+        return job
+
+    def add(self, job_type, label, inputs, options):
+        with self.lock:
+            cur = self.conn.execute(
+                "INSERT INTO jobs (type, label, inputs, options, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_type, label, json.dumps(inputs), json.dumps(options), time.time())
+            )
+            return cur.lastrowid
+
+    def get(self, job_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self.row_to_job(row) if row else None
+
+    def list(self, statuses=None, limit=500):
+        query = "SELECT * FROM jobs"
+        args = []
+        if statuses:
+            query += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            args += list(statuses)
+        query += " ORDER BY id DESC LIMIT ?"
+        with self.lock:
+            rows = self.conn.execute(query, args + [limit]).fetchall()
+        return [self.row_to_job(row) for row in rows]
+
+    def next_queued(self, exclude=()):
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM jobs WHERE status = 'queued' ORDER BY id").fetchall()
+        for row in rows:
+            if row["id"] not in exclude:
+                return self.row_to_job(row)
+        return None
+
+    def update(self, job_id, **fields):
+        for field in JSON_FIELDS:
+            if field in fields:
+                fields[field] = json.dumps(fields[field])
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.lock:
+            self.conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", list(fields.values()) + [job_id])
+
+    def merge(self, job_id, field, values):
+        """Merge values into one of the JSON dict columns (artifacts / timings)."""
+        with self.lock:
+            row = self.conn.execute(f"SELECT {field} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if not row:
+                return
+            merged = json.loads(row[0] or "{}")
+            merged.update(values)
+            self.conn.execute(f"UPDATE jobs SET {field} = ? WHERE id = ?", (json.dumps(merged), job_id))
+
+    def requeue_interrupted(self, job_types):
+        """Jobs of job_types left 'running' by a crash or quit go back to the queue; returns how many.
+
+        Unfinished jobs of any other type are marked cancelled.
+        """
+        marks = ",".join("?" * len(job_types))
+        with self.lock:
+            cur = self.conn.execute(
+                f"UPDATE jobs SET status = 'queued' WHERE status = 'running' AND type IN ({marks})", job_types)
+            self.conn.execute(
+                f"UPDATE jobs SET status = 'cancelled', error = 'Interrupted by quitting', finished_at = ? "
+                f"WHERE status IN (?, ?) AND type NOT IN ({marks})", (time.time(), *UNFINISHED, *job_types))
+            return cur.rowcount
+
+    def delete_finished(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM jobs WHERE status NOT IN (?, ?)", UNFINISHED)
+
+    def stats(self, window=3600):
+        """Queue depth, running count and throughput over the last `window` seconds."""
+        since = time.time() - window
+        with self.lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            done, avg_duration = self.conn.execute(
+                "SELECT COUNT(*), AVG(finished_at - started_at) FROM jobs "
+                "WHERE status = 'done' AND finished_at >= ?", (since,)
+            ).fetchone()
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "failed": counts.get("failed", 0),
+            "done_in_window": done,
+            "jobs_per_hour": done * 3600 / window,
+            "avg_duration_s": avg_duration,
+        }
+
+_store = None
+
+def get_job_store():
+    global _store
+    if _store is None:
+        _store = JobStore()
+    return _store
@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, 
     QListWidget, QStackedWidget, QMessageBox, QAbstractItemView
 )
-from PyQt6.QtCore import QSettings, Qt
+from PyQt6.QtCore import QSettings, Qt, QTimer
 
 # Import module classes
 from ui.extraction import ExtractionPage
@@ -14,6 +14,12 @@ from ui.models import ModelsPage
 from ui.translation import TranslationPage
 from ui.apikeys import APIKeysPage
 from ui.burning import SubtitleBurningPage
+from ui.pipeline import PipelinePage
+from ui.jobs import JobsPage
+from ui.diagnostics import DiagnosticsPage
+from model_loader import PreloadWorker
+from profiling import enable_from_cli
+from scheduler import get_scheduler
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -47,8 +53,11 @@ class MainWindow(QMainWindow):
         self.sidebar.addItem("🎬 Extraction")
         self.sidebar.addItem("🌐 Translation")
         self.sidebar.addItem("🔥 Burn Subtitles")
+        self.sidebar.addItem("🔗 Pipeline")
+        self.sidebar.addItem("🗂 Jobs")
         self.sidebar.addItem("📦 Models")
         self.sidebar.addItem("🔑 API Keys")
+        self.sidebar.addItem("📊 Diagnostics")
         self.sidebar.addItem("⚙️ Settings")
         
         self.main_layout.addWidget(self.sidebar)
@@ -69,19 +78,48 @@ class MainWindow(QMainWindow):
         self.page_burning = SubtitleBurningPage()
         self.pages.addWidget(self.page_burning)
         
-        # Page 4: Models
+        # Page 4: Pipeline
+        self.page_pipeline = PipelinePage()
+        self.pages.addWidget(self.page_pipeline)
+        
+        # Page 5: Jobs
+        self.page_jobs = JobsPage()
+        self.pages.addWidget(self.page_jobs)
+        
+        # Page 6: Models
         self.page_models = ModelsPage()
         self.pages.addWidget(self.page_models)
         
-        # Page 5: API Keys
+        # Page 7: API Keys
         self.page_apikeys = APIKeysPage()
         self.pages.addWidget(self.page_apikeys)
         
-        # Page 6: Settings
+        # Page 8: Diagnostics
+        self.page_diagnostics = DiagnosticsPage()
+        self.pages.addWidget(self.page_diagnostics)
+        
+        # Page 9: Settings
         self.page_settings = SettingsPage()
         self.page_settings.style_changed.connect(self.apply_styles) # Re-apply styles
         self.pages.addWidget(self.page_settings)
 
+    def start_preload(self):
+        """Load (and warm up) the default model once the window is up."""
+        if not self.settings.value("preload_model", False, type=bool):
+            return
+        model_name = self.settings.value("default_model", "base")
+        warm_up = self.settings.value("preload_warm_up", True, type=bool)
+        self.preload_worker = PreloadWorker(model_name, warm_up=warm_up)
+        self.preload_worker.log.connect(self.page_extraction.log_output.append)
+        self.preload_worker.error.connect(lambda msg: self.page_extraction.log_output.append(f"Preload failed: {msg}"))
+        self.preload_worker.start()
+
+    def resume_jobs(self):
+        """Pick up pipeline jobs that were queued or running when the app last quit."""
+        count = get_scheduler().resume()
+        if count:
+            self.page_pipeline.log_output.append(f"Resumed {count} interrupted job(s); see the Jobs page.")
+
     def change_page(self, index):
         self.pages.setCurrentIndex(index)
 
@@ -213,7 +251,8 @@ if __name__ == '__main__':
     # GUI apps launched from Finder often don't have /usr/local/bin or /opt/homebrew/bin in PATH
     os.environ["PATH"] += os.pathsep + "/usr/local/bin" + os.pathsep + "/opt/homebrew/bin"
 
-    app = QApplication(sys.argv)
+    # --profile / --profile-torch turn on job profiling regardless of Settings
+    app = QApplication(enable_from_cli(sys.argv))
     
     # 2. Global Exception Handler
     # This prevents "silent" crashes in the bundled app by showing a dialog
@@ -242,6 +281,9 @@ if __name__ == '__main__':
     try:
         window = MainWindow()
         window.show()
+        # Let the first paint happen before model loading competes for CPU
+        QTimer.singleShot(500, window.start_preload)
+        QTimer.singleShot(1000, window.resume_jobs)
         sys.exit(app.exec())
     except Exception as e:
         # Fallback for errors
@@ -0,0 +1,166 @@
+import os
+import json
+import threading
+from whisper import _MODELS as WHISPER_MODELS
+from PyQt6.QtCore import QObject, QFileSystemWatcher, pyqtSignal
+from downloader import expected_sha256_from_url, sha256_of
+
+QUANTIZED_SUFFIX = ".int8.pt" # Mirrors quantize.QUANTIZED_SUFFIX without importing torch
+
+# Standard Whisper cache path
+WHISPER_CACHE_DIR = os.path.expanduser("~/.cache/whisper")
+# Remembers which files have already been hashed, so verification survives restarts
+INDEX_PATH = os.path.expanduser("~/.cache/macwhisper/model_index.json")
+
+MODEL_ORDER = ['tiny.en', 'tiny', 'base.en', 'base', 'small.en', 'small', 'medium.en', 'medium',
+               'large-v1', 'large-v2', 'large-v3', 'large', 'large-v3-turbo', 'turbo']
+
+def standard_filename(model_name):
+    """The exact file whisper.load_model caches a standard model under."""
+    return os.path.basename(WHISPER_MODELS[model_name])
+
+class ModelInventory(QObject):
+    """Single scan of WHISPER_CACHE_DIR shared by every page.
+
+    Entries are dicts with name, file, path, size, mtime, sha256, verified,
+    standard, quantized (int8 variants are named "<stem>-int8"). The directory is only rescanned when its mtime changes (or the
+    file system watcher fires); `changed` is emitted after each rescan.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.index = []
+        self.scanned = False
+        self.scanned_mtime = None
+        self.verified = self.load_verified()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(lambda _: self.refresh())
+        self.watch()
+
+    def watch(self):
+        if os.path.isdir(WHISPER_CACHE_DIR) and WHISPER_CACHE_DIR not in self.watcher.directories():
+            self.watcher.addPath(WHISPER_CACHE_DIR)
+
+    def load_verified(self):
+        try:
+            with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_verified(self):
+        os.makedirs(os.path.dirname(INDEX_PATH), exist_ok=True)
+        tmp_path = INDEX_PATH + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.verified, f)
+        os.replace(tmp_path, INDEX_PATH)
+
+    def refresh(self, force=False):
+        try:
+            dir_mtime = os.stat(WHISPER_CACHE_DIR).st_mtime
+        except OSError:
+            dir_mtime = None
+        if not force and self.scanned and dir_mtime == self.scanned_mtime:
+            return
+        self.watch()
+
+        files = {}
+        if dir_mtime is not None:
+            for entry in os.scandir(WHISPER_CACHE_DIR):
+                if entry.is_file() and entry.name.endswith(".pt"):
+                    st = entry.stat()
+                    files[entry.name] = (entry.path, st.st_size, st.st_mtime)
+
+        with self.lock:
+            # mark_verified() writes from download and verify threads
+            verified = dict(self.verified)
+        index = []
+        claimed = set()
+        for model_name in sorted(WHISPER_MODELS.keys(), key=lambda x: MODEL_ORDER.index(x) if x in MODEL_ORDER else 99):
+            filename = standard_filename(model_name)
+            expected = expected_sha256_from_url(WHISPER_MODELS[model_name])
+            index.append(self.make_entry(model_name, filename, files.get(filename), expected, True, verified))
+            claimed.add(filename)
+        for filename in sorted(files):
+            if filename not in claimed:
+                entry = self.make_entry(filename, filename, files[filename], None, False, verified)
+                if filename.endswith(QUANTIZED_SUFFIX):
+                    entry["name"] = filename[:-len(QUANTIZED_SUFFIX)] + "-int8"
+                    entry["quantized"] = True
+                index.append(entry)
+
+        with self.lock:
+            self.index = index
+            self.scanned = True
+            self.scanned_mtime = dir_mtime
+        self.changed.emit()
+
+    def make_entry(self, name, filename, stat, expected_sha256, standard, verified):
+        path, size, mtime = stat if stat else (os.path.join(WHISPER_CACHE_DIR, filename), 0, 0)
+        record = verified.get(filename, {})
+        verified = bool(stat) and record.get("size") == size and record.get("mtime") == mtime and (
+            expected_sha256 is None or record.get("sha256") == expected_sha256)
+        return {
+            "name": name,
+            "file": filename,
+            "path": path,
+            "present": bool(stat),
+            "size": size,
+            "mtime": mtime,
+            "sha256": expected_sha256 or record.get("sha256"),
+            "verified": verified,
+            "standard": standard,
+            "quantized": False,
+        }
+
+    def entries(self):
+        if not self.scanned:
+            self.refresh()
+        with self.lock:
+            return list(self.index)
+
+    def find(self, name):
+        for entry in self.entries():
+            if entry["name"] == name:
+                return entry
+        return None
+
+    def mark_verified(self, path, sha256):
+        st = os.stat(path)
+        with self.lock:
+            self.verified[os.path.basename(path)] = {"size": st.st_size, "mtime": st.st_mtime, "sha256": sha256}
+            self.save_verified()
+
+    def verify(self, name):
+        """Hash the file now and record the result; True if it matches."""
+        entry = self.find(name)
+        if not entry or not entry["present"]:
+            return False
+        actual = sha256_of(entry["path"])
+        if entry["standard"] and actual != entry["sha256"]:
+            return False
+        self.mark_verified(entry["path"], actual)
+        self.refresh(force=True)
+        return True
+
+    def delete(self, name):
+        entry = self.find(name)
+        if not entry or not entry["present"]:
+            return False
+        os.remove(entry["path"])
+        with self.lock:
+            self.verified.pop(entry["file"], None)
+            self.save_verified()
+        self.refresh(force=True)
+        return True
+
+_inventory = None
+
+def get_inventory():
+    """The process-wide inventory (created on first use, on the GUI thread)."""
+    global _inventory
+    if _inventory is None:
+        _inventory = ModelInventory()
+    return _inventory
@@ -0,0 +1,126 @@
+import os
+import threading
+import numpy as np
+import whisper
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from quantize import is_quantized_path, load_quantized
+from profiling import profiled
+
+# Rough resident memory needed per model (from the whisper README), in GB
+MODEL_MEMORY_GB = {
+    "tiny": 1, "base": 1, "small": 2, "medium": 5,
+    "large": 10, "turbo": 6,
+}
+
+def required_memory_gb(model_name):
+    if is_quantized_path(model_name):
+        # int8 Linear weights take roughly a third of the fp32 footprint
+        return max(1, required_memory_gb(model_name.replace(".int8", "")) // 3)
+    for prefix in sorted(MODEL_MEMORY_GB, key=len, reverse=True):
+        if os.path.basename(model_name).startswith(prefix):
+            return MODEL_MEMORY_GB[prefix]
+    return 2
+
+def available_memory_gb():
+    """Free + reclaimable RAM in GB, or None when it can't be determined."""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / 1024 ** 3
+    except ImportError:
+        pass
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES') / 1024 ** 3
+    except (ValueError, OSError, AttributeError):
+        return None
+
+class ModelCache(QObject):
+    """Process-wide cache of loaded whisper models.
+
+    Only the most recently used model is kept, so switching models doesn't
+    pile up gigabytes of weights. state_changed(model, state) reports
+    'loading', 'warming', 'ready', 'unloaded' or 'error: ...'.
+    """
+    state_changed = pyqtSignal(str, str)
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.models = {}
+        self.states = {}
+
+    def set_state(self, name, state):
+        self.states[name] = state
+        self.state_changed.emit(name, state)
+
+    def state(self, name):
+        return self.states.get(name, "unloaded")
+
+    def get(self, name):
+        # Held for the whole load so a job waits for an in-flight preload
+        # instead of loading the same weights a second time
+        with self.lock:
+            if name in self.models:
+                return self.models[name]
+            for other in list(self.models):
+                del self.models[other]
+                self.set_state(other, "unloaded")
+            self.set_state(name, "loading")
+            try:
+                if is_quantized_path(name):
+                    model = load_quantized(name)
+                else:
+                    model = whisper.load_model(name)
+            except Exception as e:
+                self.set_state(name, f"error: {e}")
+                raise
+            self.models[name] = model
+            self.set_state(name, "ready")
+            return model
+
+    def warm_up(self, name):
+        """Run a short silent decode so kernels and allocators are primed."""
+        model = self.get(name)
+        self.set_state(name, "warming")
+        try:
+            silence = np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32)
+            model.transcribe(silence, language="en", fp16=False, condition_on_previous_text=False)
+        finally:
+            self.set_state(name, "ready")
+
+_cache = None
+
+def get_model_cache():
+    """The shared ModelCache (created on first use, on the GUI thread)."""
+    global _cache
+    if _cache is None:
+        _cache = ModelCache()
+    return _cache
+
+class PreloadWorker(QThread):
+    log = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, model_name, warm_up=True):
+        super().__init__()
+        self.model_name = model_name
+        self.warm_up = warm_up
+
+    @profiled
+    def run(self):
+        try:
+            needed = required_memory_gb(self.model_name)
+            available = available_memory_gb()
+            if available is not None and available < needed:
+                self.log.emit(f"Skipping preload of '{self.model_name}': "
+                              f"needs ~{needed} GB, {available:.1f} GB available.")
+                return
+
+            self.log.emit(f"Preloading model '{self.model_name}' in the background...")
+            cache = get_model_cache()
+            if self.warm_up:
+                cache.warm_up(self.model_name)
+            else:
+                cache.get(self.model_name)
+            self.log.emit(f"Model '{self.model_name}' preloaded.")
+        except Exception as e:
+            self.error.emit(str(e))
@@ -0,0 +1,392 @@
+import os
+import time
+import queue
+import tempfile
+import threading
+from PyQt6.QtCore import QThread, QSettings, pyqtSignal
+from instrumentation import get_recorder
+from profiling import profiled
+from resources import resource_slot, SlotCancelled
+from cancellation import CancelToken, Cancelled
+from subtitles import parse_srt, resegment, write_srt
+from transcription_backends import get_backend
+from cpu_config import transcription_slot, resolve_thread_config, apply_thread_config
+from translator import (
+    BATCH_SIZE, TranslationError, configured_providers, base_url_for, make_client, translate_batch, rolling_context
+)
+from provider_pool import POOL_KEY, ProviderPool
+
+JOBS_DIR = os.path.expanduser("~/.cache/macwhisper/jobs")
+
+# Sentinel that tells the next stage no more files are coming
+_DONE = object()
+
+def job_dir_for(video_path):
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    # mkdtemp keeps two same-named videos started in the same second apart
+    return tempfile.mkdtemp(prefix=f"{time.strftime('%Y%m%d-%H%M%S')}-{stem}-", dir=JOBS_DIR)
+
+def output_path_for(video_path, output_dir, target_lang):
+    from ui.burning import OUTPUT_FORMATS
+    base, ext = os.path.splitext(os.path.basename(video_path))
+    if ext.lower() not in OUTPUT_FORMATS:
+        ext = ".mp4"
+    suffix = "".join(c if c.isalnum() else "_" for c in target_lang)
+    return os.path.join(output_dir or os.path.dirname(video_path), f"{base}_{suffix}{ext}")
+
+def existing(path):
+    return path if path and os.path.exists(path) else None
+
+class PipelineWorker(QThread):
+    """Extract -> translate -> burn for a list of videos, with the stages overlapped.
+
+    Transcription runs on this thread; translation and burning each get a
+    thread of their own fed by a queue. Cues are handed to translation as the
+    engine produces them, and while file N is being translated or burned,
+    file N+1 is already being transcribed. Intermediate SRTs are kept in a
+    per-file directory under JOBS_DIR.
+
+    options (JSON-serialisable, so they can be stored with a job):
+    model_name, backend, segmentation, provider_key, llm_model, target_lang,
+    context_cues, glossary, stream, mode, burn_config (font_color as '#rrggbb'), output_dir.
+
+    With job_ids (one per file) progress, artifacts and timings are written
+    to the job store as they happen; artifacts from an earlier run let a
+    resumed job skip the stages it already finished.
+    """
+    log = pyqtSignal(str)
+    stage_changed = pyqtSignal(int, str, str) # file index, 'transcribe'/'translate'/'burn', status
+    finished = pyqtSignal(object) # list of per-file result dicts
+    error = pyqtSignal(str)
+
+    def __init__(self, files, options, job_ids=None, artifacts=None):
+        super().__init__()
+        self.files = list(files)
+        self.options = options
+        self.job_ids = job_ids
+        # Shared by the stages: cancelling it interrupts transcription and requests
+        self.token = CancelToken()
+        self.aborted = None # Error that stopped the whole run; unlike stop(), files end up failed
+        self.stop_requested = False
+        self.current_burn = None
+        self.client = None
+        self.results = []
+        for i, f in enumerate(self.files):
+            saved = artifacts[i] if artifacts else {}
+            self.results.append({"video": f, "job_dir": existing(saved.get("job_dir")),
+                                 "source_srt": existing(saved.get("source_srt")),
+                                 "translated_srt": existing(saved.get("translated_srt")),
+                                 "output": None, "status": "pending"})
+        if job_ids:
+            from job_store import get_job_store
+            self.store = get_job_store()
+
+    @profiled
+    def run(self):
+        translate_queue = queue.Queue()
+        burn_queue = queue.Queue()
+        stages = [
+            threading.Thread(target=self.translate_stage, args=(translate_queue, burn_queue), daemon=True),
+            threading.Thread(target=self.burn_stage, args=(burn_queue,), daemon=True),
+        ]
+        try:
+            self.client = self.make_client()
+        except ValueError as e:
+            for index in range(len(self.files)):
+                self.fail(index, "translate", str(e))
+            self.error.emit(str(e))
+            self.finish()
+            return
+
+        for thread in stages:
+            thread.start()
+        try:
+            self.transcribe_stage(translate_queue)
+        except Exception as e:
+            self.abort(str(e))
+        finally:
+            translate_queue.put(_DONE)
+            for thread in stages:
+                thread.join()
+
+        if self.aborted:
+            self.log.emit(f"Pipeline aborted: {self.aborted}")
+        elif self.token.cancelled:
+            self.log.emit("Pipeline stopped.")
+        self.finish()
+
+    def abort(self, message):
+        """Stop every stage because of an error; files not finished yet are recorded as failed."""
+        self.error.emit(message)
+        self.aborted = message
+        self.token.cancel()
+
+    def finish(self):
+        for index, result in enumerate(self.results):
+            if result["status"] == "pending":
+                if self.aborted:
+                    result["status"] = f"failed: aborted ({self.aborted})"
+                else:
+                    result["status"] = "cancelled" if self.token.cancelled else "failed"
+            if self.job_ids:
+                status = result["status"] if result["status"] in ("done", "cancelled") else "failed"
+                self.store.update(self.job_ids[index], status=status, finished_at=time.time(),
+                                  error=None if status == "done" else result["status"])
+        self.finished.emit(self.results)
+
+    def make_client(self):
+        """API key and base URL are looked up at run time so they're never stored with the job."""
+        if self.options["provider_key"] == POOL_KEY:
+            return ProviderPool.from_settings(QSettings("MacWhisper", "Config"), log=self.log.emit)
+        for _, service_key, config in configured_providers(QSettings("MacWhisper", "Config")):
+            if service_key == self.options["provider_key"]:
+                if not config.get("api_key"):
+                    break
+                return make_client(config["api_key"], base_url_for(service_key, config), provider=service_key)
+        raise ValueError(f"Translation service '{self.options['provider_key']}' has no API Key configured.")
+
+    # --- Progress bookkeeping (UI signal plus job store) ---
+
+    def set_stage(self, index, stage, status):
+        self.stage_changed.emit(index, stage, status)
+        if self.job_ids:
+            self.store.update(self.job_ids[index], stage=stage, stage_status=status)
+
+    def save_artifact(self, index, key, path):
+        self.results[index][key] = path
+        if self.job_ids:
+            self.store.merge(self.job_ids[index], "artifacts", {key: path})
+
+    def save_timing(self, index, stage, started):
+        if self.job_ids:
+            self.store.merge(self.job_ids[index], "timings", {stage: round(time.perf_counter() - started, 3)})
+
+    def fail(self, index, stage, message):
+        self.results[index]["status"] = f"failed: {message}"
+        self.set_stage(index, stage, "❌ " + message)
+        self.log.emit(f"[{os.path.basename(self.files[index])}] {stage} failed: {message}")
+
+    # --- Stage 1: transcription (CPU bound) ---
+
+    def transcribe_stage(self, translate_queue):
+        backend = get_backend(self.options["backend"])
+        segmentation = self.options.get("segmentation")
+        options = {"word_timestamps": True} if segmentation else {}
+
+        for index, video in enumerate(self.files):
+            if self.token.cancelled:
+                break
+            name = os.path.basename(video)
+            result = self.results[index]
+            if not result["job_dir"]:
+                self.save_artifact(index, "job_dir", job_dir_for(video))
+            metrics = get_recorder().job("pipeline", name)
+
+            if result["translated_srt"]:
+                # Resumed after translation finished: straight to the burn stage
+                self.set_stage(index, "transcribe", "✅ (earlier run)")
+                translate_queue.put(("translated", index, result["translated_srt"]))
+                continue
+
+            translate_queue.put(("start", index, metrics))
+            if result["source_srt"]:
+                with open(result["source_srt"], encoding="utf-8") as f:
+                    cues = parse_srt(f.read())
+                self.set_stage(index, "transcribe", f"✅ {len(cues)} cues (earlier run)")
+                for cue in cues:
+                    translate_queue.put(("cue", index, cue))
+                translate_queue.put(("end", index, None))
+                continue
+
+            self.set_stage(index, "transcribe", "⏳ Waiting")
+            self.log.emit(f"[{name}] Transcribing with {backend.label}...")
+
+            def on_segment(segment, index=index):
+                # Re-segmentation needs every word first, so it sends cues at the end instead
+                if not segmentation:
+                    translate_queue.put(("cue", index, segment))
+
+            started = time.perf_counter()
+            try:
+                with resource_slot("cpu", self.token, self.log.emit), transcription_slot() as slot:
+                    self.set_stage(index, "transcribe", "⏳ Running")
+                    thread_config = resolve_thread_config(slot)
+                    apply_thread_config(thread_config, self.log.emit)
+                    transcript = backend.transcribe(
+                        self.options["model_name"], video, log=self.log.emit,
+                        cpu_threads=thread_config["intra_threads"], metrics=metrics,
+                        on_segment=on_segment, cancel=self.token, **options
+                    )
+            except (Cancelled, SlotCancelled):
+                self.set_stage(index, "transcribe", "Aborted" if self.aborted else "Stopped")
+                translate_queue.put(("failed", index, None))
+                break
+            except Exception as e:
+                self.fail(index, "transcribe", str(e))
+                translate_queue.put(("failed", index, None))
+                continue
+
+            cues = transcript["segments"]
+            if segmentation:
+                with metrics.span("resegment"):
+                    cues = resegment(transcript["segments"], **segmentation)
+                for cue in cues:
+                    translate_queue.put(("cue", index, cue))
+
+            source_srt = os.path.join(result["job_dir"], "source.srt")
+            write_srt(cues, source_srt)
+            self.save_artifact(index, "source_srt", source_srt)
+            self.save_timing(index, "transcribe", started)
+            translate_queue.put(("end", index, None))
+            self.set_stage(index, "transcribe", f"✅ {len(cues)} cues")
+
+    # --- Stage 2: translation (network bound) ---
+
+    def translate_stage(self, translate_queue, burn_queue):
+        files = {} # index -> {'cues', 'translated', 'metrics', 'started'}
+        index = None
+        try:
+            while True:
+                item = translate_queue.get()
+                if item is _DONE:
+                    break
+                kind, index, payload = item
+                if self.token.cancelled:
+                    continue # Keep reading until the transcriber sends _DONE
+                if kind == "start":
+                    files[index] = {"cues": [], "translated": [], "metrics": payload,
+                                    "started": time.perf_counter()}
+                    self.set_stage(index, "translate", "⏳ Waiting for cues")
+                elif kind == "cue":
+                    state = files[index]
+                    state["cues"].append({"start": payload["start"], "end": payload["end"],
+                                          "text": payload["text"].strip()})
+                    if len(state["cues"]) - len(state["translated"]) >= BATCH_SIZE:
+                        self.translate_pending(index, state)
+                elif kind == "end":
+                    state = files.pop(index)
+                    self.translate_pending(index, state)
+                    if self.token.cancelled:
+                        continue
+                    translated_srt = os.path.join(self.results[index]["job_dir"], "translated.srt")
+                    write_srt(state["translated"], translated_srt)
+                    self.save_artifact(index, "translated_srt", translated_srt)
+                    self.save_timing(index, "translate", state["started"])
+                    self.set_stage(index, "translate", f"✅ {len(state['translated'])} cues")
+                    burn_queue.put((index, translated_srt))
+                elif kind == "translated":
+                    self.set_stage(index, "translate", "✅ (earlier run)")
+                    burn_queue.put((index, payload))
+                elif kind == "failed":
+                    files.pop(index, None)
+                    self.set_stage(index, "translate", "Skipped")
+        except TranslationError as e:
+            # Bad key or no quota: every later request would fail the same way
+            if index is not None:
+                self.fail(index, "translate", str(e))
+            self.abort(str(e))
+        except Exception as e:
+            if index is not None:
+                self.fail(index, "translate", f"crashed: {e}")
+            self.abort(f"Translation stage crashed: {e}")
+        finally:
+            burn_queue.put(_DONE)
+
+    def translate_pending(self, index, state):
+        pending = state["cues"][len(state["translated"]):]
+        if not pending:
+            return
+        texts = [cue["text"] for cue in pending]
+        context_cues = self.options.get("context_cues", 0)
+        done = len(state["translated"])
+        previous = [(cue["text"], translated["text"])
+                    for cue, translated in zip(state["cues"][max(0, done - context_cues):done],
+                                               state["translated"][max(0, done - context_cues):])]
+        extra = dict(context=rolling_context(previous, context_cues), glossary=self.options.get("glossary"),
+                     stream=self.options.get("stream", False))
+        if isinstance(self.client, ProviderPool):
+            translations = self.client.translate(
+                self.options["target_lang"], texts,
+                log=self.log.emit, should_stop=self.token, metrics=state["metrics"], **extra
+            )
+        else:
+            translations = translate_batch(
+                self.client, self.options["llm_model"],
+                self.options["target_lang"], texts,
+                log=self.log.emit, should_stop=self.token, metrics=state["metrics"], **extra
+            )
+        if translations is None:
+            if not self.token.cancelled:
+                self.log.emit("Skipping batch after max retries; keeping the original text.")
+            translations = texts
+        # Segments the model never returned keep their original text
+        translations = [text if text is not None else original for text, original in zip(translations, texts)]
+        for cue, text in zip(pending, translations):
+            state["translated"].append(dict(cue, text=text))
+        self.set_stage(index, "translate", f"⏳ {len(state['translated'])} cues")
+
+    # --- Stage 3: burn / mux (CPU or hardware encoder) ---
+
+    def burn_stage(self, burn_queue):
+        from PyQt6.QtGui import QColor
+        from ui.burning import BurningWorker, check_free_space
+        config = dict(self.options["burn_config"])
+        config["font_color"] = QColor(config.get("font_color") or "#FFFFFF")
+
+        while True:
+            item = burn_queue.get()
+            if item is _DONE:
+                break
+            index, subtitle_path = item
+            # After an abort, files that already have subtitles still get burned
+            if self.stop_requested:
+                continue
+            video = self.files[index]
+            output_path = output_path_for(video, self.options.get("output_dir"), self.options["target_lang"])
+            mode = self.options["mode"]
+            try:
+                check_free_space(video, output_path, factor=1.05 if mode == "mux" else 1.5)
+            except OSError as e:
+                self.fail(index, "burn", str(e))
+                continue
+
+            self.set_stage(index, "burn", "⏳ Waiting")
+            errors = []
+            done = []
+            # Own token: a translation failure for a later file shouldn't kill this encode, only stop() does
+            worker = BurningWorker(video, subtitle_path, output_path, config, mode=mode)
+            worker.log.connect(lambda line, index=index: self.on_burn_log(index, line))
+            worker.error.connect(errors.append)
+            worker.finished.connect(done.append)
+            self.current_burn = worker
+            started = time.perf_counter()
+            if self.stop_requested: # stop() may have run before current_burn was set
+                worker.stop()
+            worker.run() # Synchronously, on this stage's thread
+            self.current_burn = None
+
+            if done:
+                self.save_artifact(index, "output", output_path)
+                self.save_timing(index, "burn", started)
+                self.results[index]["status"] = "done"
+                self.set_stage(index, "burn", "✅ " + os.path.basename(output_path))
+            elif errors:
+                self.fail(index, "burn", errors[0])
+            else:
+                self.set_stage(index, "burn", "Stopped")
+
+    def on_burn_log(self, index, line):
+        if line.startswith("frame=") or " time=" in line:
+            # ffmpeg progress: show it in the table rather than flooding the log
+            time_part = line.split("time=", 1)[1].split()[0] if "time=" in line else ""
+            self.stage_changed.emit(index, "burn", f"⏳ {time_part}")
+        else:
+            self.log.emit(f"[{os.path.basename(self.files[index])}] {line}")
+
+    def stop(self):
+        self.stop_requested = True
+        self.token.cancel()
+        burn = self.current_burn
+        if burn is not None:
+            burn.stop() # Kills the ffmpeg process group
@@ -0,0 +1,107 @@
+import io
+import os
+import time
+import pstats
+import cProfile
+import functools
+from contextlib import contextmanager
+from PyQt6.QtCore import QSettings
+
+DIAGNOSTICS_DIR = os.path.expanduser("~/.cache/macwhisper/diagnostics")
+TOP_FUNCTIONS = 12
+
+# Set by the --profile / --profile-torch command line flags; OR'ed with Settings
+_cli_flags = set()
+
+def enable_from_cli(argv):
+    """Consume our flags from argv (before Qt sees it) and return the rest."""
+    rest = []
+    for arg in argv:
+        if arg == "--profile":
+            _cli_flags.add("profile_jobs")
+        elif arg == "--profile-torch":
+            _cli_flags.add("profile_torch")
+        else:
+            rest.append(arg)
+    return rest
+
+def is_enabled(key):
+    """key is 'profile_jobs' (cProfile per worker run) or 'profile_torch' (torch.profiler for inference)."""
+    if key in _cli_flags:
+        return True
+    return QSettings("MacWhisper", "Config").value(key, False, type=bool)
+
+def output_path(label, suffix):
+    os.makedirs(DIAGNOSTICS_DIR, exist_ok=True)
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in label)
+    return os.path.join(DIAGNOSTICS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe}{suffix}")
+
+def summarize_stats(profiler, limit=TOP_FUNCTIONS):
+    """The top functions by own time, one short line each."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    lines = []
+    for (filename, line, func), (calls, _, own, cumulative, _) in rows:
+        where = f"{os.path.basename(filename)}:{line}" if line else filename
+        lines.append(f"{own:8.3f}s own {cumulative:8.3f}s cum {calls:>8} calls  {func} ({where})")
+    return lines
+
+def profiled(run):
+    """Decorator for QThread.run(): profile the whole job with cProfile when enabled.
+
+    The .prof file (open with snakeviz or `python -m pstats`) goes into
+    DIAGNOSTICS_DIR and the top functions are sent to the worker's log signal.
+    When profiling is off this costs one settings lookup per job.
+    """
+    @functools.wraps(run)
+    def wrapper(self):
+        if not is_enabled("profile_jobs"):
+            return run(self)
+
+        log = getattr(self, "log", None)
+        profiler = cProfile.Profile()
+        try:
+            # Before Python 3.12 this profiles only the worker thread; later
+            # versions allow one active profiler per process, across threads
+            profiler.enable()
+        except ValueError:
+            if log is not None:
+                log.emit("Another job is being profiled; running this one without profiling.")
+            return run(self)
+        try:
+            return run(self)
+        finally:
+            profiler.disable()
+            label = type(self).__name__
+            if getattr(self, "task_type", None):
+                label += f"-{self.task_type}"
+            path = output_path(label, ".prof")
+            profiler.dump_stats(path)
+            if log is not None:
+                log.emit(f"Profile saved to {path}. Top functions by own time:")
+                for line in summarize_stats(profiler):
+                    log.emit("  " + line)
+
+    return wrapper
+
+@contextmanager
+def torch_trace(label, log=None):
+    """torch.profiler around a block (model inference) when enabled.
+
+    Writes a Chrome trace (open in chrome://tracing or Perfetto) and logs the
+    most expensive operators.
+    """
+    if not is_enabled("profile_torch"):
+        yield
+        return
+
+    from torch.profiler import profile, ProfilerActivity
+    with profile(activities=[ProfilerActivity.CPU], record_shapes=False) as prof:
+        yield
+    path = output_path(label, ".trace.json")
+    prof.export_chrome_trace(path)
+    if log:
+        log(f"Torch trace saved to {path}. Top operators by self CPU time:")
+        table = prof.key_averages().table(sort_by="self_cpu_time_total", row_limit=TOP_FUNCTIONS)
+        for line in table.splitlines():
+            log("  " + line)
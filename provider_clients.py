@@ -0,0 +1,80 @@
+import threading
+from openai import OpenAI
+from PyQt6.QtCore import QSettings
+
+try:
+    import httpx
+except ImportError: # Older openai builds; their default client still pools connections
+    httpx = None
+
+try:
+    import h2 # noqa: F401 (lets httpx negotiate HTTP/2)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+CONNECT_TIMEOUT = 10
+REQUEST_TIMEOUT = 120 # Long batches can take a while to generate
+MAX_CONNECTIONS = 16
+KEEPALIVE_EXPIRY = 90 # Seconds an idle connection stays open for the next job
+
+def proxy_from_settings(settings=None):
+    """Proxy URL from Settings; empty means the environment's (HTTPS_PROXY etc.)."""
+    settings = settings or QSettings("MacWhisper", "Config")
+    return settings.value("http_proxy", "").strip()
+
+class ProviderClients:
+    """One OpenAI-compatible client per (provider, base URL, key, proxy).
+
+    Each client wraps a keep-alive httpx connection pool (HTTP/2 when h2 is
+    installed), so consecutive jobs and the API Keys test button reuse open
+    connections instead of paying the TLS handshake every time.
+    """
+
+    def __init__(self):
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def http_client(self, proxy):
+        if httpx is None:
+            return None
+        options = dict(
+            http2=HTTP2,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                max_keepalive_connections=MAX_CONNECTIONS,
+                                keepalive_expiry=KEEPALIVE_EXPIRY),
+        )
+        if proxy:
+            options["proxy"] = proxy
+        return httpx.Client(**options)
+
+    def get(self, provider, api_key, base_url=None):
+        base_url = (base_url or "").strip() or None
+        proxy = proxy_from_settings()
+        key = (provider or "", base_url, api_key, proxy)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                client_args = {"api_key": api_key, "base_url": base_url}
+                http_client = self.http_client(proxy)
+                if http_client is not None:
+                    client_args["http_client"] = http_client
+                else:
+                    client_args["timeout"] = REQUEST_TIMEOUT
+                client = self.clients[key] = OpenAI(**client_args)
+            return client
+
+    def close_all(self):
+        with self.lock:
+            clients, self.clients = list(self.clients.values()), {}
+        for client in clients:
+            client.close()
+
+_provider_clients = None
+
+def get_provider_clients():
+    global _provider_clients
+    if _provider_clients is None:
+        _provider_clients = ProviderClients()
+    return _provider_clients
@@ -0,0 +1,71 @@
+import json
+import time
+from openai import APIStatusError
+from provider_clients import get_provider_clients
+
+HEALTH_SETTINGS_KEY = "provider_health"
+HEALTH_TIMEOUT = 15
+HEALTH_PROMPT = "Translate to Chinese, one per line: apple, river, window, music, morning, library"
+
+# Rate-limit headers OpenAI-compatible APIs commonly send back
+RATE_LIMIT_HEADERS = (
+    "x-ratelimit-limit-requests", "x-ratelimit-remaining-requests", "x-ratelimit-reset-requests",
+    "x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens",
+    "retry-after",
+)
+
+def rate_limits_from(headers):
+    return {name: headers[name] for name in RATE_LIMIT_HEADERS if headers and name in headers}
+
+def check_provider(provider, api_key, base_url=None, model=None):
+    """Send one short chat completion and time it.
+
+    Returns {ok, latency_s, tokens_per_s, rate_limits, reply | error, checked_at}.
+    Latency is the full round trip, including time to the first token.
+    Doesn't take a network slot: while translations hold them all the check
+    would wait with no way to stop it, and it is one tiny request bounded by
+    HEALTH_TIMEOUT anyway.
+    """
+    result = {"ok": False, "latency_s": None, "tokens_per_s": None, "rate_limits": {}, "checked_at": time.time()}
+    client = get_provider_clients().get(provider, api_key, base_url)
+    try:
+        started = time.perf_counter()
+        raw = client.chat.completions.with_raw_response.create(
+            model=model or "gpt-3.5-turbo",
+            messages=[{"role": "user", "content": HEALTH_PROMPT}],
+            max_tokens=32,
+            temperature=0,
+            timeout=HEALTH_TIMEOUT
+        )
+        latency = time.perf_counter() - started
+        response = raw.parse()
+        tokens = response.usage.completion_tokens if response.usage else 0
+        result.update(
+            ok=True,
+            latency_s=round(latency, 3),
+            tokens_per_s=round(tokens / latency, 1) if tokens and latency else None,
+            rate_limits=rate_limits_from(raw.headers),
+            reply=(response.choices[0].message.content or "").strip(),
+        )
+    except APIStatusError as e:
+        result.update(error=f"HTTP {e.status_code}: {e.message}", rate_limits=rate_limits_from(e.response.headers))
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def load_health(settings):
+    """Last check result per service key (persisted so other pages can prefer fast providers)."""
+    try:
+        return json.loads(settings.value(HEALTH_SETTINGS_KEY, "{}"))
+    except (TypeError, ValueError):
+        return {}
+
+def save_health(settings, service_key, result):
+    health = load_health(settings)
+    health[service_key] = result
+    settings.setValue(HEALTH_SETTINGS_KEY, json.dumps(health))
+
+def fastest_provider(health):
+    """Service key with the lowest latency among healthy providers, or None."""
+    healthy = {key: r["latency_s"] for key, r in health.items() if r.get("ok") and r.get("latency_s")}
+    return min(healthy, key=healthy.get) if healthy else None
@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+from translator import TranslationError, configured_providers, base_url_for, make_client, translate_batch
+from provider_health import load_health
+from instrumentation import NULL_METRICS
+from cancellation import interruptible_sleep
+
+POOL_KEY = "__pool__" # Provider key meaning "spread over every configured service"
+POOL_LABEL = "⚖️ Pool (all configured services)"
+DEFAULT_LATENCY = 2.0 # Seconds assumed for a service never health-checked
+COOLDOWN = 5 # Seconds a failing service sits out, doubling per consecutive failure
+MAX_COOLDOWN = 120
+LATENCY_SMOOTHING = 0.3 # Weight of the newest batch in the moving average
+
+def pool_members(settings):
+    """[(service key, display name, config)] for services the pool can use (OpenAI-compatible, with a key)."""
+    return [(key, name, config) for name, key, config in configured_providers(settings) if config.get("api_key")]
+
+class ProviderPool:
+    """Spreads translation batches over several services, with failover.
+
+    Each batch goes to a service picked at random, weighted by 1 / latency
+    (from the last health check, then from live batches), scaled by the
+    rate-limit headroom the health check saw and by how busy the service
+    already is. A service that fails sits out for a growing cooldown; one
+    that rejects its key or quota is dropped for the rest of the job.
+    """
+
+    def __init__(self, members, health=None, log=None):
+        health = health or {}
+        self.log = log or (lambda msg: None)
+        self.lock = threading.Lock()
+        self.members = []
+        for key, name, config in members:
+            result = health.get(key, {})
+            self.members.append({
+                "key": key,
+                "name": name,
+                "client": make_client(config["api_key"], base_url_for(key, config), provider=key),
+                "model": config.get("model", "").strip() or "gpt-3.5-turbo",
+                "latency": result.get("latency_s") if result.get("ok") else None,
+                "headroom": self.headroom(result.get("rate_limits", {})),
+                "in_flight": 0,
+                "failures": 0,
+                "cooldown_until": 0,
+                "disabled": False,
+                "batches": 0,
+            })
+        if not self.members:
+            raise ValueError("The provider pool needs at least one service with an API Key.")
+
+    @classmethod
+    def from_settings(cls, settings, log=None):
+        return cls(pool_members(settings), load_health(settings), log=log)
+
+    @staticmethod
+    def headroom(rate_limits):
+        try:
+            remaining = float(rate_limits["x-ratelimit-remaining-requests"])
+            limit = float(rate_limits["x-ratelimit-limit-requests"])
+            return max(0.05, remaining / limit) if limit else 1.0
+        except (KeyError, ValueError):
+            return 1.0
+
+    def weight(self, member):
+        latency = member["latency"] or DEFAULT_LATENCY
+        return member["headroom"] / latency / (1 + member["in_flight"])
+
+    def acquire(self, tried, should_stop):
+        """Pick a service for the next attempt, preferring ones this batch hasn't tried."""
+        with self.lock:
+            now = time.time()
+            usable = [m for m in self.members if not m["disabled"]]
+            if not usable:
+                raise TranslationError("Every service in the pool rejected its key or quota.")
+            ready = [m for m in usable if m["cooldown_until"] <= now]
+            candidates = [m for m in ready if m["key"] not in tried] or ready
+            if not candidates:
+                # Everything is cooling down: wait for whichever comes back first
+                member = min(usable, key=lambda m: m["cooldown_until"])
+                wait = member["cooldown_until"] - now
+            else:
+                member = random.choices(candidates, weights=[self.weight(m) for m in candidates])[0]
+                wait = 0
+            member["in_flight"] += 1
+        interruptible_sleep(wait, should_stop)
+        return member
+
+    def release(self, member, elapsed=None, error=None, fatal=False):
+        with self.lock:
+            member["in_flight"] -= 1
+            if fatal:
+                member["disabled"] = True
+                self.log(f"Pool: dropping {member['name']} ({error})")
+            elif error is not None:
+                member["failures"] += 1
+                cooldown = min(MAX_COOLDOWN, COOLDOWN * 2 ** (member["failures"] - 1))
+                member["cooldown_until"] = time.time() + cooldown
+                self.log(f"Pool: {member['name']} failed, resting it for {cooldown}s")
+            elif elapsed is not None:
+                member["failures"] = 0
+                member["batches"] += 1
+                if member["latency"] is None:
+                    member["latency"] = elapsed
+                else:
+                    member["latency"] += LATENCY_SMOOTHING * (elapsed - member["latency"])
+
+    def translate(self, target_lang, texts, log=None, should_stop=None, metrics=NULL_METRICS,
+                  context=None, glossary=None, stream=False, on_segment=None):
+        """Same contract as translate_batch; each attempt may go to a different service
+        and only carries the segments still missing."""
+        should_stop = should_stop or (lambda: False)
+        results = [None] * len(texts)
+        tried = set()
+        for _ in range(max(3, len(self.members))):
+            missing = [i for i, text in enumerate(results) if text is None]
+            if not missing or should_stop():
+                break
+            member = self.acquire(tried, should_stop)
+            tried.add(member["key"])
+            if should_stop():
+                self.release(member)
+                break
+            started = time.perf_counter()
+            try:
+                translations = translate_batch(member["client"], member["model"], target_lang,
+                                               [texts[i] for i in missing], log=log, should_stop=should_stop,
+                                               metrics=metrics, retries=1, context=context, glossary=glossary,
+                                               stream=stream, on_segment=on_segment and (
+                                                   lambda j, text, missing=missing: on_segment(missing[j], text)))
+            except TranslationError as e:
+                self.release(member, error=e, fatal=True)
+                continue
+            except Exception as e:
+                self.release(member, error=e)
+                continue
+            if translations is None:
+                self.release(member, error=None if should_stop() else "request failed")
+                continue
+            self.release(member, elapsed=time.perf_counter() - started)
+            for i, text in zip(missing, translations):
+                results[i] = text
+        if should_stop() or all(text is None for text in results):
+            return None
+        return results
+
+    def summary(self):
+        with self.lock:
+            return ", ".join(f"{m['name']}: {m['batches']} batch(es)"
+                             + (" (dropped)" if m["disabled"] else "") for m in self.members)
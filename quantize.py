@@ -0,0 +1,62 @@
+import os
+from dataclasses import asdict
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+from cancellation import remove_quietly
+
+# Dynamically quantized checkpoints live next to the originals as "<stem>.int8.pt"
+QUANTIZED_SUFFIX = ".int8.pt"
+
+def quantized_filename(filename):
+    stem = filename[:-len(".pt")] if filename.endswith(".pt") else filename
+    return stem + QUANTIZED_SUFFIX
+
+def is_quantized_path(name_or_path):
+    return str(name_or_path).endswith(QUANTIZED_SUFFIX)
+
+def quantize_linear_layers(model):
+    """int8 dynamic quantization of every Linear layer (CPU inference only)."""
+    # whisper subclasses nn.Linear only to cast weights to the input dtype,
+    # which is a no-op in fp32; quantize_dynamic only accepts the base class.
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def quantize_checkpoint(model_name_or_path, output_path, cancel=None):
+    """Load a whisper checkpoint on CPU, quantize it and save it to output_path.
+
+    cancel (a CancelToken) is checked between the load, quantize and save steps.
+    """
+    check = cancel.raise_if_cancelled if cancel else (lambda: None)
+    model = whisper.load_model(model_name_or_path, device="cpu")
+    check()
+    alignment_heads = whisper._ALIGNMENT_HEADS.get(model_name_or_path)
+    qmodel = quantize_linear_layers(model.eval())
+    check()
+
+    checkpoint = {
+        "dims": asdict(model.dims),
+        "model_state_dict": qmodel.state_dict(),
+        "quantization": "dynamic_int8",
+        "alignment_heads": alignment_heads,
+    }
+    tmp_path = output_path + ".tmp"
+    try:
+        torch.save(checkpoint, tmp_path)
+        os.replace(tmp_path, output_path)
+    finally:
+        remove_quietly(tmp_path) # Only still there if saving failed
+    return output_path
+
+def load_quantized(path):
+    """Rebuild a quantized model saved by quantize_checkpoint (always on CPU)."""
+    # Packed int8 params aren't plain tensors; the file is produced locally by quantize_checkpoint
+    checkpoint = torch.load(path, map_location="cpu", weights_only=False)
+    model = Whisper(ModelDimensions(**checkpoint["dims"]))
+    model = quantize_linear_layers(model.eval())
+    model.load_state_dict(checkpoint["model_state_dict"])
+    if checkpoint.get("alignment_heads"):
+        model.set_alignment_heads(checkpoint["alignment_heads"])
+    return model
@@ -0,0 +1,59 @@
+import threading
+from contextlib import contextmanager
+from PyQt6.QtCore import QSettings
+
+# Resource classes shared by every job type: 'cpu' covers transcription,
+# burning and quantization; 'network' covers API requests and downloads.
+# (settings key, default) for each limit
+LIMIT_SETTINGS = {
+    "cpu": ("concurrent_transcriptions", 1),
+    "network": ("concurrent_requests", 4),
+}
+
+class SlotCancelled(Exception):
+    """Raised when should_stop() turns true while waiting for a slot."""
+
+class ResourceLimiter:
+    """Global concurrency limits, read from Settings each time a slot is requested."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.active = {kind: 0 for kind in LIMIT_SETTINGS}
+
+    def limit(self, kind):
+        key, default = LIMIT_SETTINGS[kind]
+        return max(1, int(QSettings("MacWhisper", "Config").value(key, default)))
+
+    def usage(self):
+        with self.cond:
+            return {kind: (self.active[kind], self.limit(kind)) for kind in self.active}
+
+    @contextmanager
+    def slot(self, kind, should_stop=None, log=None):
+        with self.cond:
+            announced = False
+            while self.active[kind] >= self.limit(kind):
+                if should_stop and should_stop():
+                    raise SlotCancelled(f"Stopped while waiting for a {kind} slot.")
+                if log and not announced:
+                    log(f"Waiting for a free {kind} slot...")
+                    announced = True
+                # Wake up now and then to notice a stop request or a raised limit
+                self.cond.wait(0.5)
+            self.active[kind] += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.active[kind] -= 1
+                self.cond.notify_all()
+
+_limiter = ResourceLimiter()
+
+def resource_slot(kind, should_stop=None, log=None):
+    """Hold one of the global 'cpu' / 'network' slots for the duration of a block."""
+    return _limiter.slot(kind, should_stop, log)
+
+def resource_usage():
+    """{kind: (active, limit)}"""
+    return _limiter.usage()
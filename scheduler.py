@@ -0,0 +1,180 @@
+import time
+from PyQt6.QtCore import QObject, QThread, QSettings, QTimer, pyqtSignal
+from job_store import get_job_store
+from resources import resource_usage
+
+def make_pipeline_worker(job):
+    from pipeline import PipelineWorker
+    return PipelineWorker([job["inputs"]["video"]], job["options"],
+                          job_ids=[job["id"]], artifacts=[job["artifacts"]])
+
+def make_extraction_worker(job):
+    from worker import Worker
+    options = job["options"]
+    return Worker("transcribe", options["model_name"], job["inputs"]["video"],
+                  backend=options["backend"], segmentation=options.get("segmentation"))
+
+def make_translation_worker(job):
+    from ui.translation import TranslationWorker
+    from translator import configured_providers, base_url_for
+    from provider_pool import POOL_KEY
+    options = job["options"]
+    provider = options["provider_key"]
+    api_key, base_url = "", None
+    if provider != POOL_KEY:
+        # Looked up when the job starts, so keys never end up in the job store
+        for _, service_key, config in configured_providers(QSettings("MacWhisper", "Config")):
+            if service_key == provider:
+                api_key, base_url = config.get("api_key", ""), base_url_for(service_key, config)
+                break
+    return TranslationWorker(api_key, job["inputs"]["subtitle"], options["target_lang"], model=options["model"],
+                             base_url=base_url, provider=provider, context_cues=options["context_cues"],
+                             glossary=options["glossary"], stream=options["stream"])
+
+def make_burn_worker(job):
+    from PyQt6.QtGui import QColor
+    from ui.burning import BurningWorker
+    options = job["options"]
+    config = dict(options["config"])
+    config["font_color"] = QColor(config.get("font_color") or "#FFFFFF")
+    return BurningWorker(job["inputs"]["video"], job["inputs"]["subtitle"], options["output_path"],
+                         config, mode=options["mode"])
+
+# Job type -> factory building the worker (a QThread) for one stored job
+JOB_RUNNERS = {
+    "pipeline": make_pipeline_worker,
+    "extraction": make_extraction_worker,
+    "translation": make_translation_worker,
+    "burn": make_burn_worker,
+}
+
+# Jobs whose result ends up on disk, so they can be resumed or retried without
+# the page that submitted them. Extraction and translation results only go to
+# their page, so those jobs end with the app.
+RESUMABLE_TYPES = ("pipeline", "burn")
+
+JOB_LOOKAHEAD = 1 # Jobs started beyond the CPU slots, ready to take the next free one
+
+class JobScheduler(QObject):
+    """Runs stored jobs, oldest first, and resumes unfinished ones after a restart.
+
+    Inside a job each stage waits for its own global slot, so e.g. one
+    file's translation overlaps the next file's transcription. See
+    max_running() for how many jobs are started at once.
+    """
+    job_changed = pyqtSignal(int) # job id (status, stage or artifacts changed)
+    job_started = pyqtSignal(int, object) # job id, worker (for its progress and result signals)
+    stage_changed = pyqtSignal(int, str, str) # job id, stage, status
+    log = pyqtSignal(int, str) # job id, message
+
+    def __init__(self):
+        super().__init__()
+        self.store = get_job_store()
+        self.running = {} # job id -> worker
+
+    def max_running(self):
+        """Concurrent transcriptions (CPU slots) plus JOB_LOOKAHEAD.
+
+        Transcribing and burning both need a CPU slot, so that is what bounds
+        throughput; every extra running job only adds idle threads waiting on
+        a slot. The lookahead keeps one job queued at the slot, so it starts
+        transcribing as soon as an earlier job moves on to translating.
+        """
+        return resource_usage()["cpu"][1] + JOB_LOOKAHEAD
+
+    def submit(self, job_type, label, inputs, options):
+        if job_type not in JOB_RUNNERS:
+            raise ValueError(f"Unknown job type '{job_type}'.")
+        job_id = self.store.add(job_type, label, inputs, options)
+        self.job_changed.emit(job_id)
+        # Started from the event loop, so the caller can match job_started to the returned id
+        QTimer.singleShot(0, self.pump)
+        return job_id
+
+    def resume(self):
+        """Requeue jobs a crash or quit left running, then start what fits."""
+        count = self.store.requeue_interrupted(RESUMABLE_TYPES)
+        self.pump()
+        return count
+
+    def pump(self):
+        while len(self.running) < self.max_running():
+            job = self.store.next_queued(exclude=self.running)
+            if not job:
+                break
+            self.start_job(job)
+
+    def start_job(self, job):
+        job_id = job["id"]
+        try:
+            worker = JOB_RUNNERS[job["type"]](job)
+        except Exception as e:
+            self.store.update(job_id, status="failed", error=str(e), finished_at=time.time())
+            self.job_changed.emit(job_id)
+            return
+        self.store.update(job_id, status="running", started_at=job["started_at"] or time.time())
+        worker.log.connect(lambda msg, job_id=job_id: self.log.emit(job_id, msg))
+        worker.error.connect(lambda msg, job_id=job_id: self.log.emit(job_id, f"Error: {msg}"))
+        if hasattr(worker, "stage_changed"):
+            worker.stage_changed.connect(
+                lambda _, stage, status, job_id=job_id: self.stage_changed.emit(job_id, stage, status))
+        # Workers redefine finished (with arguments) as their result signal; QThread's own
+        # finished() still fires however run() ends
+        outcome = {}
+        worker.finished.connect(lambda *_: outcome.setdefault("done", True))
+        worker.error.connect(lambda msg: outcome.setdefault("error", msg))
+        QThread.finished.__get__(worker, QThread).connect(
+            lambda job_id=job_id: self.on_job_finished(job_id, outcome))
+        self.running[job_id] = worker
+        self.job_started.emit(job_id, worker)
+        worker.start()
+        self.job_changed.emit(job_id)
+
+    def on_job_finished(self, job_id, outcome):
+        worker = self.running.pop(job_id, None)
+        if worker is not None:
+            worker.wait()
+        job = self.store.get(job_id)
+        if job and job["status"] == "running":
+            # Pipelines record their own outcome; other workers only emit it
+            if outcome.get("done"):
+                status, error = "done", None
+            elif worker is not None and worker.token.cancelled:
+                status, error = "cancelled", None
+            else:
+                status, error = "failed", outcome.get("error", "Stopped without a result.")
+            self.store.update(job_id, status=status, error=error, finished_at=time.time())
+        self.job_changed.emit(job_id)
+        self.pump()
+
+    def cancel(self, job_id):
+        worker = self.running.get(job_id)
+        if worker is not None:
+            worker.stop() # The worker records 'cancelled' when it winds down
+        else:
+            job = self.store.get(job_id)
+            if job and job["status"] == "queued":
+                self.store.update(job_id, status="cancelled", finished_at=time.time())
+                self.job_changed.emit(job_id)
+
+    def retry(self, job_id):
+        job = self.store.get(job_id)
+        if job and job["type"] in RESUMABLE_TYPES and job["status"] in ("failed", "cancelled") \
+                and job_id not in self.running:
+            # Artifacts are kept, so finished stages are skipped
+            self.store.update(job_id, status="queued", error=None, finished_at=None)
+            self.job_changed.emit(job_id)
+            self.pump()
+
+    def stop_all(self):
+        for worker in list(self.running.values()):
+            worker.stop()
+
+_scheduler = None
+
+def get_scheduler():
+    """The shared JobScheduler (created on first use, on the GUI thread)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
@@ -0,0 +1,226 @@
+import os
+import re
+import json
+import hashlib
+
+ASS_CACHE_DIR = os.path.expanduser("~/.cache/macwhisper/ass")
+ASS_FORMAT_VERSION = 2 # Bump when build_ass output changes, so cached files are regenerated
+
+# libass lays out SRT input on a 384x288 canvas, which is what the burn
+# page's font size / margin / outline values have always been relative to.
+SRT_PLAY_RES_Y = 288
+
+SRT_TIME_RE = re.compile(
+    r"(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+
+def format_srt_time(seconds):
+    millis_total = int(round(seconds * 1000))
+    hours, rem = divmod(millis_total, 3600 * 1000)
+    minutes, rem = divmod(rem, 60 * 1000)
+    secs, millis = divmod(rem, 1000)
+    return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
+
+def format_ass_time(seconds):
+    centis_total = int(round(seconds * 100))
+    hours, rem = divmod(centis_total, 3600 * 100)
+    minutes, rem = divmod(rem, 60 * 100)
+    secs, centis = divmod(rem, 100)
+    return f"{hours}:{minutes:02}:{secs:02}.{centis:02}"
+
+def parse_srt(content):
+    """Parse SRT text into a list of {'start', 'end', 'text'} cues (seconds)."""
+    cues = []
+    content = content.lstrip("\ufeff").replace("\r\n", "\n")
+    for block in re.split(r"\n\s*\n", content.strip()):
+        lines = block.strip().split("\n")
+        for i, line in enumerate(lines[:2]):
+            m = SRT_TIME_RE.search(line)
+            if not m:
+                continue
+            g = [int(x) for x in m.groups()]
+            start = g[0] * 3600 + g[1] * 60 + g[2] + int(m.group(4).ljust(3, "0")) / 1000
+            end = g[4] * 3600 + g[5] * 60 + g[6] + int(m.group(8).ljust(3, "0")) / 1000
+            cues.append({"start": start, "end": end, "text": "\n".join(lines[i + 1:]).strip()})
+            break
+    return cues
+
+def write_srt(cues, file_name):
+    with open(file_name, 'w', encoding='utf-8') as f:
+        for i, cue in enumerate(cues, start=1):
+            f.write(f"{i}\n{format_srt_time(cue['start'])} --> {format_srt_time(cue['end'])}\n{cue['text'].strip()}\n\n")
+
+# The burn page stores legacy SSA alignment codes (1-3 bottom, 5-7 top,
+# 9-11 middle); [V4+ Styles] expects numpad layout.
+LEGACY_TO_NUMPAD_ALIGNMENT = {1: 1, 2: 2, 3: 3, 5: 7, 6: 8, 7: 9, 9: 4, 10: 5, 11: 6}
+
+SENTENCE_END = tuple(".?!。？！")
+
+def resegment(segments, max_chars=42, max_lines=2, max_duration=6.0, min_gap=0.08, pause=1.0):
+    """Rebuild cues from word timestamps in one pass over the words.
+
+    A cue is closed when adding the next word would need more than
+    max_lines lines of max_chars, would stretch it past max_duration, or
+    follows a pause longer than `pause` seconds; a cue that is already
+    half full is also closed at the end of a sentence. Cue ends are pulled
+    back so consecutive cues are at least min_gap apart. Segments without
+    'words' are kept as they are.
+    """
+    cues = []
+    lines, line, line_len = [], [], 0
+    cue_start = last_end = None
+
+    def flush():
+        nonlocal lines, line, line_len, cue_start
+        if line:
+            lines.append("".join(line).strip())
+        if lines:
+            cues.append({"start": cue_start, "end": last_end, "text": "\n".join(lines)})
+        lines, line, line_len, cue_start = [], [], 0, None
+
+    for segment in segments:
+        words = segment.get("words")
+        if not words:
+            flush()
+            cues.append({"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()})
+            last_end = segment["end"]
+            continue
+        for w in words:
+            text = w["word"]
+            if not text.strip():
+                continue
+            # Width the word adds to the current line (its leading space only counts mid-line)
+            n = len(text) if line else len(text.strip())
+            if cue_start is not None:
+                too_long = w["end"] - cue_start > max_duration
+                paused = w["start"] - last_end > pause
+                overflow = line_len + n > max_chars and len(lines) + 1 >= max_lines
+                if too_long or paused or overflow:
+                    flush()
+            if cue_start is None:
+                cue_start = w["start"]
+                text = text.lstrip()
+            elif line_len + n > max_chars:
+                lines.append("".join(line).strip())
+                line, line_len = [], 0
+                text = text.lstrip()
+            line.append(text)
+            line_len += len(text)
+            last_end = w["end"]
+            filled = sum(len(l) for l in lines) + line_len
+            if text.rstrip().endswith(SENTENCE_END) and filled >= max_chars * max_lines // 2:
+                flush()
+    flush()
+
+    for prev, cur in zip(cues, cues[1:]):
+        if cur["start"] - prev["end"] < min_gap:
+            prev["end"] = max(prev["start"], cur["start"] - min_gap)
+    return cues
+
+def ass_colour(hex_color):
+    """'#RRGGBB' -> '&H00BBGGRR' (ASS stores colours as alpha+BGR)."""
+    h = hex_color.lstrip("#")
+    r, g, b = h[0:2], h[2:4], h[4:6]
+    return f"&H00{b}{g}{r}".upper()
+
+# Word joiner: invisible, but stops libass reading "\N", "\h" etc. after a literal backslash
+ASS_BACKSLASH = "\\\u2060"
+
+def ass_escape(text):
+    """Make SRT text literal in ASS: backslashes and braces would otherwise start override tags."""
+    return text.replace("\\", ASS_BACKSLASH).replace("{", "\\{").replace("}", "\\}")
+
+def ass_text(text):
+    text = ass_escape(text)
+    # Basic SRT markup maps directly onto ASS override tags
+    for tag in ("i", "b", "u"):
+        text = re.sub(rf"<{tag}>", rf"{{\\{tag}1}}", text, flags=re.IGNORECASE)
+        text = re.sub(rf"</{tag}>", rf"{{\\{tag}0}}", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", "", text)
+    return text.strip().replace("\n", "\\N")
+
+def build_ass(tracks, play_res):
+    """Render one or more (style, cues) tracks into an ASS document.
+
+    `style` is a plain dict (font_family, font_size, color, alignment,
+    margin_v, outline, shadow, name) expressed on the SRT 288-line canvas;
+    it is scaled to the real PlayRes so existing settings look the same.
+    """
+    width, height = play_res
+    scale = height / SRT_PLAY_RES_Y
+
+    out = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "YCbCr Matrix: TV.709",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+    ]
+    for style, _ in tracks:
+        font_family = style.get("font_family", "Arial").replace(",", " ")
+        out.append(
+            f"Style: {style['name']},{font_family},{round(style.get('font_size', 24) * scale)},"
+            f"{ass_colour(style.get('color', '#FFFFFF'))},&H000000FF,&H00000000,&H80000000,"
+            f"0,0,0,0,100,100,0,0,1,{style.get('outline', 1) * scale:.1f},{style.get('shadow', 1) * scale:.1f},"
+            f"{LEGACY_TO_NUMPAD_ALIGNMENT.get(style.get('alignment', 2), 2)},{round(10 * scale)},{round(10 * scale)},"
+            f"{round(style.get('margin_v', 10) * scale)},1"
+        )
+    out += [
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    # Everything stays on layer 0 so libass's collision handling keeps the
+    # two languages of a bilingual burn from overlapping
+    for style, cues in tracks:
+        for cue in cues:
+            out.append(
+                f"Dialogue: 0,{format_ass_time(cue['start'])},{format_ass_time(cue['end'])},"
+                f"{style['name']},,0,0,0,,{ass_text(cue['text'])}"
+            )
+    return "\n".join(out) + "\n"
+
+def _file_signature(path):
+    st = os.stat(path)
+    return [os.path.abspath(path), st.st_mtime, st.st_size]
+
+def ensure_ass(subtitle_path, style, play_res, secondary_path=None, secondary_style=None):
+    """Return the path of an .ass file for these inputs, generating it at most once.
+
+    Files are cached in ASS_CACHE_DIR keyed by the subtitle file(s), the style
+    and the resolution, so repeated burns and previews reuse the same file.
+    """
+    key = {
+        "format": ASS_FORMAT_VERSION,
+        "subtitle": _file_signature(subtitle_path),
+        "style": style,
+        "play_res": list(play_res),
+    }
+    if secondary_path:
+        key["secondary"] = _file_signature(secondary_path)
+        key["secondary_style"] = secondary_style
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    os.makedirs(ASS_CACHE_DIR, exist_ok=True)
+    ass_path = os.path.join(ASS_CACHE_DIR, f"{digest}.ass")
+    if os.path.exists(ass_path):
+        return ass_path
+
+    with open(subtitle_path, 'r', encoding='utf-8', errors='replace') as f:
+        tracks = [(dict(style, name="Primary"), parse_srt(f.read()))]
+    if secondary_path:
+        with open(secondary_path, 'r', encoding='utf-8', errors='replace') as f:
+            tracks.append((dict(secondary_style, name="Secondary"), parse_srt(f.read())))
+
+    tmp_path = ass_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(build_ass(tracks, play_res))
+    os.replace(tmp_path, ass_path)
+    return ass_path
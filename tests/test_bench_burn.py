@@ -0,0 +1,14 @@
+import ui.burning
+from benchmarks.bench_burn import default_burn_config
+from ui.burning import build_subtitle_filter
+
+def test_filter_without_resolution_uses_force_style(tmp_path, monkeypatch):
+    # ffprobe can't tell the size: the filter falls back to force_style, which needs a QColor
+    monkeypatch.setattr(ui.burning, "probe_resolution", lambda path: None)
+    srt = tmp_path / "a.srt"
+    srt.write_text("1\n00:00:00,000 --> 00:00:01,000\nHello\n", encoding="utf-8")
+
+    vf = build_subtitle_filter(str(srt), default_burn_config(), str(tmp_path / "missing.mp4"))
+
+    assert vf.startswith("subtitles=")
+    assert "PrimaryColour=&HFFFFFF&" in vf
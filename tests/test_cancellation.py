@@ -0,0 +1,52 @@
+import threading
+import time
+import pytest
+from cancellation import CancelToken, Cancelled, call_cancellable
+from translator import stream_completion
+
+class FakeStream:
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        return iter(())
+
+    def close(self):
+        self.closed.set()
+
+def slow(result, delay):
+    def fn():
+        time.sleep(delay)
+        return result
+    return fn
+
+def test_abandoned_result_is_discarded():
+    token = CancelToken()
+    stream = FakeStream()
+    threading.Timer(0.1, token.cancel).start()
+    with pytest.raises(Cancelled):
+        call_cancellable(slow(stream, 0.4), token, discard=lambda s: s.close())
+    assert not stream.closed.is_set() # Still waiting on the server
+    assert stream.closed.wait(2)
+
+def test_result_is_kept_when_not_cancelled():
+    stream = FakeStream()
+    assert call_cancellable(slow(stream, 0.05), CancelToken(), discard=lambda s: s.close()) is stream
+    assert not stream.closed.is_set()
+
+def test_stream_completion_closes_stream_opened_after_cancel():
+    stream = FakeStream()
+
+    class Completions:
+        def create(self, **request):
+            time.sleep(0.4) # Headers arrive after the stop
+            return stream
+
+    client = type("Client", (), {})()
+    client.chat = type("Chat", (), {})()
+    client.chat.completions = Completions()
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    assert stream_completion(client, {}, token, lambda *entry: None, {}) is None
+    assert stream.closed.wait(2)
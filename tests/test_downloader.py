@@ -0,0 +1,124 @@
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import downloader
+
+DATA = os.urandom(3 * 1024 * 1024 + 123)
+SHA256 = hashlib.sha256(DATA).hexdigest()
+
+class FileServer:
+    """Serves DATA at any path; honours Range requests unless ranges=False."""
+
+    def __init__(self, ranges=True):
+        self.ranges = ranges
+        self.range_headers = [] # Range header of every GET (None when absent)
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/model.pt"
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(DATA)))
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+
+            def do_GET(self):
+                header = self.headers.get("Range")
+                with server.lock:
+                    server.range_headers.append(header)
+                match = re.match(r"bytes=(\d+)-(\d*)", header or "")
+                if not server.ranges or not match:
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(DATA)))
+                    self.end_headers()
+                    self.wfile.write(DATA)
+                    return
+                start = int(match.group(1))
+                end = int(match.group(2)) if match.group(2) else len(DATA) - 1
+                if start >= len(DATA):
+                    self.send_response(416)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(DATA)}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                self.wfile.write(DATA[start:end + 1])
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**options):
+        servers.append(FileServer(**options).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def test_resumes_truncated_part(serve, tmp_path):
+    server = serve()
+    target = str(tmp_path / "model.pt")
+    with open(target + ".part", "wb") as f:
+        f.write(DATA[:1000])
+    downloader.download_file(server.url, target, expected_sha256=SHA256, connections=1)
+    assert server.range_headers == ["bytes=1000-"]
+    assert read(target) == DATA
+    assert not os.path.exists(target + ".part")
+
+def test_restarts_when_server_ignores_range(serve, tmp_path):
+    server = serve(ranges=False)
+    target = str(tmp_path / "model.pt")
+    with open(target + ".part", "wb") as f:
+        f.write(b"stale bytes that must not end up in front")
+    downloader.download_file(server.url, target, expected_sha256=SHA256, connections=1)
+    assert server.range_headers[0].startswith("bytes=") # Asked to resume, got the whole file
+    assert read(target) == DATA
+
+def test_parallel_download_reassembles_file(serve, tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "PARALLEL_THRESHOLD", 1)
+    server = serve()
+    target = str(tmp_path / "model.pt")
+    downloader.download_file(server.url, target, expected_sha256=SHA256, connections=4)
+    assert len(server.range_headers) == 4
+    assert read(target) == DATA
+    assert sorted(os.listdir(tmp_path)) == ["model.pt"] # No .part or resume state left
+
+def test_checksum_mismatch_leaves_no_file(serve, tmp_path, monkeypatch):
+    monkeypatch.setattr(downloader, "PARALLEL_THRESHOLD", 1)
+    server = serve()
+    target = str(tmp_path / "model.pt")
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        downloader.download_file(server.url, target, expected_sha256="0" * 64, connections=4)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,13 @@
+import ui.burning
+from ui.burning import BurningWorker
+
+def test_mux_maps_only_av_and_subtitle_streams(monkeypatch):
+    monkeypatch.setattr(ui.burning, "probe_stream_count", lambda path, kind: 1)
+    worker = BurningWorker("/in/v.mov", "/in/v.srt", "/out/v.mp4", {"language": "eng"}, mode="mux")
+
+    cmd = worker.build_mux_command("mp4")
+
+    maps = [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-map"]
+    assert maps == ["0:v", "0:a?", "0:s?", "1:s:0"] # No data streams or attachments
+    assert cmd[cmd.index("-c:s") + 1] == "mov_text"
+    assert "-metadata:s:s:1" in cmd # After the source's own subtitle track
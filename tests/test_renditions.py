@@ -0,0 +1,26 @@
+from ui.burning import plan_renditions, rendition_outputs
+
+def test_heights_not_below_source_are_skipped():
+    renditions, skipped = plan_renditions(True, [720, 1080], source_height=720)
+    assert renditions == [None]
+    assert skipped == [720, 1080]
+
+def test_small_source_without_source_size_gets_no_outputs():
+    # No silent source-size substitution, so no duplicate full-size files either
+    renditions, skipped = plan_renditions(False, [720, 1080], source_height=480)
+    assert renditions == []
+    assert skipped == [720, 1080]
+
+def test_lower_heights_are_kept_once():
+    renditions, skipped = plan_renditions(True, [720, 1080, 720], source_height=1080)
+    assert renditions == [None, 720]
+    assert skipped == [1080]
+    paths = [path for _, path in rendition_outputs("/out/v.mp4", renditions)]
+    assert paths == ["/out/v.mp4", "/out/v_720p.mp4"]
+
+def test_unknown_source_height_keeps_everything():
+    assert plan_renditions(False, [720], source_height=None) == ([720], [])
+
+def test_single_rendition_uses_chosen_path():
+    assert rendition_outputs("/out/v.mp4", [720]) == [(720, "/out/v.mp4")]
+    assert rendition_outputs("/out/v.mp4", []) == [(None, "/out/v.mp4")]
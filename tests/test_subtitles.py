@@ -0,0 +1,17 @@
+from subtitles import ASS_BACKSLASH, ass_text, build_ass
+
+def test_override_tags_in_cue_text_stay_literal():
+    assert ass_text("{\\b1}bold?{\\b0}") == "\\{" + ASS_BACKSLASH + "b1\\}bold?\\{" + ASS_BACKSLASH + "b0\\}"
+
+def test_backslashes_cannot_form_line_breaks():
+    # "C:\new" must not turn into a line break
+    assert ass_text("C:\\new\\Name") == "C:" + ASS_BACKSLASH + "new" + ASS_BACKSLASH + "Name"
+
+def test_srt_markup_and_line_breaks_still_convert():
+    assert ass_text("<i>hi</i> {x}\nthere") == "{\\i1}hi{\\i0} \\{x\\}\\Nthere"
+
+def test_dialogue_line_carries_escaped_text():
+    style = {"name": "Primary"}
+    doc = build_ass([(style, [{"start": 0, "end": 1, "text": "a {\\pos(0,0)} b"}])], (1920, 1080))
+    dialogue = [line for line in doc.splitlines() if line.startswith("Dialogue:")][0]
+    assert dialogue.endswith(",a \\{" + ASS_BACKSLASH + "pos(0,0)\\} b")
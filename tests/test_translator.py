@@ -0,0 +1,54 @@
+import random
+import pytest
+from benchmarks.mock_openai import MockOpenAIServer
+from translator import SegmentStream, make_client, parse_translations, translate_batch
+
+@pytest.mark.parametrize("content, expected", [
+    ('{"translations": [{"id": 1, "text": "Hallo"}, {"id": 2, "text": "Welt"}]}', {1: "Hallo", 2: "Welt"}),
+    ('```json\n{"translations": [{"id": 1, "text": "Hallo"}]}\n```', {1: "Hallo"}),
+    ('Here you go: [{"id": 2, "text": " Welt "}] Done.', {2: "Welt"}),
+    ('{"1": "Hallo", "2": "Welt"}', {1: "Hallo", 2: "Welt"}),
+    ('{"translations": [{"id": "2", "text": "Welt"}, {"id": 1, "text": "  "}]}', {2: "Welt"}),
+    ('{"translations": [{"id": 3, "text": "not asked for"}, {"text": "no id"}]}', {}),
+    ('{"translations": [{"id": 1, "text": "cut off', {}),
+    ("Sorry, I can't help with that.", {}),
+])
+def test_parse_translations(content, expected):
+    assert parse_translations(content, {1, 2}) == expected
+
+REPLY = '{"translations":[{"id":1,"text":"a {b} \\"c\\""},{"id":2,"text":"}\\\\"}]}'
+
+@pytest.mark.parametrize("chunks", [
+    [REPLY],
+    list(REPLY), # One character at a time
+    [REPLY[:20], REPLY[20:41], REPLY[41:]],
+])
+def test_segment_stream_reassembles_split_entries(chunks):
+    stream = SegmentStream()
+    entries = []
+    for chunk in chunks:
+        entries += stream.feed(chunk)
+    assert entries == [(1, 'a {b} "c"'), (2, "}\\")]
+
+def test_segment_stream_reports_entries_once_complete():
+    stream = SegmentStream()
+    assert stream.feed('{"translations":[{"id":1,"text":"x"') == []
+    assert stream.feed('},{"id":2,') == [(1, "x")]
+    assert stream.feed('"text":"y"}]}') == [(2, "y")]
+
+def test_translate_batch_rerequests_only_missing_ids():
+    random.seed(3)
+    server = MockOpenAIServer(latency=0, drop_rate=0.4).start()
+    try:
+        client = make_client("test-key", server.base_url)
+        texts = [f"line {i}" for i in range(12)]
+        result = translate_batch(client, "mock", "German", texts, retries=5)
+    finally:
+        server.stop()
+
+    assert len(server.batches) > 1
+    assert server.batches[0][0] == list(range(1, 13))
+    for (asked, returned), (asked_next, _) in zip(server.batches, server.batches[1:]):
+        assert asked_next == [i for i in asked if i not in returned]
+    returned = {i for _, kept in server.batches for i in kept}
+    assert result == [f"LINE {i}" if i + 1 in returned else None for i in range(12)]
@@ -0,0 +1,178 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import whisper
+from model_loader import get_model_cache
+from instrumentation import NULL_METRICS
+from profiling import torch_trace
+
+# CancelToken of the transcription running on each thread, checked by the model hooks below
+_active_tokens = threading.local()
+
+def _check_cancelled(module, args):
+    token = getattr(_active_tokens, "token", None)
+    if token is not None:
+        token.raise_if_cancelled()
+
+def install_cancel_hooks(model):
+    """Make a whisper model raise Cancelled at its next encoder or decoder pass.
+
+    model.transcribe has no callback, but it runs the encoder once per 30 s
+    window and the decoder once per token, so these hooks stop it between
+    decode steps. Models are shared across jobs, so the token is per thread.
+    """
+    if not getattr(model, "cancel_hooks_installed", False):
+        model.encoder.register_forward_pre_hook(_check_cancelled)
+        model.decoder.register_forward_pre_hook(_check_cancelled)
+        model.cancel_hooks_installed = True
+
+class TranscriptionBackend(ABC):
+    """One transcription engine.
+
+    transcribe() returns the same dict shape as whisper's model.transcribe:
+    {'text', 'language', 'segments': [{'id', 'start', 'end', 'text', ...}]}.
+    on_segment(segment), if given, is called for each segment as soon as the
+    engine has it (at the end for engines that can't stream). cancel, a
+    CancelToken, makes transcribe() raise Cancelled soon after it fires.
+    """
+    name = ""
+    label = ""
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    @abstractmethod
+    def transcribe(self, model_name, file_path, log=None, cpu_threads=None, metrics=NULL_METRICS, on_segment=None,
+                   cancel=None, **options):
+        ...
+
+class WhisperBackend(TranscriptionBackend):
+    """openai-whisper (PyTorch); models come from the shared ModelCache."""
+    name = "whisper"
+    label = "OpenAI Whisper (PyTorch)"
+
+    def transcribe(self, model_name, file_path, log=None, cpu_threads=None, metrics=NULL_METRICS, on_segment=None,
+                   cancel=None, **options):
+        # torch thread counts are applied to the calling thread by the Worker
+        cache = get_model_cache()
+        if log and cache.state(model_name) != "ready":
+            log(f"Loading model '{model_name}'...")
+        with metrics.span("model_load", model=os.path.basename(model_name)):
+            model = cache.get(model_name)
+        
+        # Decode up front (same as transcribe() does internally) so it is timed separately
+        with metrics.span("audio_decode") as span:
+            audio = whisper.load_audio(file_path)
+            span["bytes"] = os.path.getsize(file_path)
+            span["media_seconds"] = len(audio) / whisper.audio.SAMPLE_RATE
+        
+        if cancel:
+            cancel.raise_if_cancelled()
+            install_cancel_hooks(model)
+        _active_tokens.token = cancel
+        try:
+            with metrics.span("inference", media_seconds=len(audio) / whisper.audio.SAMPLE_RATE), \
+                    torch_trace(f"inference-{os.path.basename(model_name)}", log):
+                result = model.transcribe(audio, **options)
+        finally:
+            _active_tokens.token = None
+        # whisper has no per-segment callback, so everything arrives at once
+        if on_segment:
+            for segment in result["segments"]:
+                on_segment(segment)
+        return result
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper / CTranslate2 running int8 on CPU (optional dependency)."""
+    name = "faster-whisper"
+    label = "faster-whisper (CTranslate2, int8 CPU)"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (model name, cpu_threads) -> WhisperModel. CTranslate2 fixes the thread count at
+        # load time, so concurrent jobs with different shares each keep their own instance
+        self.models = {}
+
+    @classmethod
+    def is_available(cls):
+        try:
+            import faster_whisper  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def load(self, model_name, log=None, cpu_threads=None):
+        if model_name.endswith(".pt"):
+            raise ValueError("faster-whisper can't load PyTorch .pt checkpoints; pick a standard model name.")
+        key = (model_name, cpu_threads or 0) # 0 lets CTranslate2 pick
+        with self.lock:
+            model = self.models.get(key)
+            if model is None:
+                from faster_whisper import WhisperModel
+                if log:
+                    log(f"Loading CTranslate2 model '{model_name}' (int8, {key[1] or 'auto'} threads)...")
+                # Only one model name stays cached; jobs still running keep their own reference
+                self.models = {k: m for k, m in self.models.items() if k[0] == model_name}
+                model = self.models[key] = WhisperModel(model_name, device="cpu", compute_type="int8",
+                                                        cpu_threads=key[1])
+            return model
+
+    def transcribe(self, model_name, file_path, log=None, cpu_threads=None, metrics=NULL_METRICS, on_segment=None,
+                   cancel=None, **options):
+        with metrics.span("model_load", model=model_name):
+            model = self.load(model_name, log, cpu_threads)
+
+        # Decoding happens inside faster-whisper, so it is part of this span
+        with metrics.span("inference", bytes=os.path.getsize(file_path)) as span:
+            segments_iter, info = model.transcribe(file_path, **options)
+            span["media_seconds"] = info.duration
+            segments = self.collect_segments(segments_iter, on_segment, cancel)
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+    def collect_segments(self, segments_iter, on_segment=None, cancel=None):
+        segments = []
+        for i, seg in enumerate(segments_iter):
+            segment = {
+                "id": i,
+                "seek": seg.seek,
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "tokens": list(seg.tokens),
+                "temperature": seg.temperature,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob,
+            }
+            if seg.words:
+                segment["words"] = [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in seg.words
+                ]
+            segments.append(segment)
+            if on_segment:
+                on_segment(segment) # The iterator decodes lazily, so this streams
+            if cancel:
+                cancel.raise_if_cancelled() # Before the iterator decodes the next window
+        return segments
+
+BACKENDS = {cls.name: cls for cls in (WhisperBackend, FasterWhisperBackend)}
+_instances = {}
+
+def available_backends():
+    return [cls for cls in BACKENDS.values() if cls.is_available()]
+
+def get_backend(name):
+    """Shared backend instance, so loaded models are reused across jobs."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}'.")
+    if not BACKENDS[name].is_available():
+        raise ValueError(f"Transcription backend '{name}' is not installed.")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
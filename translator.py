@@ -0,0 +1,348 @@
+import re
+import json
+import time
+from functools import lru_cache
+from instrumentation import NULL_METRICS
+from resources import SlotCancelled, resource_slot
+from cancellation import Cancelled, call_cancellable, interruptible_sleep, on_cancel, shutdown_socket
+from provider_clients import get_provider_clients
+
+BATCH_SIZE = 10
+MAX_RETRIES = 3
+CONTEXT_MAX_CHARS = 1500 # Rolling context budget per request (a few hundred tokens)
+GLOSSARY_MAX_CHARS = 3000 # Larger glossaries only send the terms each batch uses
+
+# Display names for the built-in services; custom services bring their own
+SERVICE_NAMES = {
+    "deepseek": "DeepSeek",
+    "openai": "OpenAI",
+    "baidu": "Baidu Translate",
+    "aliyun": "Aliyun Translate",
+    "volcengine": "Volcengine",
+    "deeplx": "DeepLX",
+    "ollama": "Ollama"
+}
+
+# Used when a service is configured without a base URL
+DEFAULT_BASE_URLS = {
+    "deepseek": "https://api.deepseek.com",
+}
+
+# Base URLs that rejected response_format={"type": "json_object"}
+JSON_MODE_UNSUPPORTED = set()
+
+class TranslationError(Exception):
+    """A failure retrying won't fix (bad key, no quota)."""
+
+def configured_providers(settings):
+    """[(display name, service key, config)] for every service with credentials."""
+    try:
+        service_configs = json.loads(settings.value("service_configs", "{}"))
+    except (TypeError, ValueError):
+        service_configs = {}
+    try:
+        custom_services = json.loads(settings.value("custom_services_list", "[]"))
+    except (TypeError, ValueError):
+        custom_services = []
+
+    names = dict(SERVICE_NAMES)
+    for cs in custom_services:
+        names[cs["key"]] = cs["name"]
+
+    providers = []
+    for service_key, config in service_configs.items():
+        if not config:
+            continue
+        if any(k in config for k in ["api_key", "app_id", "access_key", "endpoint", "base_url"]):
+            providers.append((names.get(service_key, service_key.capitalize()), service_key, config))
+    return providers
+
+def base_url_for(service_key, config):
+    return config.get("base_url", "").strip() or DEFAULT_BASE_URLS.get(service_key, "")
+
+def make_client(api_key, base_url=None, provider=None):
+    """The shared, connection-pooled client for this provider and key."""
+    return get_provider_clients().get(provider, api_key, base_url)
+
+def parse_glossary(text):
+    """{term: translation} from lines like 'term = translation' (blank lines and # comments ignored)."""
+    glossary = {}
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        term, sep, translation = line.partition("=")
+        if not sep:
+            term, sep, translation = line.partition("\t")
+        if sep and term.strip() and translation.strip():
+            glossary[term.strip()] = translation.strip()
+    return glossary
+
+def glossary_text(glossary):
+    return "\n".join(f"{term} = {translation}" for term, translation in glossary)
+
+@lru_cache(maxsize=32)
+def system_prompt(target_lang, glossary=()):
+    """The instructions plus the job's glossary, kept byte-identical across a job's requests
+    so providers with prompt caching can reuse the prefix."""
+    prompt = (f"You are a professional subtitle translator. Translate each subtitle segment to {target_lang}. "
+              'The user sends JSON: {"segments": [{"id": 1, "text": "..."}, ...]}. '
+              'Reply with ONLY a JSON object: {"translations": [{"id": 1, "text": "..."}, ...]}, '
+              "with exactly one entry per id. Translate each segment on its own; do not merge or split segments, "
+              "and do not include the original text, line numbers, or timestamps. "
+              'The JSON may also carry "context": the subtitles just before these (with their translations '
+              "when known), for consistency only; never translate or return them. "
+              'Terms listed under "glossary" must be translated as given.')
+    if glossary:
+        prompt += "\nGlossary:\n" + glossary_text(glossary)
+    return prompt
+
+def split_glossary(glossary, texts):
+    """(terms for the system prompt, terms for this request).
+
+    A glossary that fits GLOSSARY_MAX_CHARS goes in the cached system
+    prompt whole; a bigger one only sends the terms these texts contain.
+    """
+    if not glossary:
+        return (), {}
+    items = tuple(sorted(glossary.items()))
+    if len(glossary_text(items)) <= GLOSSARY_MAX_CHARS:
+        return items, {}
+    combined = "\n".join(texts).lower()
+    return (), {term: translation for term, translation in items if term.lower() in combined}
+
+def rolling_context(previous, count):
+    """The last `count` cues before a batch, as [{"source", "translation"?}], trimmed to CONTEXT_MAX_CHARS.
+
+    previous holds (source, translation or None) pairs, oldest first.
+    """
+    context, used = [], 0
+    for source, translation in reversed(previous[-count:] if count else []):
+        entry = {"source": source}
+        if translation is not None:
+            entry["translation"] = translation
+        used += len(source) + len(translation or "")
+        if used > CONTEXT_MAX_CHARS:
+            break
+        context.append(entry)
+    return context[::-1]
+
+def batch_request(texts_by_id, context=None, glossary=None):
+    request = {}
+    if context:
+        request["context"] = context
+    if glossary:
+        request["glossary"] = glossary
+    request["segments"] = [{"id": i, "text": t} for i, t in texts_by_id.items()]
+    return json.dumps(request, ensure_ascii=False, separators=(",", ":"))
+
+def parse_translations(content, wanted_ids):
+    """{id: text} from a JSON reply, keeping only requested ids with non-empty text.
+
+    Tolerates code fences or chatter around the JSON, a bare list instead of
+    {"translations": [...]}, and an {"id": "text"} mapping.
+    """
+    starts = [i for i in (content.find("{"), content.find("[")) if i >= 0]
+    end = max(content.rfind("}"), content.rfind("]"))
+    if not starts or end < min(starts):
+        return {}
+    try:
+        data = json.loads(content[min(starts):end + 1])
+    except ValueError:
+        return {}
+    if isinstance(data, dict):
+        if "translations" in data:
+            data = data["translations"]
+        else:
+            data = [{"id": k, "text": v} for k, v in data.items()]
+    if not isinstance(data, list):
+        return {}
+
+    result = {}
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            segment_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        text = entry.get("text")
+        if segment_id in wanted_ids and isinstance(text, str) and text.strip():
+            result[segment_id] = text.strip()
+    return result
+
+class SegmentStream:
+    """Picks complete {"id": .., "text": ..} entries out of a JSON reply while it streams in."""
+    ENTRY_START = re.compile(r'\{\s*"(?:id|text)"')
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, chunk):
+        """Entries completed by this chunk, as (id, text)."""
+        self.buffer += chunk
+        entries = []
+        while True:
+            match = self.ENTRY_START.search(self.buffer, self.pos)
+            if not match:
+                break
+            try:
+                entry, end = self.decoder.raw_decode(self.buffer, match.start())
+            except ValueError:
+                break # Not complete yet
+            self.pos = end
+            try:
+                segment_id = int(entry.get("id"))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if isinstance(entry.get("text"), str) and entry["text"].strip():
+                entries.append((segment_id, entry["text"].strip()))
+        return entries
+
+def response_socket(response):
+    """Socket under an httpx response, or None when it's unknown or shared by HTTP/2 streams."""
+    extensions = getattr(response, "extensions", None) or {}
+    network_stream = extensions.get("network_stream")
+    if network_stream is None or extensions.get("http_version") == b"HTTP/2":
+        return None
+    return network_stream.get_extra_info("socket")
+
+def stream_completion(client, request, should_stop, on_entry, span):
+    """Run a streamed chat completion, handing each complete entry to on_entry(id, text).
+
+    Returns the whole reply, or None if should_stop() turned true; the
+    connection is closed right away rather than read to the end (with a
+    CancelToken, even while the server is still silent).
+    """
+    parser = SegmentStream()
+    parts = []
+    started = time.perf_counter()
+    try:
+        stream = call_cancellable(lambda: client.chat.completions.create(stream=True, **request), should_stop,
+                                  discard=lambda stream: stream.close())
+    except Cancelled:
+        return None
+    try:
+        with on_cancel(should_stop, lambda: shutdown_socket(response_socket(stream.response))):
+            for chunk in stream:
+                if should_stop():
+                    return None
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta and not parts:
+                    span["first_token_s"] = round(time.perf_counter() - started, 3)
+                parts.append(delta)
+                for segment_id, text in parser.feed(delta):
+                    on_entry(segment_id, text)
+    except Exception:
+        if should_stop():
+            return None # The read failed because cancelling closed the stream
+        raise
+    finally:
+        stream.close()
+    span["chunks"] = len(parts)
+    return "".join(parts)
+
+def cached_prompt_tokens(usage):
+    """Prompt tokens served from the provider's prefix cache, if it reports them."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details else None
+    if cached is None:
+        cached = getattr(usage, "prompt_cache_hit_tokens", None) # DeepSeek
+    return cached
+
+def translate_batch(client, model, target_lang, texts, log=None, should_stop=None, metrics=NULL_METRICS,
+                    retries=MAX_RETRIES, context=None, glossary=None, stream=False, on_segment=None):
+    """Translate a list of cue texts as one ID-keyed JSON request.
+
+    Replies are matched back by ID, and a retry only re-requests the IDs
+    that were missing or empty. context (see rolling_context) and glossary
+    ({term: translation}) are optional. With stream=True the reply is parsed
+    as it arrives and a stop closes the connection mid-reply. on_segment(index,
+    text) is called once per cue as soon as its translation is known.
+    Returns one translation per input text,
+    with None for any that never came back, or None instead of a list when
+    nothing came back or should_stop() turned true. Raises TranslationError
+    for failures retrying can't fix.
+    """
+    log = log or (lambda msg: None)
+    should_stop = should_stop or (lambda: False)
+    prompt_glossary, request_glossary = split_glossary(glossary, texts)
+    system_msg = system_prompt(target_lang, prompt_glossary)
+    translations = {}
+    pending = {i + 1: text for i, text in enumerate(texts)}
+
+    def receive(segment_id, text):
+        if segment_id in pending:
+            del pending[segment_id]
+            translations[segment_id] = text
+            if on_segment:
+                on_segment(segment_id - 1, text)
+
+    attempt = 0
+    while attempt < retries and pending:
+        if should_stop():
+            return None
+        # JSON mode where the endpoint accepts it; the prompt alone asks for JSON otherwise
+        json_mode = str(client.base_url) not in JSON_MODE_UNSUPPORTED
+        user_msg = batch_request(pending, context, request_glossary)
+        try:
+            request_bytes = len(system_msg.encode('utf-8')) + len(user_msg.encode('utf-8'))
+            with resource_slot("network", should_stop, log), \
+                    metrics.span("translate_batch", cues=len(pending), bytes=request_bytes) as span:
+                request = dict(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_msg},
+                        {"role": "user", "content": user_msg}
+                    ],
+                    temperature=0.3,
+                    **({"response_format": {"type": "json_object"}} if json_mode else {})
+                )
+                asked = len(pending)
+                if stream:
+                    content = stream_completion(client, request, should_stop, receive, span)
+                    if content is None:
+                        return None
+                else:
+                    # A non-streamed request can't be closed mid-wait; a stop abandons it instead
+                    response = call_cancellable(lambda: client.chat.completions.create(**request), should_stop)
+                    content = response.choices[0].message.content or ""
+                    if response.usage:
+                        span["prompt_tokens"] = response.usage.prompt_tokens
+                        span["completion_tokens"] = response.usage.completion_tokens
+                        cached = cached_prompt_tokens(response.usage)
+                        if cached is not None:
+                            span["cached_tokens"] = cached
+            # Entries the stream parser couldn't pick out (e.g. an {"id": "text"} mapping)
+            for segment_id, text in parse_translations(content, pending).items():
+                receive(segment_id, text)
+            attempt += 1
+            if pending:
+                log(f"Reply was missing {len(pending)} of {asked} segment(s) (Attempt {attempt}/{retries})")
+
+        except (SlotCancelled, Cancelled):
+            return None
+        except Exception as e:
+            err_str = str(e)
+            if json_mode and ("response_format" in err_str or "json_object" in err_str):
+                JSON_MODE_UNSUPPORTED.add(str(client.base_url))
+                log("Endpoint doesn't support JSON mode; asking for JSON in the prompt instead.")
+                continue
+            # Fatal errors stop the whole job (no retry)
+            if "insufficient_quota" in err_str:
+                raise TranslationError("Quota exceeded (429). Please check your API billing.")
+            if "401" in err_str:
+                raise TranslationError("Authentication failed (401). Check your API Key.")
+
+            attempt += 1
+            log(f"Batch failed (Attempt {attempt}/{retries}): {err_str}")
+            if attempt < retries:
+                interruptible_sleep(2, should_stop)
+
+    if not translations:
+        return None
+    return [translations.get(i + 1) for i in range(len(texts))]
@@ -1,21 +1,40 @@
 import json
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, 
     QStackedWidget, QLineEdit, QGroupBox, QPushButton, QFormLayout, 
     QScrollArea, QFrame, QMessageBox, QCheckBox, QInputDialog,
     QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QSettings, QSize
+from PyQt6.QtCore import Qt, QSettings, QSize, QThread, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont
+from translator import base_url_for
+from provider_health import HEALTH_SETTINGS_KEY, check_provider, load_health, save_health, fastest_provider
 import time
 
+class HealthCheckWorker(QThread):
+    """Checks several providers at once, off the GUI thread."""
+    result = pyqtSignal(str, dict) # service key, check result
+
+    def __init__(self, targets):
+        super().__init__()
+        self.targets = targets # [(service key, api key, base url, model)]
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=len(self.targets)) as pool:
+            futures = {pool.submit(check_provider, *target): target[0] for target in self.targets}
+            for future in as_completed(futures):
+                self.result.emit(futures[future], future.result())
+
 class APIKeysPage(QWidget):
     def __init__(self):
         super().__init__()
         self.settings = QSettings("MacWhisper", "Config")
         self.service_configs = self.load_configs()
+        self.health = load_health(self.settings)
+        self.testing = set() # Service keys with a check in flight
+        self.health_workers = []
         # Load custom services list: [{"name": "MyService", "key": "custom_myservice"}]
         self.custom_services = self.load_custom_services()
         self.init_ui()
@@ -239,17 +258,25 @@ class APIKeysPage(QWidget):
         layout = QVBoxLayout(page)
         layout.setContentsMargins(40, 40, 40, 40)
         
+        header_layout = QHBoxLayout()
         title = QLabel("已配置的服务")
         title.setStyleSheet("font-size: 20px; font-weight: bold; color: white; margin-bottom: 20px;")
-        layout.addWidget(title)
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+        test_all_btn = QPushButton("全部测试")
+        test_all_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        test_all_btn.setToolTip("同时测试所有已配置服务的延迟、速度和限额")
+        test_all_btn.clicked.connect(self.test_all_services)
+        header_layout.addWidget(test_all_btn)
+        layout.addLayout(header_layout)
         
         self.overview_table = QTableWidget()
-        self.overview_table.setColumnCount(3)
-        self.overview_table.setHorizontalHeaderLabels(["服务名称", "配置概要", "操作"])
-        self.overview_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.overview_table.setColumnCount(6)
+        self.overview_table.setHorizontalHeaderLabels(["服务名称", "配置概要", "延迟", "速度", "限额", "操作"])
+        self.overview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         self.overview_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.overview_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
-        self.overview_table.setColumnWidth(2, 100)
+        self.overview_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Fixed)
+        self.overview_table.setColumnWidth(5, 160)
         self.overview_table.verticalHeader().setVisible(False)
         self.overview_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         self.overview_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -265,6 +292,7 @@ class APIKeysPage(QWidget):
         # Helper to map key to name
         name_map = {k: n for n, k in self.all_services_display}
 
+        fastest = fastest_provider({k: v for k, v in self.health.items() if k in self.service_configs})
         for service_key, config in self.service_configs.items():
             # Check if basically configured (has at least one field set)
             if not config or not any(config.values()):
@@ -292,21 +320,64 @@ class APIKeysPage(QWidget):
                 summary = f"URL: {config['base_url']}"
             
             self.overview_table.setItem(row, 1, QTableWidgetItem(summary))
+
+            # Last health check
+            for col, item in enumerate(self.health_items(service_key, fastest), start=2):
+                self.overview_table.setItem(row, col, item)
             
-            # Action Button
+            # Action Buttons
+            actions = QWidget()
+            actions_layout = QHBoxLayout(actions)
+            actions_layout.setContentsMargins(0, 0, 0, 0)
+            test_btn = QPushButton("测试")
+            test_btn.setEnabled(self.health_target(service_key) is not None and service_key not in self.testing)
+            test_btn.clicked.connect(lambda ch, k=service_key: self.test_service(k, quiet=True))
+            actions_layout.addWidget(test_btn)
             del_btn = QPushButton("清除")
             del_btn.setStyleSheet("""
                 QPushButton { background-color: #c82333; color: white; border-radius: 4px; padding: 4px; border:none;}
                 QPushButton:hover { background-color: #bd2130; }
             """)
             del_btn.clicked.connect(lambda ch, k=service_key: self.clear_config(k))
-            self.overview_table.setCellWidget(row, 2, del_btn)
+            actions_layout.addWidget(del_btn)
+            self.overview_table.setCellWidget(row, 5, actions)
+
+    def health_items(self, service_key, fastest):
+        """Latency, speed and rate-limit cells for the overview table."""
+        if service_key in self.testing:
+            return [QTableWidgetItem("测试中..."), QTableWidgetItem(""), QTableWidgetItem("")]
+        result = self.health.get(service_key)
+        if not result:
+            return [QTableWidgetItem("—"), QTableWidgetItem("—"), QTableWidgetItem("—")]
+        checked = time.strftime("%m-%d %H:%M", time.localtime(result["checked_at"]))
+
+        if result["ok"]:
+            latency = QTableWidgetItem(f"{result['latency_s'] * 1000:.0f} ms" + (" ⚡" if service_key == fastest else ""))
+            latency.setToolTip(f"检测于 {checked}\n返回: {result.get('reply', '')}")
+        else:
+            latency = QTableWidgetItem("❌ 失败")
+            latency.setToolTip(f"检测于 {checked}\n{result.get('error', '')}")
+        speed = QTableWidgetItem(f"{result['tokens_per_s']:.0f} tok/s" if result.get("tokens_per_s") else "—")
+
+        limits = result.get("rate_limits", {})
+        parts = []
+        if "x-ratelimit-remaining-requests" in limits:
+            parts.append(f"请求 {limits['x-ratelimit-remaining-requests']}/{limits.get('x-ratelimit-limit-requests', '?')}")
+        if "x-ratelimit-remaining-tokens" in limits:
+            parts.append(f"Tokens {limits['x-ratelimit-remaining-tokens']}/{limits.get('x-ratelimit-limit-tokens', '?')}")
+        if "retry-after" in limits:
+            parts.append(f"{limits['retry-after']}s 后重试")
+        rate = QTableWidgetItem(", ".join(parts) or "—")
+        rate.setToolTip("\n".join(f"{k}: {v}" for k, v in limits.items()))
+        return [latency, speed, rate]
 
     def clear_config(self, key):
         if QMessageBox.question(self, "确认清除", "确定要清除此服务的配置信息吗？") == QMessageBox.StandardButton.Yes:
             if key in self.service_configs:
                 del self.service_configs[key]
                 self.save_configs()
+                if self.health.pop(key, None) is not None:
+                    self.settings.setValue(HEALTH_SETTINGS_KEY, json.dumps(self.health))
                 self.refresh_overview()
                 # Also define how to clear form fields if needed (omitted for simplicity, 
                 # fields will update next time they are loaded or if we trigger a signal)
@@ -446,56 +517,55 @@ class APIKeysPage(QWidget):
         self.save_configs()
         QMessageBox.information(self, "保存成功", "配置已保存！")
 
-    def test_service(self, key):
+    def health_target(self, key):
+        """(service key, api key, base url, model) for OpenAI-compatible services, else None."""
+        config = self.service_configs.get(key, {})
+        if not config.get("api_key", ""):
+            return None
+        return (key, config["api_key"], base_url_for(key, config), config.get("model", "") or "gpt-3.5-turbo")
+
+    def test_service(self, key, quiet=False):
         config = self.service_configs.get(key, {})
         if not config:
             QMessageBox.warning(self, "错误", "请先填写配置信息！")
             return
-
-        # Ensure we check the correct keys for generic OpenAI/DeepSeek types
-        api_key = config.get("api_key", "")
-        base_url = config.get("base_url", "")
-        model = config.get("model", "gpt-3.5-turbo")
-
-        if key == "deepseek":
-            if not base_url: base_url = "https://api.deepseek.com"
-        
-        if not api_key:
+        target = self.health_target(key)
+        if not target:
              QMessageBox.warning(self, "错误", "缺少 API Key！")
              return
+        if key in self.testing:
+            return
+        self.run_health_checks([target], announce=not quiet)
 
-        # Generic OpenAI-compatible test
-        try:
-            # Clean up base URL
-            url = base_url.rstrip('/')
-            if not url:
-                url = "https://api.openai.com/v1"  # Default fallback
-            elif not url.endswith("/v1"):
-                url += "/v1"
-            
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
-            data = {
-                "model": model,
-                "messages": [{"role": "user", "content": "Hello, translate this word to Chinese: Testing."}],
-                "max_tokens": 10
-            }
-            
-            QMessageBox.information(self, "测试中", f"正在连接服务器测试...\nURL: {url}/chat/completions")
-            
-            response = requests.post(f"{url}/chat/completions", headers=headers, json=data, timeout=10)
-            
-            if response.status_code == 200:
-                res_json = response.json()
-                content = res_json['choices'][0]['message']['content']
-                QMessageBox.information(self, "测试成功", f"连接成功！\n服务器返回: {content}")
-            else:
-                 QMessageBox.critical(self, "测试失败", f"HTTP错误: {response.status_code}\n{response.text}")
-
-        except Exception as e:
-            QMessageBox.critical(self, "测试出错", f"发生异常: {str(e)}")
+    def test_all_services(self):
+        targets = [t for t in map(self.health_target, self.service_configs) if t and t[0] not in self.testing]
+        if not targets:
+            QMessageBox.information(self, "提示", "没有可测试的服务（需要 API Key）。")
+            return
+        self.run_health_checks(targets)
+
+    def run_health_checks(self, targets, announce=False):
+        # Runs in the background, over the same pooled clients translations use
+        worker = HealthCheckWorker(targets)
+        worker.result.connect(lambda key, result: self.on_health_result(key, result, announce))
+        worker.finished.connect(lambda: self.health_workers.remove(worker))
+        self.health_workers.append(worker)
+        self.testing.update(t[0] for t in targets)
+        self.refresh_overview()
+        worker.start()
+
+    def on_health_result(self, key, result, announce):
+        self.testing.discard(key)
+        self.health[key] = result
+        save_health(self.settings, key, result)
+        self.refresh_overview()
+        if not announce:
+            return
+        if result["ok"]:
+            speed = f"{result['tokens_per_s']:.0f} tokens/s" if result["tokens_per_s"] else "未知"
+            QMessageBox.information(self, "测试成功", f"连接成功！\n延迟: {result['latency_s'] * 1000:.0f} ms，速度: {speed}\n服务器返回: {result['reply']}")
+        else:
+            QMessageBox.critical(self, "测试失败", result["error"])
 
     def get_fields_for_service(self, key):
         # Return list of (config_key, Label, IsPassword)
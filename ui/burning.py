@@ -2,76 +2,364 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QFileDialog, QProgressBar, 
     QMessageBox, QGroupBox, QSpinBox, QColorDialog, QLineEdit,
-    QFontComboBox, QComboBox, QGridLayout
+    QFontComboBox, QComboBox, QGridLayout, QSlider, QCheckBox
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
-from PyQt6.QtGui import QColor, QFont
-import signal
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings, QTimer, QUrl, QCoreApplication
+from PyQt6.QtGui import QColor, QFont, QPixmap, QDesktopServices
 import os
 import subprocess
 import shutil
 import tempfile
+import itertools
+from functools import lru_cache
+from subtitles import ensure_ass
+from instrumentation import get_recorder, NULL_METRICS
+from profiling import profiled
+from resources import resource_slot
+from cancellation import CancelToken, process_group, remove_quietly
+from ui.log_console import LogSink
+from scheduler import get_scheduler
 
-class BurningWorker(QThread):
-    progress = pyqtSignal(int)
-    log = pyqtSignal(str)
-    finished = pyqtSignal()
+PREVIEW_CLIP_SECONDS = 5
+MAX_PREVIEWS = 24 # Rendered previews kept on disk; the oldest are deleted beyond this
+
+# Container format for each supported output extension. The encode is written
+# to "<target>.partial", so ffmpeg can no longer guess the muxer from the name.
+OUTPUT_FORMATS = {
+    ".mp4": "mp4",
+    ".mov": "mov",
+    ".mkv": "matroska",
+    ".avi": "avi",
+}
+
+# Renditions offered on the burn page, and the VideoToolbox bitrate for each
+RENDITION_HEIGHTS = [1080, 720, 480]
+RENDITION_BITRATES = {2160: 16000, 1440: 9000, 1080: 6000, 720: 3500, 480: 1800, 360: 1000}
+
+# Burn page alignment choices -> legacy SSA alignment codes
+ALIGNMENTS = {
+    "Bottom Center": 2,
+    "Bottom Left": 1,
+    "Bottom Right": 3,
+    "Top Center": 6,
+    "Top Left": 5,
+    "Top Right": 7,
+    "Center": 10
+}
+
+def burn_config_from_settings(settings):
+    """(mode, config) from the values the burn page last saved.
+
+    Used by jobs that burn without the page (the pipeline); always renders
+    at source size only. font_color is kept as '#rrggbb' so the config can
+    be stored with a job.
+    """
+    alignments = list(ALIGNMENTS.values())
+    idx = int(settings.value("alignment_idx", 0))
+    mode = "mux" if int(settings.value("mode_idx", 0)) == 1 else "burn"
+    config = {
+        'font_family': settings.value("font_family", "Arial"),
+        'font_size': int(settings.value("font_size", 24)),
+        'font_color': settings.value("font_color", "#FFFFFF"),
+        'alignment': alignments[idx] if 0 <= idx < len(alignments) else 2,
+        'margin_v': int(settings.value("margin_v", 10)),
+        'outline': int(settings.value("outline", 1)),
+        'shadow': int(settings.value("shadow", 1)),
+        'secondary_subtitle_path': None,
+        'secondary_font_size': int(settings.value("secondary_font_size", 18)),
+        'renditions': [None],
+        'language': SUBTITLE_LANGUAGES.get(settings.value("language", "Undetermined"), 'und'),
+    }
+    return mode, config
+
+def mtime_of(path):
+    """Modification time for cache keys; 0 when there is no such file."""
+    try:
+        return os.path.getmtime(path) if path else 0
+    except OSError:
+        return 0
+
+def partial_path_for(output_path):
+    return output_path + ".partial"
+
+def rendition_outputs(output_path, renditions):
+    """[(height, path)] for a rendition ladder; height None keeps the source size.
+
+    A single rendition (of any size) writes to output_path itself. With
+    several, the source-size one does and each scaled copy gets a
+    "_720p"-style suffix next to it.
+    """
+    renditions = renditions or [None]
+    if len(renditions) == 1:
+        return [(renditions[0], output_path)]
+    base, ext = os.path.splitext(output_path)
+    outputs = []
+    for height in renditions:
+        path = output_path if height is None else f"{base}_{height}p{ext}"
+        outputs.append((height, path))
+    return outputs
+
+def plan_renditions(include_source, heights, source_height=None):
+    """(renditions, skipped) for the checked outputs; None in renditions is the source size.
+
+    Heights at or above the source's would be upscales or a second
+    source-size copy, so they are dropped and returned in skipped.
+    """
+    renditions = [None] if include_source else []
+    skipped = []
+    for height in dict.fromkeys(heights):
+        if source_height and height >= source_height:
+            skipped.append(height)
+        else:
+            renditions.append(height)
+    return renditions, skipped
+
+def select_encoder(height=None):
+    """(encoder, encoder_opts, description) for this machine."""
+    import platform
+    arch = platform.machine()
+    if arch == 'arm64':
+        bitrate = RENDITION_BITRATES.get(height, 6000)
+        return ("h264_videotoolbox", ["-b:v", f"{bitrate}k"],
+                "Detected Apple Silicon (arm64): Using Hardware Acceleration")
+    # CRF 23 is standard for high quality, preset fast for speed
+    return ("libx264", ["-crf", "23", "-preset", "fast"],
+            f"Detected Intel ({arch}): Using CPU Software Encoding (Compatibility Mode)")
+
+def check_free_space(video_path, output_path, factor=1.5):
+    """Raise OSError if the destination volume can't hold the burned video.
+
+    Re-encoding at our bitrates rarely grows a file by more than a half, so the
+    source size plus 50% is used as the default estimate.
+    """
+    target_dir = os.path.dirname(os.path.abspath(output_path))
+    required = int(os.path.getsize(video_path) * factor)
+    free = shutil.disk_usage(target_dir).free
+    if free < required:
+        raise OSError(
+            f"Not enough free space in {target_dir}: "
+            f"{free/1024/1024:.0f} MB available, ~{required/1024/1024:.0f} MB needed."
+        )
+
+def build_force_style(config):
+    font_color = config.get('font_color')
+    # Convert color to FFmpeg format: &HBBGGRR&
+    ffmpeg_color = f"&H{font_color.blue():02X}{font_color.green():02X}{font_color.red():02X}&"
+    
+    # Escape font name
+    font_family = config.get('font_family', 'Arial')
+    font_family_safe = font_family.replace(":", "\\:").replace("'", "")
+    
+    # Extract other params
+    font_size = config.get('font_size', 24)
+    alignment = config.get('alignment', 2)
+    margin_v = config.get('margin_v', 10)
+    outline = config.get('outline', 1)
+    shadow = config.get('shadow', 1)
+    
+    return (f"FontName={font_family_safe},FontSize={font_size},PrimaryColour={ffmpeg_color},"
+            f"Alignment={alignment},MarginV={margin_v},Outline={outline},Shadow={shadow}")
+
+def escape_filter_path(path):
+    return path.replace(":", "\\:").replace("'", "'\\''")
+
+def ass_styles_from_config(config):
+    """Plain-dict primary/secondary styles for the SRT -> ASS converter."""
+    font_color = config.get('font_color')
+    primary = {
+        'font_family': config.get('font_family', 'Arial'),
+        'font_size': config.get('font_size', 24),
+        'color': font_color.name() if font_color is not None else '#FFFFFF',
+        'alignment': config.get('alignment', 2),
+        'margin_v': config.get('margin_v', 10),
+        'outline': config.get('outline', 1),
+        'shadow': config.get('shadow', 1),
+    }
+    secondary_size = config.get('secondary_font_size', 18)
+    # Stack the second language just past the primary line, away from the edge
+    secondary = dict(primary, font_size=secondary_size,
+                     margin_v=primary['margin_v'] + int(primary['font_size'] * 1.4))
+    return primary, secondary
+
+def build_subtitle_filter(subtitle_path, config, video_path=None):
+    """The -vf chain shared by full burns and previews.
+
+    SRT input is converted once into a styled .ass file sized to the video and
+    burned with the `ass` filter; other formats fall back to force_style.
+    """
+    resolution = probe_resolution(video_path) if video_path else None
+    if resolution and subtitle_path.lower().endswith(".srt"):
+        primary, secondary = ass_styles_from_config(config)
+        ass_path = ensure_ass(
+            subtitle_path, primary, resolution,
+            secondary_path=config.get('secondary_subtitle_path'),
+            secondary_style=secondary
+        )
+        return f"ass='{escape_filter_path(ass_path)}'"
+    return f"subtitles='{escape_filter_path(subtitle_path)}':force_style='{build_force_style(config)}'"
+
+# Subtitle codec to use for a soft track in each container
+MUX_SUBTITLE_CODECS = {
+    "mp4": "mov_text",
+    "mov": "mov_text",
+}
+
+# ISO 639-2 tags offered for muxed tracks
+SUBTITLE_LANGUAGES = {
+    "Chinese": "chi",
+    "English": "eng",
+    "Japanese": "jpn",
+    "Korean": "kor",
+    "Spanish": "spa",
+    "French": "fre",
+    "German": "ger",
+    "Russian": "rus",
+    "Undetermined": "und",
+}
+
+def subtitle_codec_for(out_format, subtitle_ext):
+    if out_format in MUX_SUBTITLE_CODECS:
+        return MUX_SUBTITLE_CODECS[out_format]
+    if out_format == "matroska":
+        # Keep ASS styling when the source is ASS; everything else goes in as SRT
+        return "ass" if subtitle_ext in (".ass", ".ssa") else "srt"
+    raise ValueError(f"The {out_format} container can't hold subtitle tracks. Use .mp4, .mov or .mkv.")
+
+def probe_stream_count(video_path, stream_type):
+    """Number of streams of one type ('v', 'a', 's') in the file."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", stream_type,
+             "-show_entries", "stream=index", "-of", "csv=p=0", video_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        return len([l for l in result.stdout.splitlines() if l.strip()])
+    except OSError:
+        return 0
+
+def probe_resolution(video_path):
+    """(width, height) of the first video stream, or None."""
+    try:
+        return _probe_resolution(video_path, os.path.getmtime(video_path))
+    except OSError:
+        return None
+
+@lru_cache(maxsize=32)
+def _probe_resolution(video_path, mtime):
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=width,height", "-of", "csv=p=0:s=x", video_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        width, height = result.stdout.strip().splitlines()[0].split("x")[:2]
+        return int(width), int(height)
+    except (OSError, ValueError, IndexError):
+        return None
+
+def probe_duration(video_path):
+    """Container duration in seconds, or 0 if ffprobe can't tell."""
+    try:
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", video_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        return float(result.stdout.strip())
+    except (OSError, ValueError):
+        return 0
+
+class PreviewWorker(QThread):
+    """Renders a single frame (or a short clip) with the burn filter applied."""
+    finished = pyqtSignal(object, str) # cache key, rendered file
     error = pyqtSignal(str)
 
-    def __init__(self, video_path, subtitle_path, output_path, config):
+    def __init__(self, key, video_path, subtitle_path, config, timestamp, output_path, clip_seconds=0):
         super().__init__()
+        self.key = key
         self.video_path = video_path
         self.subtitle_path = subtitle_path
+        self.config = config
+        self.timestamp = timestamp
         self.output_path = output_path
-        self.config = config # Dict containing all style params
-        self.is_running = True
+        self.clip_seconds = clip_seconds
 
     def run(self):
         try:
-            self.log.emit("Starting subtitle burning...")
-            
-            font_color = self.config.get('font_color')
-            # Convert color to FFmpeg format: &HBBGGRR&
-            ffmpeg_color = f"&H{font_color.blue():02X}{font_color.green():02X}{font_color.red():02X}&"
-            
-            # Escape paths
-            srt_path_escaped = self.subtitle_path.replace(":", "\\:").replace("'", "'\\''")
-            
-            # Escape font name
-            font_family = self.config.get('font_family', 'Arial')
-            font_family_safe = font_family.replace(":", "\\:").replace("'", "")
-            
-            # Extract other params
-            font_size = self.config.get('font_size', 24)
-            alignment = self.config.get('alignment', 2)
-            margin_v = self.config.get('margin_v', 10)
-            outline = self.config.get('outline', 1)
-            shadow = self.config.get('shadow', 1)
-            
-            # Construct Filter string
-            style = (f"FontName={font_family_safe},FontSize={font_size},PrimaryColour={ffmpeg_color},"
-                     f"Alignment={alignment},MarginV={margin_v},Outline={outline},Shadow={shadow}")
-            
-            vf_string = f"subtitles='{srt_path_escaped}':force_style='{style}'"
-            
-            self.log.emit(f"Using Font: {font_family}")
-            self.log.emit(f"Font Size: {font_size}")
-            self.log.emit(f"Style Config: {style}")
-            
-            # Auto-detect encoder based on architecture
-            import platform
-            arch = platform.machine()
-            if arch == 'arm64':
-                encoder = "h264_videotoolbox"
-                encoder_opts = ["-b:v", "6000k"]
-                self.log.emit("Detected Apple Silicon (arm64): Using Hardware Acceleration")
+            # Input-side -ss seeks by keyframe (fast); -copyts keeps the original
+            # timestamps so the subtitles filter still picks the right cues.
+            cmd = [
+                "ffmpeg", "-y",
+                "-ss", f"{self.timestamp:.3f}",
+                "-copyts",
+                "-i", self.video_path,
+                "-vf", build_subtitle_filter(self.subtitle_path, self.config, self.video_path),
+            ]
+            if self.clip_seconds:
+                cmd += [
+                    "-t", str(self.clip_seconds),
+                    "-c:v", "libx264", "-preset", "ultrafast", "-crf", "28",
+                    "-pix_fmt", "yuv420p",
+                    "-c:a", "aac",
+                ]
             else:
-                encoder = "libx264"
-                # CRF 23 is standard for high quality, preset fast for speed
-                encoder_opts = ["-crf", "23", "-preset", "fast"] 
-                self.log.emit(f"Detected Intel ({arch}): Using CPU Software Encoding (Compatibility Mode)")
+                cmd += ["-frames:v", "1", "-an"]
+            cmd.append(self.output_path)
             
-            cmd = [
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            if result.returncode != 0 or not os.path.exists(self.output_path):
+                tail = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+                raise RuntimeError(f"FFmpeg preview failed: {tail[0]}")
+            self.finished.emit(self.key, self.output_path)
+        except Exception as e:
+            self.error.emit(str(e))
+
+class BurningWorker(QThread):
+    progress = pyqtSignal(int)
+    log = pyqtSignal(str)
+    finished = pyqtSignal(list) # Saved output paths
+    error = pyqtSignal(str)
+
+    def __init__(self, video_path, subtitle_path, output_path, config, mode='burn'):
+        super().__init__()
+        self.video_path = video_path
+        self.subtitle_path = subtitle_path
+        self.output_path = output_path
+        self.config = config # Dict containing all style params
+        self.mode = mode # 'burn' (re-encode) or 'mux' (soft subtitle track)
+        # Muxing never rescales, so only burns honour the rendition ladder
+        renditions = config.get('renditions') if mode == 'burn' else None
+        self.outputs = rendition_outputs(output_path, renditions)
+        self.partial_path = partial_path_for(self.outputs[0][1])
+        self.token = CancelToken() # stop() kills ffmpeg's whole process group
+        self.metrics = NULL_METRICS
+
+    def build_burn_command(self, out_format):
+        self.log.emit("Starting subtitle burning...")
+        
+        style = build_force_style(self.config)
+        with self.metrics.span("subtitle_render"):
+            vf_string = build_subtitle_filter(self.subtitle_path, self.config, self.video_path)
+        
+        font_family = self.config.get('font_family', 'Arial')
+        font_size = self.config.get('font_size', 24)
+        self.log.emit(f"Using Font: {font_family}")
+        self.log.emit(f"Font Size: {font_size}")
+        self.log.emit(f"Style Config: {style}")
+        if vf_string.startswith("ass="):
+            self.log.emit(f"Using pre-rendered ASS: {vf_string}")
+        
+        encoder, encoder_opts, description = select_encoder()
+        self.log.emit(description)
+        
+        if len(self.outputs) == 1 and self.outputs[0][0] is None:
+            return [
                 "ffmpeg",
                 "-y", # Overwrite output
                 "-i", self.video_path,
@@ -80,55 +368,145 @@ class BurningWorker(QThread):
             ] + encoder_opts + [
                 "-pix_fmt", "yuv420p", # Essential for compatibility
                 "-c:a", "aac", # Re-encode audio to AAC
-                self.output_path
+                "-f", out_format, # Muxer can't be inferred from ".partial"
+                self.partial_path
             ]
+        
+        # Rendition ladder: decode and render subtitles once, then split the
+        # burned frames into one scaler + encoder per output.
+        count = len(self.outputs)
+        graph = f"[0:v]{vf_string}"
+        if count > 1:
+            graph += f",split={count}" + "".join(f"[s{i}]" for i in range(count))
+        else:
+            graph += "[s0]"
+        for i, (height, path) in enumerate(self.outputs):
+            if height is None:
+                graph += f";[s{i}]null[v{i}]"
+            else:
+                graph += f";[s{i}]scale=-2:{height}[v{i}]"
+        
+        cmd = ["ffmpeg", "-y", "-i", self.video_path, "-filter_complex", graph]
+        for i, (height, path) in enumerate(self.outputs):
+            encoder, encoder_opts, _ = select_encoder(height)
+            self.log.emit(f"Rendition {height or 'source'}: {os.path.basename(path)}")
+            cmd += [
+                "-map", f"[v{i}]",
+                "-map", "0:a:0?",
+                "-c:v", encoder,
+            ] + encoder_opts + [
+                "-pix_fmt", "yuv420p",
+                "-c:a", "aac",
+                "-f", out_format,
+                partial_path_for(path)
+            ]
+        return cmd
+
+    def build_mux_command(self, out_format):
+        self.log.emit("Starting subtitle muxing (no re-encode)...")
+        
+        sub_ext = os.path.splitext(self.subtitle_path)[1].lower()
+        sub_codec = subtitle_codec_for(out_format, sub_ext)
+        language = self.config.get('language', 'und')
+        
+        # The new track lands after any subtitle streams the source already has
+        track_index = probe_stream_count(self.video_path, 's')
+        self.log.emit(f"Subtitle codec: {sub_codec}, language: {language}")
+        
+        return [
+            "ffmpeg",
+            "-y",
+            "-i", self.video_path,
+            "-i", self.subtitle_path,
+            # Not "-map 0": data streams (timecode tracks) and font attachments make mp4/mov muxing fail
+            "-map", "0:v",
+            "-map", "0:a?",
+            "-map", "0:s?",
+            "-map", "1:s:0",
+            "-c", "copy", # Existing streams are copied untouched
+            "-c:s", sub_codec,
+            f"-metadata:s:s:{track_index}", f"language={language}",
+            "-f", out_format,
+            self.partial_path
+        ]
+
+    @profiled
+    def run(self):
+        self.metrics = get_recorder().job(self.mode, os.path.basename(self.video_path))
+        try:
+            ext = os.path.splitext(self.output_path)[1].lower()
+            out_format = OUTPUT_FORMATS.get(ext, "mp4")
             
-            self.log.emit(f"Executing: {' '.join(cmd)}")
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
+            if self.mode == 'mux':
+                cmd = self.build_mux_command(out_format)
+            else:
+                cmd = self.build_burn_command(out_format)
             
-            # Monitor process
-            self.process = process
-            for line in process.stdout:
-                if not self.is_running:
-                    # Kill gracefully then forceful
-                    process.terminate()
-                    try:
-                        process.wait(timeout=1)
-                    except subprocess.TimeoutExpired:
-                        process.kill()
-                    self.log.emit("Process stopped by user.")
-                    return # Exit run()
+            self.log.emit(f"Executing: {' '.join(cmd)}")
+            # Stream-copy muxing is I/O bound and quick, so only burns take a CPU slot
+            if self.mode == 'burn':
+                with resource_slot("cpu", self.token, self.log.emit):
+                    self.run_encode(cmd)
+            else:
+                self.run_encode(cmd)
+
+        except Exception as e:
+            if not self.token.cancelled: # Only emit error if not manually stopped
+                self.error.emit(str(e))
+        finally:
+            # Finished outputs were already renamed; anything left is a partial encode
+            self.remove_partial()
+
+    def run_encode(self, cmd):
+        with self.metrics.span("encode" if self.mode == 'burn' else "mux",
+                               media_seconds=probe_duration(self.video_path)) as span:
+            self.run_ffmpeg(cmd, span)
 
+    def run_ffmpeg(self, cmd, span):
+        with process_group(cmd, self.token, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) as process:
+            # Stopping terminates the process group, which also ends this loop
+            for line in process.stdout:
                 if "frame=" in line or "time=" in line:
                     self.log.emit(line.strip())
-                
             ret_code = process.wait()
-            if ret_code == 0:
-                self.finished.emit()
-            elif ret_code != -15 and ret_code != -9: # != SIGTERM/SIGKILL (user stop)
-                self.error.emit(f"FFmpeg finished with error code {ret_code}")
 
-        except Exception as e:
-            if self.is_running: # Only emit error if not manually stopped
-                self.error.emit(str(e))
+        if self.token.cancelled:
+            self.log.emit("Process stopped by user.")
+            return
+        if ret_code == 0:
+            # Same directory as the target, so this is an atomic rename
+            for _, path in self.outputs:
+                os.replace(partial_path_for(path), path)
+            span["bytes"] = sum(os.path.getsize(path) for _, path in self.outputs)
+            self.finished.emit([path for _, path in self.outputs])
+        else:
+            span["exit_code"] = ret_code
+            self.error.emit(f"FFmpeg finished with error code {ret_code}")
+
+    def remove_partial(self):
+        remove_quietly(*(partial_path_for(path) for _, path in self.outputs))
 
     def stop(self):
-        self.is_running = False
-        # If waiting on IO, we might need to kill from here too if thread is blocked
-        if hasattr(self, 'process') and self.process.poll() is None:
-             self.process.terminate()
+        self.token.cancel()
 
 class SubtitleBurningPage(QWidget):
     def __init__(self):
         super().__init__()
         self.settings = QSettings("MacWhisper", "Burning") # Persistence
         self.font_color = QColor(255, 255, 255) # Default White
+        # Rendered previews keyed by (inputs, timestamp, style, mode)
+        self.preview_cache = {}
+        self.preview_dir = tempfile.mkdtemp(prefix="macwhisper_preview_")
+        self.preview_ids = itertools.count()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.remove_previews)
+        self.preview_worker = None
+        self.pending_preview = None
+        self.job_id = None
+        self.scheduler = get_scheduler()
+        self.scheduler.job_started.connect(self.on_job_started)
+        self.scheduler.job_changed.connect(self.on_job_changed)
         self.init_ui()
 
     def init_ui(self):
@@ -164,11 +542,56 @@ class SubtitleBurningPage(QWidget):
         sub_layout.addWidget(self.sub_label)
         input_layout.addLayout(sub_layout)
         
+        # Optional second-language subtitle (bilingual burn, SRT only)
+        sub2_layout = QHBoxLayout()
+        self.sub2_label = QLabel("No second subtitle (optional)")
+        self.sub2_label.setStyleSheet("color: #888;")
+        sub2_btn = QPushButton("Select 2nd Subtitle")
+        sub2_btn.clicked.connect(self.select_secondary_subtitle)
+        sub2_clear_btn = QPushButton("Clear")
+        sub2_clear_btn.clicked.connect(self.clear_secondary_subtitle)
+        sub2_layout.addWidget(sub2_btn)
+        sub2_layout.addWidget(self.sub2_label)
+        sub2_layout.addWidget(sub2_clear_btn)
+        input_layout.addLayout(sub2_layout)
+        self.secondary_subtitle_path = None
+        
+        # Output Mode
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Mode:"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Burn In (re-encode)", userData="burn")
+        self.mode_combo.addItem("Mux Soft Subtitles (no re-encode)", userData="mux")
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        mode_layout.addWidget(self.mode_combo)
+        
+        mode_layout.addWidget(QLabel("Track Language:"))
+        self.language_combo = QComboBox()
+        self.language_combo.addItems(list(SUBTITLE_LANGUAGES.keys()))
+        mode_layout.addWidget(self.language_combo)
+        mode_layout.addStretch()
+        input_layout.addLayout(mode_layout)
+        
+        # Rendition ladder (burn mode): one decode feeds every checked size
+        rendition_layout = QHBoxLayout()
+        rendition_layout.addWidget(QLabel("Outputs:"))
+        self.source_rendition_check = QCheckBox("Source Size")
+        self.source_rendition_check.setChecked(True)
+        rendition_layout.addWidget(self.source_rendition_check)
+        self.rendition_checks = {}
+        for height in RENDITION_HEIGHTS:
+            check = QCheckBox(f"{height}p")
+            rendition_layout.addWidget(check)
+            self.rendition_checks[height] = check
+        rendition_layout.addStretch()
+        input_layout.addLayout(rendition_layout)
+        
         input_group.setLayout(input_layout)
         layout.addWidget(input_group)
 
         # --- Styling ---
         style_group = QGroupBox("Subtitle Style")
+        self.style_group = style_group
         # Use Grid Layout for more controls
         from PyQt6.QtWidgets import QGridLayout
         style_layout = QGridLayout()
@@ -199,15 +622,7 @@ class SubtitleBurningPage(QWidget):
 
         style_layout.addWidget(QLabel("Align:"), 1, 2)
         self.align_combo = QComboBox()
-        self.align_map = {
-            "Bottom Center": 2,
-            "Bottom Left": 1,
-            "Bottom Right": 3,
-            "Top Center": 6,
-            "Top Left": 5,
-            "Top Right": 7,
-            "Center": 10
-        }
+        self.align_map = ALIGNMENTS
         self.align_combo.addItems(list(self.align_map.keys()))
         style_layout.addWidget(self.align_combo, 1, 3)
 
@@ -225,6 +640,12 @@ class SubtitleBurningPage(QWidget):
         self.outline_spin.setValue(1)
         style_layout.addWidget(self.outline_spin, 2, 3)
         
+        style_layout.addWidget(QLabel("2nd Size:"), 3, 0)
+        self.secondary_font_spin = QSpinBox()
+        self.secondary_font_spin.setRange(10, 400)
+        self.secondary_font_spin.setValue(18)
+        style_layout.addWidget(self.secondary_font_spin, 3, 1)
+        
         style_layout.addWidget(QLabel("Shadow:"), 3, 2)
         self.shadow_spin = QSpinBox()
         self.shadow_spin.setRange(0, 20)
@@ -234,6 +655,47 @@ class SubtitleBurningPage(QWidget):
         style_group.setLayout(style_layout)
         layout.addWidget(style_group)
 
+        # --- Preview ---
+        preview_group = QGroupBox("Preview")
+        self.preview_group = preview_group
+        preview_layout = QVBoxLayout()
+        
+        self.preview_label = QLabel("Select a video and subtitle to preview")
+        self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.preview_label.setMinimumHeight(220)
+        self.preview_label.setStyleSheet("background-color: #000; color: #888;")
+        preview_layout.addWidget(self.preview_label)
+        
+        scrub_layout = QHBoxLayout()
+        self.preview_slider = QSlider(Qt.Orientation.Horizontal)
+        self.preview_slider.setRange(0, 0)
+        self.preview_slider.setEnabled(False)
+        self.preview_slider.valueChanged.connect(self.on_preview_scrub)
+        scrub_layout.addWidget(self.preview_slider)
+        
+        self.preview_time_label = QLabel("00:00:00")
+        scrub_layout.addWidget(self.preview_time_label)
+        
+        self.preview_frame_btn = QPushButton("Preview Frame")
+        self.preview_frame_btn.clicked.connect(lambda: self.request_preview(clip=False))
+        self.preview_frame_btn.setEnabled(False)
+        scrub_layout.addWidget(self.preview_frame_btn)
+        
+        self.preview_clip_btn = QPushButton(f"Preview {PREVIEW_CLIP_SECONDS}s Clip")
+        self.preview_clip_btn.clicked.connect(lambda: self.request_preview(clip=True))
+        self.preview_clip_btn.setEnabled(False)
+        scrub_layout.addWidget(self.preview_clip_btn)
+        preview_layout.addLayout(scrub_layout)
+        
+        preview_group.setLayout(preview_layout)
+        layout.addWidget(preview_group)
+        
+        # Scrubbing re-renders once the slider settles
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(300)
+        self.preview_timer.timeout.connect(lambda: self.request_preview(clip=False))
+
         # --- Actions ---
         action_layout = QHBoxLayout()
         
@@ -248,12 +710,6 @@ class SubtitleBurningPage(QWidget):
         self.cancel_btn.setEnabled(False)
         action_layout.addWidget(self.cancel_btn)
         
-        self.save_btn = QPushButton("Save Video")
-        self.save_btn.setObjectName("downloadBtn")
-        self.save_btn.clicked.connect(self.save_video)
-        self.save_btn.setEnabled(False)
-        action_layout.addWidget(self.save_btn)
-        
         layout.addLayout(action_layout)
         
         # Progress & Status
@@ -266,15 +722,24 @@ class SubtitleBurningPage(QWidget):
         self.log_output.setReadOnly(True)
         self.log_output.setPlaceholderText("Ready...")
         layout.addWidget(self.log_output)
+        # ffmpeg prints a stats line several times a second; show only the latest one
+        self.log_sink = LogSink("burn", self)
+        self.log_sink.flushed.connect(lambda lines: self.log_output.setText(lines[-1]))
         
         # Load saved settings
         self.load_settings()
+        self.on_mode_changed()
 
     def select_video(self):
         f, _ = QFileDialog.getOpenFileName(self, "Select Video", "", "Video Files (*.mp4 *.mov *.mkv *.avi)")
         if f:
             self.video_path = f
             self.video_label.setText(os.path.basename(f))
+            duration = probe_duration(f)
+            self.preview_slider.blockSignals(True)
+            self.preview_slider.setRange(0, max(0, int(duration)))
+            self.preview_slider.setValue(0)
+            self.preview_slider.blockSignals(False)
             self.check_ready()
 
     def select_subtitle(self):
@@ -284,9 +749,116 @@ class SubtitleBurningPage(QWidget):
             self.sub_label.setText(os.path.basename(f))
             self.check_ready()
 
+    def select_secondary_subtitle(self):
+        f, _ = QFileDialog.getOpenFileName(self, "Select Second Subtitle", "", "Subtitle Files (*.srt)")
+        if f:
+            self.secondary_subtitle_path = f
+            self.sub2_label.setText(os.path.basename(f))
+
+    def clear_secondary_subtitle(self):
+        self.secondary_subtitle_path = None
+        self.sub2_label.setText("No second subtitle (optional)")
+
+    def selected_renditions(self):
+        """(renditions, skipped heights) for the checked outputs, see plan_renditions."""
+        resolution = probe_resolution(self.video_path) if hasattr(self, 'video_path') else None
+        heights = [height for height, check in self.rendition_checks.items() if check.isChecked()]
+        return plan_renditions(self.source_rendition_check.isChecked(), heights,
+                               resolution[1] if resolution else None)
+
+    def current_mode(self):
+        return self.mode_combo.currentData() or "burn"
+
+    def on_mode_changed(self, *args):
+        muxing = self.current_mode() == "mux"
+        # Styling only applies when subtitles are rendered into the picture
+        self.style_group.setEnabled(not muxing)
+        self.preview_group.setEnabled(not muxing)
+        self.language_combo.setEnabled(muxing)
+        self.source_rendition_check.setEnabled(not muxing)
+        for check in self.rendition_checks.values():
+            check.setEnabled(not muxing)
+        self.burn_btn.setText("Start Muxing" if muxing else "Start Burning")
+
     def check_ready(self):
         if hasattr(self, 'video_path') and hasattr(self, 'subtitle_path'):
             self.burn_btn.setEnabled(True)
+            self.preview_slider.setEnabled(True)
+            self.preview_frame_btn.setEnabled(True)
+            self.preview_clip_btn.setEnabled(True)
+
+    def on_preview_scrub(self, value):
+        h, rem = divmod(value, 3600)
+        self.preview_time_label.setText(f"{h:02}:{rem // 60:02}:{rem % 60:02}")
+        self.preview_timer.start()
+
+    def request_preview(self, clip=False):
+        if not (hasattr(self, 'video_path') and hasattr(self, 'subtitle_path')):
+            return
+        
+        config = self.gather_config()
+        timestamp = self.preview_slider.value()
+        clip_seconds = PREVIEW_CLIP_SECONDS if clip else 0
+        secondary = config['secondary_subtitle_path']
+        key = (self.video_path, self.subtitle_path, mtime_of(self.subtitle_path), timestamp,
+               build_force_style(config), secondary, mtime_of(secondary),
+               config['secondary_font_size'], clip_seconds)
+        
+        cached = self.preview_cache.get(key)
+        if cached and os.path.exists(cached):
+            self.show_preview(key, cached)
+            return
+        
+        if self.preview_worker and self.preview_worker.isRunning():
+            # Only the latest request matters while scrubbing
+            self.pending_preview = clip
+            return
+        
+        ext = ".mp4" if clip else ".jpg"
+        output_path = os.path.join(self.preview_dir, f"preview_{next(self.preview_ids)}{ext}")
+        self.preview_label.setText("Rendering preview...")
+        self.preview_worker = PreviewWorker(
+            key, self.video_path, self.subtitle_path, config,
+            timestamp, output_path, clip_seconds
+        )
+        self.preview_worker.finished.connect(self.on_preview_ready)
+        self.preview_worker.error.connect(self.on_preview_error)
+        self.preview_worker.start()
+
+    def on_preview_ready(self, key, path):
+        self.preview_cache[key] = path
+        while len(self.preview_cache) > MAX_PREVIEWS:
+            oldest = next(iter(self.preview_cache))
+            remove_quietly(self.preview_cache.pop(oldest))
+        self.show_preview(key, path)
+        self.run_pending_preview()
+
+    def on_preview_error(self, msg):
+        self.preview_label.setText(msg)
+        self.run_pending_preview()
+
+    def remove_previews(self):
+        shutil.rmtree(self.preview_dir, ignore_errors=True)
+        self.preview_cache.clear()
+
+    def run_pending_preview(self):
+        if self.pending_preview is not None:
+            clip = self.pending_preview
+            self.pending_preview = None
+            self.request_preview(clip=clip)
+
+    def show_preview(self, key, path):
+        clip_seconds = key[-1]
+        if clip_seconds:
+            self.preview_label.setText(f"Clip rendered: {os.path.basename(path)}")
+            QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+            return
+        pixmap = QPixmap(path)
+        self.preview_label.setPixmap(pixmap.scaled(
+            self.preview_label.width(), self.preview_label.height(),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        ))
 
     def pick_color(self):
         color = QColorDialog.getColor(self.font_color, self, "Choose Subtitle Color")
@@ -294,41 +866,98 @@ class SubtitleBurningPage(QWidget):
             self.font_color = color
             self.color_sample.setStyleSheet(f"background-color: {color.name()}; border: 1px solid #555;")
 
+    def choose_output_path(self):
+        if self.current_mode() == "burn":
+            renditions, skipped = self.selected_renditions()
+            if not renditions:
+                QMessageBox.warning(self, "No Output Size", "Select at least one output size smaller than the source"
+                                    + (f" (skipping {', '.join(f'{h}p' for h in skipped)})." if skipped else "."))
+                return None
+
+        base, ext = os.path.splitext(self.video_path)
+        if ext.lower() not in OUTPUT_FORMATS:
+            ext = ".mp4"
+        default_name = os.path.join(os.path.dirname(self.video_path), os.path.basename(base) + "_subbed" + ext)
+        target_path, _ = QFileDialog.getSaveFileName(self, "Save Video As", default_name, "Video Files (*.mp4 *.mov *.mkv *.avi)")
+        if not target_path:
+            return None
+        
+        if os.path.abspath(target_path) == os.path.abspath(self.video_path):
+            QMessageBox.warning(self, "Invalid Destination", "The output file can't overwrite the source video.")
+            return None
+        
+        try:
+            if self.current_mode() == "mux":
+                # Stream copy: output is the source plus a small text track
+                subtitle_codec_for(OUTPUT_FORMATS.get(os.path.splitext(target_path)[1].lower(), "mp4"),
+                                   os.path.splitext(self.subtitle_path)[1].lower())
+                check_free_space(self.video_path, target_path, factor=1.05)
+            else:
+                check_free_space(self.video_path, target_path, factor=1.5 * len(renditions))
+        except ValueError as e:
+            QMessageBox.warning(self, "Unsupported Container", str(e))
+            return None
+        except OSError as e:
+            QMessageBox.critical(self, "Not Enough Space", str(e))
+            return None
+        return target_path
+
     def start_burning(self):
         # Save current settings
         self.save_settings()
         
-        # Use temp dir for intermediate file
-        _, ext = os.path.splitext(self.video_path)
-        self.temp_output = os.path.join(tempfile.gettempdir(), f"macwhisper_burn_{os.getpid()}{ext}")
+        # Pick the destination up front; ffmpeg writes straight into it
+        self.output_path = self.choose_output_path()
+        if not self.output_path:
+            return
         
         self.progress_bar.setVisible(True)
         self.burn_btn.setEnabled(False)
         self.cancel_btn.setEnabled(True)
-        self.save_btn.setEnabled(False)
-        self.log_output.setText("Burning in progress...")
+        mode = self.current_mode()
+        status = "Muxing in progress..." if mode == "mux" else "Burning in progress..."
+        skipped = self.selected_renditions()[1] if mode == "burn" else []
+        if skipped:
+            note = f"Skipped {', '.join(f'{h}p' for h in skipped)}: not smaller than the source."
+            self.log_sink.write(note)
+            status += f" ({note})"
+        self.log_output.setText(status)
         
-        # Gather Config
-        config = {
+        config = self.gather_config()
+        config['font_color'] = config['font_color'].name() # Stored as JSON with the job
+        options = {"output_path": self.output_path, "mode": mode, "config": config}
+        self.job_id = self.scheduler.submit("burn", os.path.basename(self.video_path),
+                                            {"video": self.video_path, "subtitle": self.subtitle_path}, options)
+
+    def on_job_started(self, job_id, worker):
+        if job_id != self.job_id:
+            return
+        current = lambda handler: lambda *args: job_id == self.job_id and handler(*args)
+        worker.log.connect(current(self.log_sink.write))
+        worker.finished.connect(current(self.on_finished))
+        worker.error.connect(current(self.on_error))
+
+    def on_job_changed(self, job_id):
+        # Cancelled from the Jobs page: the worker reports nothing when stopped
+        if job_id == self.job_id and job_id not in self.scheduler.running:
+            job = self.scheduler.store.get(job_id)
+            if job and job["status"] == "cancelled":
+                self.stop_burning()
+
+    def gather_config(self):
+        return {
             'font_family': self.font_combo.currentFont().family(),
             'font_size': self.font_spin.value(),
             'font_color': self.font_color,
             'alignment': self.align_map.get(self.align_combo.currentText(), 2),
             'margin_v': self.margin_spin.value(),
             'outline': self.outline_spin.value(),
-            'shadow': self.shadow_spin.value()
+            'shadow': self.shadow_spin.value(),
+            'secondary_subtitle_path': self.secondary_subtitle_path,
+            'secondary_font_size': self.secondary_font_spin.value(),
+            'renditions': self.selected_renditions()[0],
+            'language': SUBTITLE_LANGUAGES.get(self.language_combo.currentText(), 'und')
         }
-        
-        self.worker = BurningWorker(
-            self.video_path, 
-            self.subtitle_path, 
-            self.temp_output, 
-            config
-        )
-        self.worker.log.connect(self.log_output.setText)
-        self.worker.finished.connect(self.on_finished)
-        self.worker.error.connect(self.on_error)
-        self.worker.start()
 
     def save_settings(self):
         self.settings.setValue("font_family", self.font_combo.currentFont().family())
@@ -338,6 +967,11 @@ class SubtitleBurningPage(QWidget):
         self.settings.setValue("margin_v", self.margin_spin.value())
         self.settings.setValue("outline", self.outline_spin.value())
         self.settings.setValue("shadow", self.shadow_spin.value())
+        self.settings.setValue("secondary_font_size", self.secondary_font_spin.value())
+        self.settings.setValue("rendition_source", self.source_rendition_check.isChecked())
+        self.settings.setValue("renditions", [h for h, c in self.rendition_checks.items() if c.isChecked()])
+        self.settings.setValue("mode_idx", self.mode_combo.currentIndex())
+        self.settings.setValue("language", self.language_combo.currentText())
 
     def load_settings(self):
         # Font Family
@@ -369,40 +1003,38 @@ class SubtitleBurningPage(QWidget):
         self.margin_spin.setValue(int(self.settings.value("margin_v", 10)))
         self.outline_spin.setValue(int(self.settings.value("outline", 1)))
         self.shadow_spin.setValue(int(self.settings.value("shadow", 1)))
+        self.secondary_font_spin.setValue(int(self.settings.value("secondary_font_size", 18)))
+        
+        # Rendition Ladder
+        self.source_rendition_check.setChecked(self.settings.value("rendition_source", True, type=bool))
+        saved_renditions = [int(h) for h in self.settings.value("renditions", [], type=list)]
+        for height, check in self.rendition_checks.items():
+            check.setChecked(height in saved_renditions)
+        
+        # Output Mode
+        self.mode_combo.setCurrentIndex(int(self.settings.value("mode_idx", 0)))
+        self.language_combo.setCurrentText(self.settings.value("language", "Undetermined"))
 
     def stop_burning(self):
-        if hasattr(self, 'worker') and self.worker.isRunning():
-            self.worker.stop()
-            self.worker.quit()
+        if self.job_id is not None:
+            self.scheduler.cancel(self.job_id)
+            self.job_id = None
+            self.log_sink.discard()
             self.log_output.setText("Stopping...")
             self.cancel_btn.setEnabled(False)
             self.burn_btn.setEnabled(True)
             self.progress_bar.setVisible(False)
 
-    def on_finished(self):
+    def on_finished(self, saved):
         self.progress_bar.setVisible(False)
         self.burn_btn.setEnabled(True)
         self.cancel_btn.setEnabled(False)
-        self.save_btn.setEnabled(True)
-        self.log_output.setText("Processing Complete!")
-        QMessageBox.information(self, "Success", "Burning complete. Click 'Save Video' to save the file.")
+        self.log_sink.discard()
+        self.log_output.setText(f"Saved to: {', '.join(saved)}")
+        QMessageBox.information(self, "Success", "Done. Video saved to:\n" + "\n".join(saved))
 
     def on_error(self, msg):
         self.progress_bar.setVisible(False)
         self.burn_btn.setEnabled(True)
         self.cancel_btn.setEnabled(False)
         QMessageBox.critical(self, "Error", f"Burning failed:\n{msg}")
-
-    def save_video(self):
-        if not hasattr(self, 'temp_output') or not os.path.exists(self.temp_output):
-             return
-        
-        default_name = os.path.splitext(os.path.basename(self.video_path))[0] + "_subbed" + os.path.splitext(self.video_path)[1]
-        target_path, _ = QFileDialog.getSaveFileName(self, "Save Video", default_name, "Video Files (*.mp4 *.mov *.mkv *.avi)")
-        
-        if target_path:
-            try:
-                shutil.copy2(self.temp_output, target_path)
-                QMessageBox.information(self, "Saved", f"Video saved to:\n{target_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Could not save file: {e}")
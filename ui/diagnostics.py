@@ -0,0 +1,111 @@
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QGroupBox, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QFileDialog, QMessageBox
+)
+from PyQt6.QtCore import Qt
+from instrumentation import MAX_SPANS, get_recorder
+
+COLUMNS = ["Time", "Job", "Stage", "Wall (s)", "CPU (s)", "Process Peak RSS (MB)", "Bytes", "Media (s)", "RTF", "Status"]
+
+def format_bytes(size):
+    if size is None:
+        return ""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def format_number(value, digits=2):
+    return "" if value is None else f"{value:.{digits}f}"
+
+class DiagnosticsPage(QWidget):
+    """Per-stage timings recorded by instrumentation.Recorder, newest first."""
+
+    def __init__(self):
+        super().__init__()
+        self.recorder = get_recorder()
+        self.init_ui()
+        for record in self.recorder.all():
+            self.add_span(record)
+        self.recorder.span_recorded.connect(self.add_span)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        title = QLabel("Diagnostics")
+        title.setObjectName("header")
+        layout.addWidget(title)
+
+        group = QGroupBox("Stage Timings")
+        group_layout = QVBoxLayout()
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        group_layout.addWidget(self.table)
+
+        hint = QLabel("RTF = wall time / media duration (below 1.0 is faster than realtime). "
+                      "CPU is the stage's own thread (not torch worker threads or ffmpeg); "
+                      "peak RSS is the whole process's high-water mark so far.")
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: #888;")
+        group_layout.addWidget(hint)
+
+        group.setLayout(group_layout)
+        layout.addWidget(group)
+
+        btn_layout = QHBoxLayout()
+        export_btn = QPushButton("Export JSONL")
+        export_btn.clicked.connect(self.export_spans)
+        btn_layout.addWidget(export_btn)
+
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear_spans)
+        btn_layout.addWidget(clear_btn)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+    def add_span(self, record):
+        self.table.insertRow(0)
+        values = [
+            time.strftime("%H:%M:%S", time.localtime(record["started_at"])),
+            f"{record['job_type']}: {record['label']}",
+            record["stage"],
+            format_number(record["wall_s"]),
+            format_number(record["cpu_s"]),
+            format_number(record["process_peak_rss_mb"], 0),
+            format_bytes(record.get("bytes")),
+            format_number(record.get("media_seconds"), 1),
+            format_number(record.get("realtime_factor"), 3),
+            record["status"],
+        ]
+        for col, value in enumerate(values):
+            item = QTableWidgetItem(str(value))
+            if 3 <= col <= 8:
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.table.setItem(0, col, item)
+        if self.table.rowCount() > MAX_SPANS:
+            self.table.removeRow(self.table.rowCount() - 1)
+
+    def export_spans(self):
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Timings", "timings.jsonl", "JSON Lines (*.jsonl)")
+        if not file_name:
+            return
+        try:
+            self.recorder.export_jsonl(file_name)
+            QMessageBox.information(self, "Exported", f"Saved {len(self.recorder.all())} spans.")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not export timings: {e}")
+
+    def clear_spans(self):
+        self.recorder.clear()
+        self.table.setRowCount(0)
@@ -1,20 +1,63 @@
 import os
 import shutil
 import subprocess  # 替代 ffmpeg 模块
-from whisper import _MODELS as WHISPER_MODELS
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
-    QPushButton, QFileDialog, QTextEdit, QProgressBar, 
-    QMessageBox, QGroupBox
+    QPushButton, QFileDialog, QProgressBar, 
+    QMessageBox, QGroupBox, QCheckBox, QSpinBox, QDoubleSpinBox
 )
-from PyQt6.QtCore import Qt
-from worker import Worker
+from PyQt6.QtCore import Qt, QSettings
+from ui.log_console import LogConsole
+from scheduler import get_scheduler
+from model_inventory import get_inventory
+from model_loader import get_model_cache
+from transcription_backends import available_backends
+from subtitles import write_srt
+
+def fill_model_combo(combo, inventory):
+    """List standard models (✓ when cached) plus imported .pt files."""
+    current = combo.currentData()
+    combo.blockSignals(True)
+    combo.clear()
+    for entry in inventory.entries():
+        if entry["standard"]:
+            label = f"{entry['name']} ✓" if entry["present"] else entry["name"]
+            # whisper.load_model accepts either a model name or a checkpoint path
+            combo.addItem(label, userData=entry["name"])
+        elif entry["quantized"]:
+            combo.addItem(f"{entry['name']} (CPU)", userData=entry["path"])
+        else:
+            combo.addItem(f"{entry['name']} (custom)", userData=entry["path"])
+    idx = combo.findData(current)
+    if idx >= 0:
+        combo.setCurrentIndex(idx)
+    combo.blockSignals(False)
+
+def segmentation_from_settings(settings):
+    """resegment() limits saved by the extraction page, or None when smart segmentation is off."""
+    if not settings.value("smart_segmentation", False, type=bool):
+        return None
+    return {
+        "max_chars": int(settings.value("seg_max_chars", 42)),
+        "max_lines": int(settings.value("seg_max_lines", 2)),
+        "max_duration": float(settings.value("seg_max_duration", 6.0)),
+        "min_gap": float(settings.value("seg_min_gap", 0.08)),
+    }
 
 class ExtractionPage(QWidget):
     def __init__(self):
         super().__init__()
         self.result_data = None
+        self.job_id = None
+        self.scheduler = get_scheduler()
+        self.scheduler.job_started.connect(self.on_job_started)
+        self.scheduler.job_changed.connect(self.on_job_changed)
+        self.settings = QSettings("MacWhisper", "Config")
+        self.inventory = get_inventory()
+        self.model_cache = get_model_cache()
         self.init_ui()
+        self.inventory.changed.connect(self.refresh_model_combo)
+        self.model_cache.state_changed.connect(self.update_model_state)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -44,33 +87,87 @@ class ExtractionPage(QWidget):
         
         row1.addWidget(QLabel("Use Model:"))
         self.extract_model_combo = QComboBox()
-        self.extract_model_combo.addItems(list(WHISPER_MODELS.keys()))
-        # Set default to 'base' if possible
-        idx = self.extract_model_combo.findText("base")
+        self.refresh_model_combo()
+        # Set default to the configured model ('base' if unset)
+        idx = self.extract_model_combo.findData(self.settings.value("default_model", "base"))
         if idx >= 0: self.extract_model_combo.setCurrentIndex(idx)
+        self.extract_model_combo.currentIndexChanged.connect(lambda _: self.update_model_state())
             
         row1.addWidget(self.extract_model_combo)
         
+        row1.addWidget(QLabel("Engine:"))
+        self.backend_combo = QComboBox()
+        for backend in available_backends():
+            self.backend_combo.addItem(backend.label, userData=backend.name)
+        idx = self.backend_combo.findData(self.settings.value("transcription_backend", "whisper"))
+        if idx >= 0: self.backend_combo.setCurrentIndex(idx)
+        row1.addWidget(self.backend_combo)
+        
+        self.model_state_label = QLabel("")
+        self.model_state_label.setStyleSheet("color: #888;")
+        row1.addWidget(self.model_state_label)
+        
         extract_layout.addLayout(row1)
         
+        # Row 2: Word-timestamp based cue segmentation
+        seg_row = QHBoxLayout()
+        self.segment_check = QCheckBox("Smart line segmentation (word timestamps)")
+        self.segment_check.setChecked(self.settings.value("smart_segmentation", False, type=bool))
+        seg_row.addWidget(self.segment_check)
+        seg_row.addStretch()
+        
+        seg_row.addWidget(QLabel("Chars/Line:"))
+        self.max_chars_spin = QSpinBox()
+        self.max_chars_spin.setRange(10, 120)
+        self.max_chars_spin.setValue(int(self.settings.value("seg_max_chars", 42)))
+        seg_row.addWidget(self.max_chars_spin)
+        
+        seg_row.addWidget(QLabel("Lines:"))
+        self.max_lines_spin = QSpinBox()
+        self.max_lines_spin.setRange(1, 4)
+        self.max_lines_spin.setValue(int(self.settings.value("seg_max_lines", 2)))
+        seg_row.addWidget(self.max_lines_spin)
+        
+        seg_row.addWidget(QLabel("Max Duration:"))
+        self.max_duration_spin = QDoubleSpinBox()
+        self.max_duration_spin.setRange(1.0, 20.0)
+        self.max_duration_spin.setSingleStep(0.5)
+        self.max_duration_spin.setSuffix(" s")
+        self.max_duration_spin.setValue(float(self.settings.value("seg_max_duration", 6.0)))
+        seg_row.addWidget(self.max_duration_spin)
+        
+        seg_row.addWidget(QLabel("Min Gap:"))
+        self.min_gap_spin = QDoubleSpinBox()
+        self.min_gap_spin.setRange(0.0, 1.0)
+        self.min_gap_spin.setSingleStep(0.02)
+        self.min_gap_spin.setSuffix(" s")
+        self.min_gap_spin.setValue(float(self.settings.value("seg_min_gap", 0.08)))
+        seg_row.addWidget(self.min_gap_spin)
+        extract_layout.addLayout(seg_row)
+        
         # Row 2: Action
         self.extract_btn = QPushButton("Start Extraction")
         self.extract_btn.setObjectName("primaryButton")
         self.extract_btn.clicked.connect(self.start_extraction)
         self.extract_btn.setEnabled(False)
-        extract_layout.addWidget(self.extract_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.clicked.connect(self.stop_extraction)
+        self.stop_btn.setEnabled(False)
+        action_row = QHBoxLayout()
+        action_row.addWidget(self.extract_btn, 1)
+        action_row.addWidget(self.stop_btn)
+        extract_layout.addLayout(action_row)
         
         extract_group.setLayout(extract_layout)
         layout.addWidget(extract_group)
+        self.update_model_state()
 
         # Progress & Logs
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
 
-        self.log_output = QTextEdit()
-        self.log_output.setReadOnly(True)
-        self.log_output.setPlaceholderText("Logs will appear here...")
+        self.log_output = LogConsole("extraction", "Logs will appear here...")
         layout.addWidget(self.log_output, stretch=1)
 
         # Save Buttons
@@ -86,6 +183,20 @@ class ExtractionPage(QWidget):
         save_layout.addWidget(self.save_txt_btn)
         layout.addLayout(save_layout)
 
+    def refresh_model_combo(self):
+        fill_model_combo(self.extract_model_combo, self.inventory)
+
+    def update_model_state(self, *args):
+        model_name = self.extract_model_combo.currentData()
+        state = self.model_cache.state(model_name) if model_name else "unloaded"
+        labels = {
+            "loading": "⏳ Loading...",
+            "warming": "⏳ Warming up...",
+            "ready": "🟢 Loaded",
+            "unloaded": "⚪ Not loaded",
+        }
+        self.model_state_label.setText(labels.get(state, f"🔴 {state}"))
+
     def browse_file(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Select Video File", "", "Video Files (*.mp4 *.mkv *.mov *.avi *.mp3 *.wav);;All Files (*)")
         if file_name:
@@ -127,23 +238,69 @@ class ExtractionPage(QWidget):
     def start_extraction(self):
         if not hasattr(self, 'file_path'):
             return
-        model_name = self.extract_model_combo.currentText()
-        self.start_worker('transcribe', model_name, self.file_path)
+        model_name = self.extract_model_combo.currentData()
+        backend = self.backend_combo.currentData() or "whisper"
+        self.settings.setValue("transcription_backend", backend)
+        segmentation = self.segmentation_options()
+        self.start_worker('transcribe', model_name, self.file_path, backend=backend, segmentation=segmentation)
+
+    def segmentation_options(self):
+        enabled = self.segment_check.isChecked()
+        self.settings.setValue("smart_segmentation", enabled)
+        self.settings.setValue("seg_max_chars", self.max_chars_spin.value())
+        self.settings.setValue("seg_max_lines", self.max_lines_spin.value())
+        self.settings.setValue("seg_max_duration", self.max_duration_spin.value())
+        self.settings.setValue("seg_min_gap", self.min_gap_spin.value())
+        if not enabled:
+            return None
+        return {
+            "max_chars": self.max_chars_spin.value(),
+            "max_lines": self.max_lines_spin.value(),
+            "max_duration": self.max_duration_spin.value(),
+            "min_gap": self.min_gap_spin.value(),
+        }
 
-    def start_worker(self, task_type, model_name, file_path=None):
+    def start_worker(self, task_type, model_name, file_path=None, backend="whisper", segmentation=None):
         self.set_ui_busy(True)
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         
-        self.worker = Worker(task_type, model_name, file_path)
-        self.worker.log.connect(self.log_output.append)
-        self.worker.error.connect(self.handle_error)
-        self.worker.finished.connect(self.handle_finished)
-        self.worker.start()
+        # Queued with every other job, so it shares the CPU slots with running pipelines
+        options = {"model_name": model_name, "backend": backend, "segmentation": segmentation}
+        self.job_id = self.scheduler.submit("extraction", os.path.basename(file_path), {"video": file_path}, options)
+
+    def on_job_started(self, job_id, worker):
+        if job_id != self.job_id:
+            return
+        worker.log.connect(self.log_output.append)
+        worker.error.connect(self.handle_error)
+        worker.finished.connect(self.handle_finished)
+        worker.cancelled.connect(self.handle_cancelled)
+
+    def on_job_changed(self, job_id):
+        # Also covers a job cancelled while still queued, which no worker reports
+        if job_id == self.job_id and job_id not in self.scheduler.running:
+            job = self.scheduler.store.get(job_id)
+            if job and job["status"] == "cancelled":
+                self.handle_cancelled()
+
+    def stop_extraction(self):
+        if self.job_id is not None:
+            # Takes effect at the engine's next decode step; handle_cancelled resets the UI
+            self.scheduler.cancel(self.job_id)
+            self.stop_btn.setEnabled(False)
+            self.log_output.append("Stopping...")
+
+    def handle_cancelled(self):
+        self.set_ui_busy(False)
+        self.progress_bar.setVisible(False)
 
     def set_ui_busy(self, busy):
         self.extract_btn.setEnabled(not busy)
+        self.stop_btn.setEnabled(busy)
         self.extract_model_combo.setEnabled(not busy)
+        self.backend_combo.setEnabled(not busy)
+        self.segment_check.setEnabled(not busy)
         
         if busy:
             self.save_srt_btn.setEnabled(False)
@@ -179,7 +336,8 @@ class ExtractionPage(QWidget):
         if format_type == 'srt':
             file_name, _ = QFileDialog.getSaveFileName(self, "Save SRT", f"{default_name}.srt", "SubRip Subtitle (*.srt)")
             if file_name:
-                self.write_srt(self.result_data['segments'], file_name)
+                # Re-segmented cues when smart segmentation ran, raw segments otherwise
+                self.write_srt(self.result_data.get('cues') or self.result_data['segments'], file_name)
         elif format_type == 'txt':
             file_name, _ = QFileDialog.getSaveFileName(self, "Save Text", f"{default_name}.txt", "Text File (*.txt)")
             if file_name:
@@ -190,16 +348,4 @@ class ExtractionPage(QWidget):
             self.log_output.append(f"Saved to: {file_name}")
 
     def write_srt(self, segments, file_name):
-        def format_time(seconds):
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            millis = int((seconds - int(seconds)) * 1000)
-            return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
-
-        with open(file_name, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(segments, start=1):
-                start = format_time(segment['start'])
-                end = format_time(segment['end'])
-                text = segment['text'].strip()
-                f.write(f"{i}\n{start} --> {end}\n{text}\n\n")
+        write_srt(segments, file_name)
@@ -0,0 +1,156 @@
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QGroupBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt, QTimer
+from job_store import get_job_store
+from scheduler import get_scheduler
+from resources import resource_usage
+
+COLUMNS = ["ID", "Type", "Job", "Stage", "Status", "Created", "Duration", "Stage Timings"]
+
+STATUS_ICONS = {
+    "queued": "🕒 Queued",
+    "running": "⏳ Running",
+    "done": "✅ Done",
+    "failed": "❌ Failed",
+    "cancelled": "⏹ Cancelled",
+}
+
+def format_duration(seconds):
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+class JobsPage(QWidget):
+    """Every stored job with its stage, plus queue depth and throughput."""
+
+    def __init__(self):
+        super().__init__()
+        self.store = get_job_store()
+        self.scheduler = get_scheduler()
+        self.init_ui()
+
+        # Stage updates can arrive many times a second; redraw at most every 300 ms
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(300)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.scheduler.job_changed.connect(lambda _: self.refresh_timer.start())
+        self.scheduler.stage_changed.connect(lambda *_: self.refresh_timer.start())
+
+        # Durations and throughput change with time alone
+        self.tick = QTimer(self)
+        self.tick.setInterval(2000)
+        self.tick.timeout.connect(self.refresh)
+        self.tick.start()
+        self.refresh()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        title = QLabel("Jobs")
+        title.setObjectName("header")
+        layout.addWidget(title)
+
+        self.stats_label = QLabel("")
+        layout.addWidget(self.stats_label)
+
+        group = QGroupBox("Queue")
+        group_layout = QVBoxLayout()
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        group_layout.addWidget(self.table)
+        group.setLayout(group_layout)
+        layout.addWidget(group, stretch=1)
+
+        btn_layout = QHBoxLayout()
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.setObjectName("deleteBtn")
+        cancel_btn.clicked.connect(self.cancel_selected)
+        btn_layout.addWidget(cancel_btn)
+
+        retry_btn = QPushButton("Retry")
+        retry_btn.setToolTip("Requeue failed or cancelled jobs; finished stages are skipped")
+        retry_btn.clicked.connect(self.retry_selected)
+        btn_layout.addWidget(retry_btn)
+
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.clear_finished)
+        btn_layout.addWidget(clear_btn)
+        btn_layout.addStretch()
+        layout.addLayout(btn_layout)
+
+    def refresh(self):
+        if not self.isVisible() and self.table.rowCount():
+            return # Redrawn on show
+        stats = self.store.stats()
+        usage = resource_usage()
+        avg = format_duration(stats["avg_duration_s"]) or "–"
+        self.stats_label.setText(
+            f"Queued: {stats['queued']}   Running: {stats['running']}   Failed: {stats['failed']}   "
+            f"Done (last hour): {stats['done_in_window']}   Throughput: {stats['jobs_per_hour']:.1f} jobs/h   "
+            f"Avg: {avg}   CPU slots: {usage['cpu'][0]}/{usage['cpu'][1]}   "
+            f"Network slots: {usage['network'][0]}/{usage['network'][1]}"
+        )
+
+        selected = set(self.selected_ids())
+        jobs = self.store.list()
+        now = time.time()
+        self.table.setRowCount(len(jobs))
+        for row, job in enumerate(jobs):
+            end = job["finished_at"] or (now if job["status"] == "running" else None)
+            duration = end - job["started_at"] if job["started_at"] and end else None
+            timings = ", ".join(f"{stage} {format_duration(s)}" for stage, s in job["timings"].items())
+            status = STATUS_ICONS.get(job["status"], job["status"])
+            values = [
+                str(job["id"]),
+                job["type"],
+                job["label"],
+                f"{job['stage']} {job['stage_status']}".strip(),
+                status,
+                time.strftime("%m-%d %H:%M", time.localtime(job["created_at"])),
+                format_duration(duration),
+                timings,
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, job["id"])
+                if col == 4 and job["error"]:
+                    item.setToolTip(job["error"])
+                self.table.setItem(row, col, item)
+            if job["id"] in selected:
+                self.table.selectRow(row)
+
+    def showEvent(self, event):
+        self.refresh()
+        super().showEvent(event)
+
+    def selected_ids(self):
+        rows = {index.row() for index in self.table.selectedIndexes()}
+        return [self.table.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows if self.table.item(row, 0)]
+
+    def cancel_selected(self):
+        for job_id in self.selected_ids():
+            self.scheduler.cancel(job_id)
+        self.refresh()
+
+    def retry_selected(self):
+        for job_id in self.selected_ids():
+            self.scheduler.retry(job_id)
+        self.refresh()
+
+    def clear_finished(self):
+        self.store.delete_finished()
+        self.refresh()
@@ -0,0 +1,101 @@
+import os
+import logging
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+LOG_DIR = os.path.expanduser("~/.cache/macwhisper/logs")
+LOG_FILE = os.path.join(LOG_DIR, "macwhisper.log")
+FLUSH_INTERVAL_MS = 100 # 10 Hz
+MAX_PENDING = 2000 # Lines kept between flushes; older ones are dropped from the view (not the file)
+MAX_LINES = 5000 # Lines kept in a console widget
+
+_file_logger = None
+
+def file_logger():
+    """Logger writing every page's log to one rotating file (5 × 2 MB)."""
+    global _file_logger
+    if _file_logger is None:
+        _file_logger = logging.getLogger("macwhisper")
+        _file_logger.setLevel(logging.INFO)
+        _file_logger.propagate = False
+        try:
+            os.makedirs(LOG_DIR, exist_ok=True)
+            handler = RotatingFileHandler(LOG_FILE, maxBytes=2 * 1024 * 1024, backupCount=5, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(message)s"))
+            _file_logger.addHandler(handler)
+        except OSError:
+            _file_logger.addHandler(logging.NullHandler())
+    return _file_logger
+
+class LogSink(QObject):
+    """Collects log lines and hands them over in batches, at most 10 times a second.
+
+    Workers can emit hundreds of lines a second (ffmpeg stats, per-batch
+    progress); repainting a widget for each one stalls the event loop.
+    Every line still goes to the rotating log file.
+    """
+    flushed = pyqtSignal(list) # lines since the last flush
+    dropped = pyqtSignal(int) # lines skipped because too many arrived between flushes
+
+    def __init__(self, name, parent=None):
+        super().__init__(parent)
+        self.logger = file_logger().getChild(name)
+        self.pending = deque(maxlen=MAX_PENDING)
+        self.overflow = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(FLUSH_INTERVAL_MS)
+        self.timer.timeout.connect(self.flush)
+
+    def write(self, msg):
+        msg = str(msg)
+        self.logger.info(msg)
+        if len(self.pending) == self.pending.maxlen:
+            self.overflow += 1
+        self.pending.append(msg)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+        if self.overflow:
+            self.dropped.emit(self.overflow)
+            self.overflow = 0
+        if self.pending:
+            lines = list(self.pending)
+            self.pending.clear()
+            self.flushed.emit(lines)
+
+    def discard(self):
+        self.timer.stop()
+        self.pending.clear()
+        self.overflow = 0
+
+class LogConsole(QPlainTextEdit):
+    """Read-only log view that keeps QTextEdit's append() but batches repaints
+    and only keeps the last MAX_LINES lines."""
+
+    def __init__(self, name, placeholder="", parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setPlaceholderText(placeholder)
+        self.setMaximumBlockCount(MAX_LINES)
+        self.sink = LogSink(name, self)
+        self.sink.flushed.connect(self.show_lines)
+        self.sink.dropped.connect(lambda n: self.appendPlainText(f"... {n} line(s) skipped, see {LOG_FILE}"))
+
+    def append(self, msg):
+        self.sink.write(msg)
+
+    def show_lines(self, lines):
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.appendPlainText("\n".join(lines))
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        self.sink.discard()
+        super().clear()
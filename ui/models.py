@@ -1,23 +1,25 @@
 import os
 import shutil
-from whisper import _MODELS as WHISPER_MODELS
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, 
     QGroupBox, QTableWidget, QTableWidgetItem,
-    QHeaderView, QAbstractItemView, QTextEdit, QInputDialog
+    QHeaderView, QAbstractItemView, QInputDialog,
+    QProgressBar, QLabel
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
+from ui.log_console import LogConsole
 from worker import Worker
-
-# Standard Whisper cache path
-WHISPER_CACHE_DIR = os.path.expanduser("~/.cache/whisper")
+from model_inventory import WHISPER_CACHE_DIR, WHISPER_MODELS, get_inventory
+from quantize import quantized_filename
 
 class ModelsPage(QWidget):
     def __init__(self):
         super().__init__()
+        self.inventory = get_inventory()
         self.init_ui()
         self.refresh_model_table()
+        self.inventory.changed.connect(self.refresh_model_table)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -63,7 +65,7 @@ class ModelsPage(QWidget):
         self.model_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents) # Status
         self.model_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch) # URL
         self.model_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed) # Action
-        self.model_table.setColumnWidth(3, 120)
+        self.model_table.setColumnWidth(3, 200)
         self.model_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
         self.model_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         
@@ -71,11 +73,23 @@ class ModelsPage(QWidget):
         model_group.setLayout(model_layout)
         layout.addWidget(model_group)
 
+        # Download progress
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+        self.rate_label = QLabel("")
+        progress_layout.addWidget(self.rate_label)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setToolTip("Stop the download or quantization (a partial download resumes next time)")
+        self.cancel_btn.clicked.connect(self.cancel_task)
+        self.cancel_btn.setVisible(False)
+        progress_layout.addWidget(self.cancel_btn)
+        layout.addLayout(progress_layout)
+
         # Log output for download status
-        self.log_output = QTextEdit()
+        self.log_output = LogConsole("models", "Download logs will appear here...")
         self.log_output.setFixedHeight(100)
-        self.log_output.setReadOnly(True)
-        self.log_output.setPlaceholderText("Download logs will appear here...")
         layout.addWidget(self.log_output)
 
     def download_from_url(self):
@@ -108,11 +122,7 @@ class ModelsPage(QWidget):
             self.log_output.append(f"Starting download from URL: {url}")
             
             # Start Worker with new task type
-            self.worker = Worker('download_custom', filename, download_url=url)
-            self.worker.log.connect(self.log_output.append)
-            self.worker.finished.connect(self.handle_finished)
-            self.worker.error.connect(self.handle_error)
-            self.worker.start()
+            self.start_worker(Worker('download_custom', filename, download_url=url))
 
     def import_local_model(self):
         from PyQt6.QtWidgets import QFileDialog
@@ -140,154 +150,153 @@ class ModelsPage(QWidget):
                 shutil.copy2(file_path, target_path)
                 self.log_output.append(f"Imported model: {filename}")
                 QMessageBox.information(self, "Success", f"Model '{filename}' imported successfully.")
-                self.refresh_model_table()
+                self.inventory.refresh(force=True)
                 
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to import model: {e}")
 
     def refresh_model_table(self):
         self.model_table.setRowCount(0)
-        
-        # 1. Standard Models
-        order = ['tiny.en', 'tiny', 'base.en', 'base', 'small.en', 'small', 'medium.en', 'medium', 'large-v1', 'large-v2', 'large-v3', 'large', 'turbo']
-        models = sorted(WHISPER_MODELS.keys(), key=lambda x: order.index(x) if x in order else 99)
+        entries = self.inventory.entries()
+        quantized_files = {e["file"] for e in entries if e["quantized"]}
 
-        # Track processed filenames to identify custom ones later
-        processed_filenames = set()
-
-        for model_name in models:
+        for entry in entries:
             row = self.model_table.rowCount()
             self.model_table.insertRow(row)
+            found = entry["present"]
+            file_size_mb = entry["size"] / (1024 * 1024)
             
-            # Name
-            name_item = QTableWidgetItem(model_name)
+            # Name (model name, or the file name for custom models)
+            name_item = QTableWidgetItem(entry["name"])
             name_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
             self.model_table.setItem(row, 0, name_item)
             
-            # Check existence
-            found = False
-            file_size_mb = 0
-            if os.path.exists(WHISPER_CACHE_DIR):
-                for f in os.listdir(WHISPER_CACHE_DIR):
-                    # Whisper heuristics: starts with model name and .pt
-                    # But wait, standard models usually have hash. simplify check:
-                    if f.startswith(model_name) and f.endswith(".pt"):
-                        found = True
-                        file_size_mb = os.path.getsize(os.path.join(WHISPER_CACHE_DIR, f)) / (1024 * 1024)
-                        processed_filenames.add(f)
-                        break
-            
             # Status
-            status_text = f"✅ Present ({file_size_mb:.1f} MB)" if found else "❌ Not Downloaded"
+            if not found:
+                status_text = "❌ Not Downloaded"
+            elif entry["standard"]:
+                status_text = f"✅ {'Verified' if entry['verified'] else 'Present'} ({file_size_mb:.1f} MB)"
+            elif entry["quantized"]:
+                status_text = f"✅ int8 ({file_size_mb:.1f} MB)"
+            else:
+                status_text = f"✅ Local ({file_size_mb:.1f} MB)"
             status_item = QTableWidgetItem(status_text)
             status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if found:
+            if not found:
+                status_item.setForeground(Qt.GlobalColor.gray)
+            elif entry["standard"]:
                 status_item.setForeground(Qt.GlobalColor.green)
             else:
-                status_item.setForeground(Qt.GlobalColor.gray)
+                status_item.setForeground(Qt.GlobalColor.blue)
             self.model_table.setItem(row, 1, status_item)
 
-            # URL
-            url = WHISPER_MODELS.get(model_name, "")
-            url_item = QTableWidgetItem(url)
+            # URL / Type
+            if entry["standard"]:
+                url_item = QTableWidgetItem(WHISPER_MODELS.get(entry["name"], ""))
+                url_item.setToolTip(entry["file"])
+            elif entry["quantized"]:
+                url_item = QTableWidgetItem("Quantized (int8, CPU)")
+            else:
+                url_item = QTableWidgetItem("Custom / Imported")
             self.model_table.setItem(row, 2, url_item)
             
-            # Action Button
+            # Action Buttons
+            actions = QWidget()
+            actions_layout = QHBoxLayout(actions)
+            actions_layout.setContentsMargins(0, 0, 0, 0)
             btn = QPushButton()
             if found:
                 btn.setText("Delete")
                 btn.setObjectName("deleteBtn")
-                btn.clicked.connect(lambda checked, m=model_name: self.delete_model(m))
+                btn.clicked.connect(lambda checked, m=entry["name"]: self.delete_model(m))
             else:
                 btn.setText("Download")
                 btn.setObjectName("downloadBtn")
-                btn.clicked.connect(lambda checked, m=model_name: self.download_model(m))
+                btn.clicked.connect(lambda checked, m=entry["name"]: self.download_model(m))
+            actions_layout.addWidget(btn)
             
-            self.model_table.setCellWidget(row, 3, btn)
-
-        # 2. Custom/Local Models (Any .pt file in cache not matched above)
-        if os.path.exists(WHISPER_CACHE_DIR):
-            for f in os.listdir(WHISPER_CACHE_DIR):
-                if f.endswith(".pt") and f not in processed_filenames:
-                    # Found a custom model
-                    row = self.model_table.rowCount()
-                    self.model_table.insertRow(row)
-                    
-                    # Name (Filename)
-                    name_item = QTableWidgetItem(f)
-                    name_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.model_table.setItem(row, 0, name_item)
-                    
-                    # Status
-                    size_mb = os.path.getsize(os.path.join(WHISPER_CACHE_DIR, f)) / (1024 * 1024)
-                    status_item = QTableWidgetItem(f"✅ Local ({size_mb:.1f} MB)")
-                    status_item.setForeground(Qt.GlobalColor.blue)
-                    status_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.model_table.setItem(row, 1, status_item)
-                    
-                    # Type
-                    self.model_table.setItem(row, 2, QTableWidgetItem("Custom / Imported"))
-                    
-                    # Action (Delete only)
-                    btn = QPushButton("Delete")
-                    btn.setObjectName("deleteBtn")
-                    btn.clicked.connect(lambda checked, filename=f: self.delete_custom_model(filename))
-                    self.model_table.setCellWidget(row, 3, btn)
+            if found and not entry["quantized"] and quantized_filename(entry["file"]) not in quantized_files:
+                quant_btn = QPushButton("Quantize")
+                quant_btn.setToolTip("Create an int8 copy for faster, lighter CPU inference")
+                quant_btn.clicked.connect(lambda checked, m=entry["name"]: self.quantize_model(m))
+                actions_layout.addWidget(quant_btn)
+            
+            self.model_table.setCellWidget(row, 3, actions)
 
     def download_model(self, model_name):
         self.model_table.setEnabled(False)
-        self.worker = Worker('download', model_name)
+        self.start_worker(Worker('download', model_name))
+
+    def quantize_model(self, model_name):
+        self.model_table.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.start_worker(Worker('quantize', model_name))
+
+    def start_worker(self, worker):
+        self.worker = worker
         self.worker.log.connect(self.log_output.append)
+        self.worker.download_progress.connect(self.on_download_progress)
         self.worker.finished.connect(self.handle_finished)
         self.worker.error.connect(self.handle_error)
+        self.worker.cancelled.connect(self.handle_cancelled)
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(True)
         self.worker.start()
 
-    def delete_model(self, model_name):
-        self._delete_file_logic(model_name, is_standard=True)
+    def cancel_task(self):
+        if hasattr(self, 'worker') and self.worker.isRunning():
+            self.worker.stop()
+            self.cancel_btn.setEnabled(False)
+            self.log_output.append("Cancelling...")
 
-    def delete_custom_model(self, filename):
-        self._delete_file_logic(filename, is_standard=False)
-
-    def _delete_file_logic(self, identifier, is_standard=True):
+    def delete_model(self, name):
         confirm = QMessageBox.question(
             self, "Confirm Delete", 
-            f"Are you sure you want to delete '{identifier}'?",
+            f"Are you sure you want to delete '{name}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            deleted = False
-            if os.path.exists(WHISPER_CACHE_DIR):
-                if is_standard:
-                    # Fuzzy match for standard models
-                    for f in os.listdir(WHISPER_CACHE_DIR):
-                        if f.startswith(identifier) and f.endswith(".pt"):
-                            path = os.path.join(WHISPER_CACHE_DIR, f)
-                            try:
-                                os.remove(path)
-                                deleted = True
-                            except Exception: pass
-                else:
-                    # Exact match for custom files
-                    path = os.path.join(WHISPER_CACHE_DIR, identifier)
-                    if os.path.exists(path):
-                         try:
-                            os.remove(path)
-                            deleted = True
-                         except Exception: pass
+            try:
+                deleted = self.inventory.delete(name)
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to delete model: {e}")
+                return
 
             if deleted:
-                self.log_output.append(f"Model '{identifier}' deleted.")
-                self.refresh_model_table()
+                self.log_output.append(f"Model '{name}' deleted.")
             else:
                  QMessageBox.information(self, "Info", "Model file not found to delete.")
 
+    def on_download_progress(self, done, total, rate):
+        self.progress_bar.setVisible(True)
+        if total:
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(done * 1000 / total))
+            self.rate_label.setText(f"{done/1024/1024:.1f} / {total/1024/1024:.1f} MB  ·  {rate/1024/1024:.1f} MB/s")
+        else:
+            self.progress_bar.setRange(0, 0)
+            self.rate_label.setText(f"{done/1024/1024:.1f} MB  ·  {rate/1024/1024:.1f} MB/s")
+
+    def reset_progress(self):
+        self.progress_bar.setVisible(False)
+        self.rate_label.setText("")
+        self.cancel_btn.setVisible(False)
+
     def handle_finished(self, result):
+        self.reset_progress()
         self.model_table.setEnabled(True)
-        self.refresh_model_table()
-        QMessageBox.information(self, "Success", "Model download completed!")
+        self.inventory.refresh(force=True)
+        QMessageBox.information(self, "Success", "Model task completed!")
+
+    def handle_cancelled(self):
+        self.reset_progress()
+        self.model_table.setEnabled(True)
+        self.inventory.refresh(force=True)
 
     def handle_error(self, error_msg):
+        self.reset_progress()
         self.model_table.setEnabled(True)
-        self.refresh_model_table()
+        self.inventory.refresh(force=True)
         QMessageBox.critical(self, "Error", f"An error occurred:\n{error_msg}")
@@ -0,0 +1,275 @@
+import os
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QLineEdit,
+    QPushButton, QFileDialog, QMessageBox, QGroupBox, QFormLayout,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import QSettings
+from ui.log_console import LogConsole
+from scheduler import get_scheduler
+from job_store import get_job_store
+from model_inventory import get_inventory
+from transcription_backends import available_backends
+from translator import configured_providers, parse_glossary
+from provider_pool import POOL_KEY, POOL_LABEL, pool_members
+from ui.extraction import fill_model_combo, segmentation_from_settings
+from ui.burning import burn_config_from_settings
+
+STAGE_COLUMNS = {"transcribe": 1, "translate": 2, "burn": 3}
+
+class PipelinePage(QWidget):
+    """Extract, translate and burn a batch of videos in one go."""
+
+    def __init__(self):
+        super().__init__()
+        self.settings = QSettings("MacWhisper", "Config")
+        self.inventory = get_inventory()
+        self.scheduler = get_scheduler()
+        self.files = []
+        self.rows = {} # job id -> table row
+        self.init_ui()
+        self.scheduler.stage_changed.connect(self.on_stage_changed)
+        self.scheduler.log.connect(self.on_job_log)
+        self.scheduler.job_changed.connect(self.on_job_changed)
+        self.inventory.changed.connect(lambda: fill_model_combo(self.model_combo, self.inventory))
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        title = QLabel("Extract → Translate → Burn")
+        title.setObjectName("header")
+        layout.addWidget(title)
+
+        # --- Inputs ---
+        files_group = QGroupBox("Videos")
+        files_layout = QVBoxLayout()
+        btn_row = QHBoxLayout()
+        add_btn = QPushButton("Add Videos")
+        add_btn.clicked.connect(self.add_files)
+        btn_row.addWidget(add_btn)
+        self.clear_btn = QPushButton("Clear")
+        self.clear_btn.clicked.connect(self.clear_files)
+        btn_row.addWidget(self.clear_btn)
+        btn_row.addStretch()
+        files_layout.addLayout(btn_row)
+
+        self.file_table = QTableWidget()
+        self.file_table.setColumnCount(4)
+        self.file_table.setHorizontalHeaderLabels(["File", "Transcribe", "Translate", "Burn"])
+        self.file_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for col in range(1, 4):
+            self.file_table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+        self.file_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.file_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        files_layout.addWidget(self.file_table)
+        files_group.setLayout(files_layout)
+        layout.addWidget(files_group, stretch=1)
+
+        # --- Options ---
+        options_group = QGroupBox("Configuration")
+        form = QFormLayout()
+
+        model_row = QHBoxLayout()
+        self.model_combo = QComboBox()
+        fill_model_combo(self.model_combo, self.inventory)
+        idx = self.model_combo.findData(self.settings.value("default_model", "base"))
+        if idx >= 0: self.model_combo.setCurrentIndex(idx)
+        model_row.addWidget(self.model_combo)
+        self.backend_combo = QComboBox()
+        for backend in available_backends():
+            self.backend_combo.addItem(backend.label, userData=backend.name)
+        idx = self.backend_combo.findData(self.settings.value("transcription_backend", "whisper"))
+        if idx >= 0: self.backend_combo.setCurrentIndex(idx)
+        model_row.addWidget(self.backend_combo)
+        form.addRow("Whisper Model:", model_row)
+
+        provider_row = QHBoxLayout()
+        self.provider_combo = QComboBox()
+        self.provider_combo.currentIndexChanged.connect(self.update_llm_model)
+        provider_row.addWidget(self.provider_combo)
+        self.llm_model_edit = QLineEdit()
+        self.llm_model_edit.setPlaceholderText("Model (e.g. gpt-4o)")
+        provider_row.addWidget(self.llm_model_edit)
+        form.addRow("Translation:", provider_row)
+
+        self.lang_combo = QComboBox()
+        self.lang_combo.addItems([
+            "Simplified Chinese", "Traditional Chinese", "English",
+            "Japanese", "Korean", "Spanish", "French", "German", "Russian"
+        ])
+        self.lang_combo.setEditable(True)
+        self.lang_combo.setCurrentText(self.settings.value("pipeline_target_lang", "Simplified Chinese"))
+        form.addRow("Target Language:", self.lang_combo)
+
+        out_row = QHBoxLayout()
+        self.output_dir = self.settings.value("pipeline_output_dir", "")
+        self.output_label = QLabel(self.output_dir or "Next to each video")
+        self.output_label.setStyleSheet("color: #888;")
+        out_btn = QPushButton("Choose...")
+        out_btn.clicked.connect(self.choose_output_dir)
+        out_row.addWidget(self.output_label, stretch=1)
+        out_row.addWidget(out_btn)
+        form.addRow("Output Folder:", out_row)
+
+        hint = QLabel("Segmentation follows the Extraction page; context, glossary and streaming follow "
+                      "the Translation page; style, burn/mux mode and "
+                      "track language follow the Burn page's last settings. Each video becomes "
+                      "a job on the Jobs page and resumes after a restart.")
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: #888;")
+        form.addRow("", hint)
+
+        options_group.setLayout(form)
+        layout.addWidget(options_group)
+
+        # --- Actions ---
+        action_row = QHBoxLayout()
+        self.start_btn = QPushButton("Start Pipeline")
+        self.start_btn.setObjectName("primaryButton")
+        self.start_btn.clicked.connect(self.start_pipeline)
+        self.start_btn.setEnabled(False)
+        action_row.addWidget(self.start_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setObjectName("deleteBtn")
+        self.stop_btn.clicked.connect(self.stop_pipeline)
+        self.stop_btn.setEnabled(False)
+        action_row.addWidget(self.stop_btn)
+        layout.addLayout(action_row)
+
+        self.log_output = LogConsole("pipeline", "Pipeline logs will appear here...")
+        layout.addWidget(self.log_output, stretch=1)
+
+        self.refresh_providers()
+
+    def showEvent(self, event):
+        # Pick up services added on the API Keys page
+        if not self.rows:
+            self.refresh_providers()
+        super().showEvent(event)
+
+    def refresh_providers(self):
+        current = self.provider_combo.currentText()
+        self.provider_combo.blockSignals(True)
+        self.provider_combo.clear()
+        for display_name, service_key, config in configured_providers(self.settings):
+            self.provider_combo.addItem(display_name, userData={"key": service_key, "config": config})
+        if self.provider_combo.count() == 0:
+            self.provider_combo.addItem("No Configured Services Found", userData=None)
+        elif len(pool_members(self.settings)) > 1:
+            self.provider_combo.addItem(POOL_LABEL, userData={"key": POOL_KEY, "config": {}})
+        idx = self.provider_combo.findText(current)
+        if idx >= 0: self.provider_combo.setCurrentIndex(idx)
+        self.provider_combo.blockSignals(False)
+        self.update_llm_model()
+
+    def update_llm_model(self):
+        data = self.provider_combo.currentData()
+        # Pool members each use their own configured model
+        self.llm_model_edit.setEnabled(not data or data["key"] != POOL_KEY)
+        if data and data["key"] != POOL_KEY and not self.llm_model_edit.text().strip():
+            self.llm_model_edit.setText(data["config"].get("model", "").strip() or "gpt-3.5-turbo")
+
+    def add_files(self):
+        files, _ = QFileDialog.getOpenFileNames(self, "Select Videos", "", "Video Files (*.mp4 *.mkv *.mov *.avi);;All Files (*)")
+        for f in files:
+            if f in self.files:
+                continue
+            self.files.append(f)
+            row = self.file_table.rowCount()
+            self.file_table.insertRow(row)
+            self.file_table.setItem(row, 0, QTableWidgetItem(os.path.basename(f)))
+            for col in STAGE_COLUMNS.values():
+                self.file_table.setItem(row, col, QTableWidgetItem("Pending"))
+        self.start_btn.setEnabled(bool(self.files))
+
+    def clear_files(self):
+        self.files = []
+        self.file_table.setRowCount(0)
+        self.start_btn.setEnabled(False)
+
+    def choose_output_dir(self):
+        folder = QFileDialog.getExistingDirectory(self, "Output Folder", self.output_dir or "")
+        if folder:
+            self.output_dir = folder
+            self.output_label.setText(folder)
+            self.settings.setValue("pipeline_output_dir", folder)
+
+    def start_pipeline(self):
+        data = self.provider_combo.currentData()
+        if not data:
+            QMessageBox.warning(self, "Configuration Error", "Please configure a translation service on the API Keys page.")
+            return
+        if data["key"] != POOL_KEY and not data["config"].get("api_key", ""):
+            QMessageBox.warning(self, "Configuration Error", f"The selected service '{self.provider_combo.currentText()}' is missing an API Key.")
+            return
+        llm_model = self.llm_model_edit.text().strip() or "gpt-3.5-turbo"
+        target_lang = self.lang_combo.currentText().strip()
+        self.settings.setValue("pipeline_target_lang", target_lang)
+
+        mode, burn_config = burn_config_from_settings(self.settings)
+        # Stored with each job; the API key itself is looked up when the job runs
+        options = {
+            "model_name": self.model_combo.currentData(),
+            "backend": self.backend_combo.currentData() or "whisper",
+            "segmentation": segmentation_from_settings(self.settings),
+            "provider_key": data["key"],
+            "llm_model": llm_model,
+            "target_lang": target_lang,
+            "context_cues": int(self.settings.value("translation_context_cues", 0)),
+            "glossary": parse_glossary(self.settings.value("translation_glossary", "")),
+            "stream": self.settings.value("translation_stream", True, type=bool),
+            "mode": mode,
+            "burn_config": burn_config,
+            "output_dir": self.output_dir or None,
+        }
+
+        self.log_output.clear()
+        self.log_output.append(f"Queueing {len(self.files)} file(s): {options['backend']} / {options['model_name']}"
+                               f" → {llm_model} ({target_lang}) → {mode}")
+        self.rows = {}
+        for row, video in enumerate(self.files):
+            for col in STAGE_COLUMNS.values():
+                self.file_table.setItem(row, col, QTableWidgetItem("Queued"))
+            job_id = self.scheduler.submit("pipeline", os.path.basename(video), {"video": video}, options)
+            self.rows[job_id] = row
+        self.set_busy(True)
+
+    def set_busy(self, busy):
+        self.start_btn.setEnabled(not busy and bool(self.files))
+        self.clear_btn.setEnabled(not busy)
+        self.stop_btn.setEnabled(busy)
+
+    def on_stage_changed(self, job_id, stage, status):
+        if job_id in self.rows:
+            self.file_table.setItem(self.rows[job_id], STAGE_COLUMNS[stage], QTableWidgetItem(status))
+
+    def on_job_log(self, job_id, msg):
+        if job_id in self.rows:
+            self.log_output.append(msg)
+
+    def stop_pipeline(self):
+        self.log_output.append("Stopping (a running transcription finishes its current file first)...")
+        for job_id in self.rows:
+            self.scheduler.cancel(job_id)
+        self.stop_btn.setEnabled(False)
+
+    def on_job_changed(self, job_id):
+        if job_id not in self.rows:
+            return
+        jobs = [get_job_store().get(i) for i in self.rows]
+        if any(job["status"] in ("queued", "running") for job in jobs):
+            return
+        self.set_busy(False)
+        done = [job for job in jobs if job["status"] == "done"]
+        self.log_output.append(f"\n--- Pipeline finished: {len(done)}/{len(jobs)} file(s) done ---")
+        for job in jobs:
+            artifacts = job["artifacts"]
+            if artifacts.get("output"):
+                self.log_output.append(f"{job['label']} → {artifacts['output']}")
+            elif job["error"]:
+                self.log_output.append(f"{job['label']}: {job['error']}")
+            if artifacts.get("job_dir"):
+                self.log_output.append(f"  Subtitles kept in {artifacts['job_dir']}")
+        self.rows = {}
@@ -1,8 +1,11 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QComboBox, 
-    QPushButton, QFormLayout, QSpinBox, QMessageBox
+    QPushButton, QFormLayout, QSpinBox, QMessageBox, QCheckBox, QLineEdit
 )
 from PyQt6.QtCore import Qt, QSettings, pyqtSignal
+from model_inventory import WHISPER_MODELS, MODEL_ORDER
+from cpu_config import parse_cpu_list
+from profiling import DIAGNOSTICS_DIR
 
 class SettingsPage(QWidget):
     # Signal to notify main window to update styles
@@ -38,6 +41,66 @@ class SettingsPage(QWidget):
         self.font_spin.setValue(current_font)
         form_layout.addRow("Font Size:", self.font_spin)
 
+        # Default transcription model and background preloading
+        self.default_model_combo = QComboBox()
+        self.default_model_combo.addItems(sorted(WHISPER_MODELS.keys(), key=lambda x: MODEL_ORDER.index(x) if x in MODEL_ORDER else 99))
+        self.default_model_combo.setCurrentText(self.settings.value("default_model", "base"))
+        form_layout.addRow("Default Model:", self.default_model_combo)
+
+        self.preload_check = QCheckBox("Preload default model at startup")
+        self.preload_check.setChecked(self.settings.value("preload_model", False, type=bool))
+        form_layout.addRow("", self.preload_check)
+
+        self.warm_up_check = QCheckBox("Warm up with a short dummy decode after loading")
+        self.warm_up_check.setChecked(self.settings.value("preload_warm_up", True, type=bool))
+        form_layout.addRow("", self.warm_up_check)
+
+        # CPU threading for transcription jobs (0 / blank = auto)
+        self.intra_spin = QSpinBox()
+        self.intra_spin.setRange(0, 256)
+        self.intra_spin.setSpecialValueText("Auto")
+        self.intra_spin.setValue(int(self.settings.value("torch_intra_threads", 0)))
+        form_layout.addRow("Intra-op Threads:", self.intra_spin)
+
+        self.interop_spin = QSpinBox()
+        self.interop_spin.setRange(0, 64)
+        self.interop_spin.setSpecialValueText("Auto")
+        self.interop_spin.setValue(int(self.settings.value("torch_interop_threads", 0)))
+        form_layout.addRow("Inter-op Threads:", self.interop_spin)
+
+        self.concurrent_spin = QSpinBox()
+        self.concurrent_spin.setRange(1, 64)
+        self.concurrent_spin.setValue(int(self.settings.value("concurrent_transcriptions", 1)))
+        self.concurrent_spin.setToolTip("Transcriptions and burns running at once; "
+                                        "auto mode divides the CPU cores between them")
+        form_layout.addRow("Concurrent Jobs:", self.concurrent_spin)
+
+        self.requests_spin = QSpinBox()
+        self.requests_spin.setRange(1, 64)
+        self.requests_spin.setValue(int(self.settings.value("concurrent_requests", 4)))
+        self.requests_spin.setToolTip("Translation requests in flight at once, across all jobs")
+        form_layout.addRow("Concurrent Requests:", self.requests_spin)
+
+        self.proxy_edit = QLineEdit(self.settings.value("http_proxy", ""))
+        self.proxy_edit.setPlaceholderText("System (e.g. http://127.0.0.1:7890)")
+        self.proxy_edit.setToolTip("Proxy for translation services and the API Keys test")
+        form_layout.addRow("HTTP Proxy:", self.proxy_edit)
+
+        self.affinity_edit = QLineEdit(self.settings.value("cpu_affinity", ""))
+        self.affinity_edit.setPlaceholderText("Auto (e.g. 0-3,6)")
+        form_layout.addRow("CPU Affinity:", self.affinity_edit)
+
+        # Profiling (also switched on by the --profile / --profile-torch flags)
+        self.profile_check = QCheckBox("Profile each job with cProfile")
+        self.profile_check.setChecked(self.settings.value("profile_jobs", False, type=bool))
+        self.profile_check.setToolTip(f"Saves a .prof file per job to {DIAGNOSTICS_DIR} and logs the top functions")
+        form_layout.addRow("Profiling:", self.profile_check)
+
+        self.profile_torch_check = QCheckBox("Trace model inference with torch.profiler")
+        self.profile_torch_check.setChecked(self.settings.value("profile_torch", False, type=bool))
+        self.profile_torch_check.setToolTip(f"Saves a Chrome trace per transcription to {DIAGNOSTICS_DIR}")
+        form_layout.addRow("", self.profile_torch_check)
+
         layout.addLayout(form_layout)
 
         save_btn = QPushButton("Apply & Save")
@@ -47,11 +110,28 @@ class SettingsPage(QWidget):
         layout.addWidget(save_btn)
 
     def save_settings(self):
+        try:
+            parse_cpu_list(self.affinity_edit.text())
+        except ValueError:
+            QMessageBox.warning(self, "Invalid CPU Affinity", "Use a list like 0-3,6 or leave it blank for auto.")
+            return
+
         theme = self.theme_combo.currentText()
         font_size = self.font_spin.value()
         
         self.settings.setValue("app_theme", theme)
         self.settings.setValue("app_font_size", font_size)
+        self.settings.setValue("default_model", self.default_model_combo.currentText())
+        self.settings.setValue("preload_model", self.preload_check.isChecked())
+        self.settings.setValue("preload_warm_up", self.warm_up_check.isChecked())
+        self.settings.setValue("torch_intra_threads", self.intra_spin.value())
+        self.settings.setValue("torch_interop_threads", self.interop_spin.value())
+        self.settings.setValue("concurrent_transcriptions", self.concurrent_spin.value())
+        self.settings.setValue("concurrent_requests", self.requests_spin.value())
+        self.settings.setValue("http_proxy", self.proxy_edit.text().strip())
+        self.settings.setValue("cpu_affinity", self.affinity_edit.text().strip())
+        self.settings.setValue("profile_jobs", self.profile_check.isChecked())
+        self.settings.setValue("profile_torch", self.profile_torch_check.isChecked())
         
         self.style_changed.emit()
-        QMessageBox.information(self, "Settings Saved", "Application appearance updated.")
+        QMessageBox.information(self, "Settings Saved", "Settings updated.")
@@ -1,42 +1,71 @@
 import os
 import re
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
-    QPushButton, QFileDialog, QTextEdit, QProgressBar, 
-    QMessageBox, QGroupBox, QLineEdit, QSplitter, QFormLayout
+    QPushButton, QFileDialog, QProgressBar, 
+    QMessageBox, QGroupBox, QLineEdit, QSplitter, QFormLayout, QSpinBox, QPlainTextEdit, QCheckBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
-from openai import OpenAI
+from ui.log_console import LogConsole
+from translator import (
+    BATCH_SIZE, configured_providers, base_url_for, make_client, translate_batch, parse_glossary, rolling_context
+)
+from provider_pool import POOL_KEY, POOL_LABEL, ProviderPool, pool_members
+from resources import resource_usage
+from cancellation import CancelToken
+from scheduler import get_scheduler
+from instrumentation import get_recorder
+from profiling import profiled
 
 class TranslationWorker(QThread):
     progress = pyqtSignal(int)
+    cue_translated = pyqtSignal(int, str) # Cue number, translation (as each one arrives)
     log = pyqtSignal(str)
     finished = pyqtSignal(str) # Emits the full translated content
     error = pyqtSignal(str)
 
-    def __init__(self, api_key, file_path, target_lang, model="gpt-3.5-turbo", base_url=None):
+    def __init__(self, api_key, file_path, target_lang, model="gpt-3.5-turbo", base_url=None, provider=None,
+                 context_cues=0, glossary=None, stream=False):
         super().__init__()
+        self.stream = stream # Parse replies as they stream in; stop() then aborts mid-reply
         self.api_key = api_key
+        self.provider = provider
+        self.context_cues = context_cues # Earlier cues sent along as read-only context
+        self.glossary = glossary or {}
         self.file_path = file_path
         self.target_lang = target_lang
         self.model = model
         self.base_url = base_url
-        self.is_running = True
+        # Passed as should_stop, so stop() also abandons requests waiting on the server
+        self.token = CancelToken()
 
+    @profiled
     def run(self):
         try:
             self.log.emit("Starting translation...")
-            
-            if not self.api_key:
-                raise ValueError("API Key is missing.")
-
-            # Configure Client
-            client_args = {"api_key": self.api_key}
-            if self.base_url and self.base_url.strip():
-                client_args["base_url"] = self.base_url.strip()
-                
-            client = OpenAI(**client_args)
+            metrics = get_recorder().job("translate", os.path.basename(self.file_path))
+            should_stop = self.token
+
+            if self.provider == POOL_KEY:
+                pool = ProviderPool.from_settings(QSettings("MacWhisper", "Config"), log=self.log.emit)
+                self.log.emit(f"Pool: {', '.join(m['name'] for m in pool.members)}")
+                translate = lambda texts, context, on_segment: pool.translate(
+                    self.target_lang, texts, log=self.log.emit, should_stop=should_stop, metrics=metrics,
+                    context=context, glossary=self.glossary, stream=self.stream, on_segment=on_segment)
+                # Batches run side by side, bounded by the Concurrent Requests setting
+                workers = resource_usage()["network"][1]
+            else:
+                if not self.api_key:
+                    raise ValueError("API Key is missing.")
+                pool = None
+                client = make_client(self.api_key, self.base_url, provider=self.provider)
+                translate = lambda texts, context, on_segment: translate_batch(
+                    client, self.model, self.target_lang, texts, log=self.log.emit, should_stop=should_stop,
+                    metrics=metrics, context=context, glossary=self.glossary, stream=self.stream,
+                    on_segment=on_segment)
+                workers = 1
             
             # Read file
             with open(self.file_path, 'r', encoding='utf-8') as f:
@@ -44,91 +73,79 @@ class TranslationWorker(QThread):
 
             blocks = re.split(r'\n\s*\n', content.strip())
             
-            translated_blocks = []
-            total_blocks = len(blocks)
-            
-            batch_size = 10 
-            current_batch = []
-            current_batch_indices = []
-            
+            # Blocks without text (fewer than 3 lines) are kept as they are
+            translated_blocks = list(blocks)
+            sources = [] # (block index, text) for every block with text, in order
+            translated_texts = {} # block index -> translation, as batches finish
+
+            batches = [] # (block indices, texts)
+            indices, texts = [], []
             for i, block in enumerate(blocks):
-                if not self.is_running: break
-                
                 lines = block.strip().split('\n')
                 if len(lines) >= 3:
-                    text_lines = " ".join(lines[2:])
-                    current_batch.append(text_lines)
-                    current_batch_indices.append(i)
-                else:
-                    translated_blocks.append(block)
-                    continue
-
-                if len(current_batch) >= batch_size or i == total_blocks - 1:
-                    # Translate batch
-                    self.log.emit(f"Translating batch {i - len(current_batch) + 2} to {i + 1}...")
-                    
-                    combined_text = "\n---\n".join(current_batch)
-                    system_msg = f"You are a professional subtitle translator. Translate the following subtitle segments to {self.target_lang}. The segments are separated by '---'. Output ONLY the translated segments separated by '---'. Do not include original text, line numbers, or timestamps in your output, just the translated text."
-                    
-                    max_retries = 3
-                    success = False
-                    
-                    for attempt in range(max_retries):
-                        if not self.is_running: break
-                        
-                        try:
-                            response = client.chat.completions.create(
-                                model=self.model,
-                                messages=[
-                                    {"role": "system", "content": system_msg},
-                                    {"role": "user", "content": combined_text}
-                                ],
-                                temperature=0.3
-                            )
-                            translated_text_combined = response.choices[0].message.content.strip()
-                            translations = translated_text_combined.split('---')
-                            
-                            len_diff = len(current_batch) - len(translations)
-                            if len_diff > 0:
-                                 translations.extend(["[Error: Translation missing]"] * len_diff)
-                            
-                            for idx, trans_text in enumerate(translations[:len(current_batch)]):
-                                original_idx_in_blocks = current_batch_indices[idx]
-                                original_block_lines = blocks[original_idx_in_blocks].strip().split('\n')
-                                new_block = f"{original_block_lines[0]}\n{original_block_lines[1]}\n{trans_text.strip()}"
-                                translated_blocks.append(new_block)
-                            
-                            success = True
-                            break # Success, exit retry loop
-
-                        except Exception as e:
-                            err_str = str(e)
-                            
-                            # Check for fatal errors causing immediate stop (No Retry)
-                            if "insufficient_quota" in err_str:
-                                 raise Exception("Quota exceeded (429). Please check your API billing.")
-                            if "401" in err_str:
-                                 raise Exception("Authentication failed (401). Check your API Key.")
-                            
-                            self.log.emit(f"Batch failed (Attempt {attempt+1}/{max_retries}): {err_str}")
-                            
-                            # Wait before retrying (backoff: 2s, 4s, etc or just fixed 2s)
-                            if attempt < max_retries - 1:
-                                time.sleep(2)
-                    
-                    if not success:
-                        self.log.emit("Skipping batch after max retries.")
-                        # Fallback for non-fatal errors after retries exhausted
-                        for idx_in_batch in current_batch_indices:
-                             translated_blocks.append(blocks[idx_in_batch])
-
-                    current_batch = []
-                    current_batch_indices = []
-                    
-                    progress_pct = int((i + 1) / total_blocks * 100)
-                    self.progress.emit(progress_pct)
-
-            if self.is_running:
+                    indices.append(i)
+                    texts.append(" ".join(lines[2:]))
+                    sources.append((i, texts[-1]))
+                if len(indices) >= BATCH_SIZE:
+                    batches.append((indices, texts))
+                    indices, texts = [], []
+            if indices:
+                batches.append((indices, texts))
+
+            positions = {block_idx: pos for pos, (block_idx, _) in enumerate(sources)}
+            finished_cues = set() # Block indices translated or given up on
+            progress_lock = threading.Lock()
+
+            def mark_done(block_indices):
+                with progress_lock:
+                    before = len(finished_cues) * 100 // max(1, len(sources))
+                    finished_cues.update(block_indices)
+                    after = len(finished_cues) * 100 // max(1, len(sources))
+                if after != before:
+                    self.progress.emit(after)
+
+            def on_cue(block_idx, text):
+                translated_texts[block_idx] = text
+                self.cue_translated.emit(positions[block_idx] + 1, text)
+                mark_done([block_idx])
+
+            def run_batch(batch_indices, batch_texts):
+                if self.token.cancelled:
+                    return None
+                self.log.emit(f"Translating batch {batch_indices[0] + 1} to {batch_indices[-1] + 1}...")
+                # With concurrent batches the cues just before may still be untranslated; they go as source only
+                start = positions[batch_indices[0]]
+                previous = [(text, translated_texts.get(i)) for i, text in sources[max(0, start - self.context_cues):start]]
+                return translate(batch_texts, rolling_context(previous, self.context_cues),
+                                 lambda j, text: on_cue(batch_indices[j], text))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run_batch, *batch): batch for batch in batches}
+                try:
+                    for future in as_completed(futures):
+                        translations = future.result()
+                        batch_indices, _ = futures[future]
+                        if translations is None:
+                            if not self.token.cancelled:
+                                self.log.emit("Skipping batch after max retries.")
+                        else:
+                            missing = translations.count(None)
+                            if missing:
+                                self.log.emit(f"Keeping the original text for {missing} segment(s) the model never returned.")
+                            for block_idx, trans_text in zip(batch_indices, translations):
+                                if trans_text is None:
+                                    continue
+                                original_block_lines = blocks[block_idx].strip().split('\n')
+                                translated_blocks[block_idx] = f"{original_block_lines[0]}\n{original_block_lines[1]}\n{trans_text}"
+                        mark_done(batch_indices)
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+            if pool:
+                self.log.emit(f"Pool usage: {pool.summary()}")
+            if not self.token.cancelled:
                 full_translated_srt = "\n\n".join(translated_blocks)
                 self.finished.emit(full_translated_srt)
                 self.log.emit("Translation completed.")
@@ -139,13 +156,17 @@ class TranslationWorker(QThread):
             self.error.emit(str(e))
 
     def stop(self):
-        self.is_running = False
+        self.token.cancel()
 
 class TranslationPage(QWidget):
     def __init__(self):
         super().__init__()
         self.settings = QSettings("MacWhisper", "Config")
         self.translated_content = None
+        self.job_id = None
+        self.scheduler = get_scheduler()
+        self.scheduler.job_started.connect(self.on_job_started)
+        self.scheduler.job_changed.connect(self.on_job_changed)
         self.init_ui()
 
     def init_ui(self):
@@ -190,25 +211,52 @@ class TranslationPage(QWidget):
         ])
         self.lang_combo.setEditable(True)
         control_layout.addRow("Target Language:", self.lang_combo)
+
+        # Consistency: earlier cues as context, plus a glossary
+        self.context_spin = QSpinBox()
+        self.context_spin.setRange(0, 50)
+        self.context_spin.setSpecialValueText("Off")
+        self.context_spin.setSuffix(" previous cues")
+        self.context_spin.setValue(int(self.settings.value("translation_context_cues", 0)))
+        self.context_spin.setToolTip("Sent read-only with each batch for consistency (capped in size)")
+        control_layout.addRow("Context:", self.context_spin)
+
+        self.glossary_edit = QPlainTextEdit(self.settings.value("translation_glossary", ""))
+        self.glossary_edit.setPlaceholderText("One term per line: term = translation")
+        self.glossary_edit.setFixedHeight(60)
+        control_layout.addRow("Glossary:", self.glossary_edit)
+
+        self.stream_check = QCheckBox("Stream replies (cue-by-cue progress, instant stop)")
+        self.stream_check.setChecked(self.settings.value("translation_stream", True, type=bool))
+        control_layout.addRow("", self.stream_check)
         
         control_group.setLayout(control_layout)
         layout.addWidget(control_group)
 
         # Action (Keep existing code)
+        action_layout = QHBoxLayout()
         self.translate_btn = QPushButton("Start Translation")
         self.translate_btn.setObjectName("primaryButton")
         self.translate_btn.clicked.connect(self.start_translation)
         self.translate_btn.setEnabled(False)
-        layout.addWidget(self.translate_btn)
+        action_layout.addWidget(self.translate_btn)
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setObjectName("deleteBtn")
+        self.stop_btn.clicked.connect(self.stop_translation)
+        self.stop_btn.setEnabled(False)
+        action_layout.addWidget(self.stop_btn)
+        layout.addLayout(action_layout)
         
         # ... (Progress, Logs, Save UI code remains the same) ...
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
 
-        self.log_output = QTextEdit()
-        self.log_output.setReadOnly(True)
-        self.log_output.setPlaceholderText("Translation progress and preview will appear here...")
+        self.preview_label = QLabel("")
+        self.preview_label.setStyleSheet("color: #888;")
+        layout.addWidget(self.preview_label)
+
+        self.log_output = LogConsole("translation", "Translation progress and preview will appear here...")
         layout.addWidget(self.log_output)
 
         save_layout = QHBoxLayout()
@@ -224,48 +272,16 @@ class TranslationPage(QWidget):
     def refresh_providers(self):
         self.provider_combo.blockSignals(True) # Prevent premature triggering
         self.provider_combo.clear()
-        import json
         
-        # Load Main Services Config
-        service_configs_str = self.settings.value("service_configs", "{}")
-        try:
-            service_configs = json.loads(service_configs_str)
-        except:
-            service_configs = {}
-
-        # Load Custom Services List
-        custom_services_str = self.settings.value("custom_services_list", "[]")
-        try:
-            custom_services = json.loads(custom_services_str)
-        except:
-            custom_services = []
-            
-        # Name Mapping
-        name_map = {
-            "deepseek": "DeepSeek",
-            "openai": "OpenAI",
-            "baidu": "Baidu Translate",
-            "aliyun": "Aliyun Translate",
-            "volcengine": "Volcengine",
-            "deeplx": "DeepLX",
-            "ollama": "Ollama"
-        }
-        for cs in custom_services:
-            name_map[cs["key"]] = cs["name"]
-
-        # Populate Combo Box
         count = 0
-        for service_key, config in service_configs.items():
-            if not config: continue
-            
-            display_name = name_map.get(service_key, service_key.capitalize())
-            has_creds = any(k in config for k in ["api_key", "app_id", "access_key", "endpoint", "base_url"])
-            if has_creds:
-                self.provider_combo.addItem(display_name, userData={"key": service_key, "config": config})
-                count += 1
+        for display_name, service_key, config in configured_providers(self.settings):
+            self.provider_combo.addItem(display_name, userData={"key": service_key, "config": config})
+            count += 1
             
         if count == 0:
              self.provider_combo.addItem("No Configured Services Found", userData=None)
+        elif len(pool_members(self.settings)) > 1:
+            self.provider_combo.addItem(POOL_LABEL, userData={"key": POOL_KEY, "config": {}})
 
         self.provider_combo.blockSignals(False)
         # Trigger update for initial selection (if items exist)
@@ -280,6 +296,12 @@ class TranslationPage(QWidget):
 
         service_key = data.get("key")
         config = data.get("config", {})
+
+        # Pool members each use their own configured model
+        self.model_combo.setEnabled(service_key != POOL_KEY)
+        if service_key == POOL_KEY:
+            self.model_combo.addItem("Per-service model")
+            return
         
         # 1. Configured Model (Highest Priority)
         configured_model = config.get("model", "").strip()
@@ -342,14 +364,10 @@ class TranslationPage(QWidget):
         # Get Model from COMBO BOX, not just config
         model_name = self.model_combo.currentText().strip()
         
-        # Base URL still from config
-        base_url = config.get("base_url", "").strip()
-        
-        # DeepSeek specific default URL if missing
-        if service_key == "deepseek" and not base_url:
-            base_url = "https://api.deepseek.com"
+        # Base URL still from config (DeepSeek has a default)
+        base_url = base_url_for(service_key, config)
         
-        if not api_key:
+        if not api_key and service_key != POOL_KEY:
              QMessageBox.warning(self, "Configuration Error", f"The selected service '{self.provider_combo.currentText()}' is missing an API Key.")
              return
 
@@ -358,30 +376,76 @@ class TranslationPage(QWidget):
         self.progress_bar.setValue(0)
         self.log_output.clear()
         
-        self.log_output.append(f"Using Service: {service_key}")
+        self.log_output.append(f"Using Service: {POOL_LABEL if service_key == POOL_KEY else service_key}")
         self.log_output.append(f"Model: {model_name}")
         self.log_output.append(f"Base URL: {base_url if base_url else 'Default'}")
         self.log_output.append("-" * 30)
         
-        self.worker = TranslationWorker(api_key, self.file_path, target_lang, model=model_name, base_url=base_url)
-        self.worker.log.connect(self.log_output.append)
-        self.worker.progress.connect(self.progress_bar.setValue)
-        self.worker.finished.connect(self.handle_finished)
-        self.worker.error.connect(self.handle_error)
-        self.worker.start()
+        context_cues = self.context_spin.value()
+        glossary = parse_glossary(self.glossary_edit.toPlainText())
+        self.settings.setValue("translation_context_cues", context_cues)
+        self.settings.setValue("translation_glossary", self.glossary_edit.toPlainText())
+        self.settings.setValue("translation_stream", self.stream_check.isChecked())
+        if context_cues or glossary:
+            self.log_output.append(f"Context: {context_cues} previous cue(s), glossary: {len(glossary)} term(s)")
+        
+        # Only the provider key is stored; the job looks the API key up when it starts
+        options = {
+            "provider_key": service_key, "model": model_name, "target_lang": target_lang,
+            "context_cues": context_cues, "glossary": glossary, "stream": self.stream_check.isChecked(),
+        }
+        self.job_id = self.scheduler.submit("translation", os.path.basename(self.file_path),
+                                            {"subtitle": self.file_path}, options)
+        self.stop_btn.setEnabled(True)
 
-    def handle_finished(self, content):
-        self.translated_content = content
+    def on_job_started(self, job_id, worker):
+        if job_id != self.job_id:
+            return
+        # A stopped job winds down in the background; only the current one updates the page
+        current = lambda handler: lambda *args: job_id == self.job_id and handler(*args)
+        worker.log.connect(current(self.log_output.append))
+        worker.progress.connect(current(self.progress_bar.setValue))
+        worker.cue_translated.connect(current(self.show_preview))
+        worker.finished.connect(current(self.handle_finished))
+        worker.error.connect(current(self.handle_error))
+
+    def show_preview(self, number, text):
+        elided = self.preview_label.fontMetrics().elidedText(
+            f"#{number}: {text}", Qt.TextElideMode.ElideRight, max(100, self.preview_label.width()))
+        self.preview_label.setText(elided)
+
+    def on_job_changed(self, job_id):
+        # Cancelled from the Jobs page: the worker reports nothing when stopped
+        if job_id == self.job_id and job_id not in self.scheduler.running:
+            job = self.scheduler.store.get(job_id)
+            if job and job["status"] == "cancelled":
+                self.job_id = None
+                self.log_output.append("Translation stopped.")
+                self.reset_controls()
+
+    def stop_translation(self):
+        if self.job_id is not None:
+            self.scheduler.cancel(self.job_id)
+            self.job_id = None
+            self.log_output.append("Stopping...")
+        self.reset_controls()
+
+    def reset_controls(self):
         self.translate_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
         self.progress_bar.setVisible(False)
+        self.preview_label.setText("")
+
+    def handle_finished(self, content):
+        self.translated_content = content
+        self.reset_controls()
         self.save_btn.setEnabled(True)
         self.log_output.append("\n--- Preview of Translation (Last 500 chars) ---\n")
         self.log_output.append(content[-500:])
         QMessageBox.information(self, "Success", "Translation completed successfully!")
 
     def handle_error(self, msg):
-        self.translate_btn.setEnabled(True)
-        self.progress_bar.setVisible(False)
+        self.reset_controls()
         QMessageBox.critical(self, "Error", f"Translation failed: {msg}")
         self.log_output.append(f"Error: {msg}")
 
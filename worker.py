@@ -1,28 +1,48 @@
 import os
 import whisper
-import requests # Added
 from PyQt6.QtCore import QThread, pyqtSignal
-
-WHISPER_CACHE_DIR = os.path.expanduser("~/.cache/whisper")
+from downloader import download_file, expected_sha256_from_url
+from model_inventory import WHISPER_CACHE_DIR, get_inventory
+from transcription_backends import get_backend
+from subtitles import resegment
+from instrumentation import get_recorder
+from resources import resource_slot
+from cancellation import CancelToken
+from cpu_config import transcription_slot, resolve_thread_config, apply_thread_config
+from quantize import quantize_checkpoint, quantized_filename
+from profiling import profiled
 
 class Worker(QThread):
     finished = pyqtSignal(object)
     error = pyqtSignal(str)
+    cancelled = pyqtSignal() # Stopped by stop(); emitted once the task has actually wound down
     log = pyqtSignal(str)
+    # (bytes done, total bytes, bytes/sec); objects because sizes exceed 32-bit int
+    download_progress = pyqtSignal(object, object, float)
 
-    def __init__(self, task_type, model_name, file_path=None, download_url=None):
+    def __init__(self, task_type, model_name, file_path=None, download_url=None, backend='whisper',
+                 segmentation=None):
         super().__init__()
-        self.task_type = task_type # 'download', 'transcribe', or 'download_custom'
+        self.task_type = task_type # 'download', 'transcribe', 'download_custom' or 'quantize'
         self.model_name = model_name
         self.file_path = file_path
         self.download_url = download_url
+        self.backend = backend # Transcription engine, see transcription_backends.BACKENDS
+        # Optional resegment() limits; enables word timestamps when set
+        self.segmentation = segmentation
+        self.token = CancelToken()
 
+    @profiled
     def run(self):
+        label = os.path.basename(self.file_path) if self.file_path else self.model_name
+        self.metrics = get_recorder().job(self.task_type, label)
         try:
             if self.task_type == 'download':
                 self.log.emit(f"Downloading standard model '{self.model_name}'...")
-                # This triggers the standard whisper download
-                whisper.load_model(self.model_name)
+                url = whisper._MODELS[self.model_name]
+                # Same file name whisper.load_model looks for, so it is picked up as-is
+                target_path = os.path.join(WHISPER_CACHE_DIR, os.path.basename(url))
+                self.download(url, target_path)
                 self.log.emit(f"Model '{self.model_name}' is ready.")
                 self.finished.emit(None)
 
@@ -31,44 +51,78 @@ class Worker(QThread):
                     raise ValueError("No URL provided for custom download.")
                 
                 self.log.emit(f"Connecting to {self.download_url}...")
-                
-                if not os.path.exists(WHISPER_CACHE_DIR):
-                    os.makedirs(WHISPER_CACHE_DIR)
-                
                 target_path = os.path.join(WHISPER_CACHE_DIR, self.model_name)
+                self.download(self.download_url, target_path)
                 
-                response = requests.get(self.download_url, stream=True)
-                response.raise_for_status()
-                
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded_size = 0
+                size_mb = os.path.getsize(target_path) / 1024 / 1024
+                self.log.emit(f"Custom model '{self.model_name}' downloaded successfully ({size_mb:.1f} MB).")
+                self.finished.emit(None)
+            
+            elif self.task_type == 'quantize':
+                entry = get_inventory().find(self.model_name)
+                if not entry or not entry["present"]:
+                    raise ValueError(f"Model '{self.model_name}' is not downloaded.")
                 
-                with open(target_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded_size += len(chunk)
-                            # Log progress periodically (e.g. every 5MB to avoid spam)
-                            if total_size > 0:
-                                percent = int((downloaded_size / total_size) * 100)
-                                if percent % 10 == 0 and percent > 0:
-                                     # Simple dedup logic or just emit - UI log usually appends
-                                     pass 
+                target_path = os.path.join(WHISPER_CACHE_DIR, quantized_filename(entry["file"]))
+                self.log.emit(f"Quantizing '{self.model_name}' to int8 (Linear layers)...")
+                # Standard names let whisper pick the right alignment heads
+                source = self.model_name if entry["standard"] else entry["path"]
+                with resource_slot("cpu", self.token, self.log.emit), \
+                        self.metrics.span("quantize", bytes=entry["size"]):
+                    quantize_checkpoint(source, target_path, cancel=self.token)
                 
-                self.log.emit(f"Custom model '{self.model_name}' downloaded successfully ({downloaded_size/1024/1024:.1f} MB).")
+                size_mb = os.path.getsize(target_path) / 1024 / 1024
+                self.log.emit(f"Saved {os.path.basename(target_path)} ({size_mb:.1f} MB, was {entry['size']/1024/1024:.1f} MB).")
                 self.finished.emit(None)
-            
+
             elif self.task_type == 'transcribe':
-                self.log.emit(f"Loading model '{self.model_name}'...")
-                model = whisper.load_model(self.model_name)
-                
                 if not self.file_path:
                     raise ValueError("No file path provided for transcription.")
                 
+                backend = get_backend(self.backend)
+                self.log.emit(f"Engine: {backend.label}")
                 self.log.emit(f"Starting transcription for: {os.path.basename(self.file_path)}")
-                result = model.transcribe(self.file_path)
+                options = {"word_timestamps": True} if self.segmentation else {}
+                with resource_slot("cpu", self.token, self.log.emit), transcription_slot() as slot:
+                    thread_config = resolve_thread_config(slot)
+                    apply_thread_config(thread_config, self.log.emit)
+                    result = backend.transcribe(
+                        self.model_name, self.file_path, log=self.log.emit,
+                        cpu_threads=thread_config["intra_threads"], metrics=self.metrics,
+                        cancel=self.token, **options
+                    )
+                
+                if self.segmentation:
+                    with self.metrics.span("resegment"):
+                        result["cues"] = resegment(result["segments"], **self.segmentation)
+                    self.log.emit(f"Re-segmented {len(result['segments'])} segments into {len(result['cues'])} cues.")
                 self.log.emit("Transcription complete.")
                 self.finished.emit(result)
 
         except Exception as e:
-            self.error.emit(str(e))
+            if self.token.cancelled: # Cancelled, DownloadCancelled or whatever the interrupted call raised
+                self.log.emit("Stopped.")
+                self.cancelled.emit()
+            else:
+                self.error.emit(str(e))
+
+    def stop(self):
+        """Interrupt the task: between decode steps, mid-download or between quantize steps."""
+        self.token.cancel()
+
+    def download(self, url, target_path):
+        expected_sha256 = expected_sha256_from_url(url)
+        if not expected_sha256:
+            self.log.emit("No checksum in URL; skipping integrity check.")
+        with resource_slot("network", self.token, self.log.emit), self.metrics.span("download", url=url) as span:
+            download_file(
+                url, target_path,
+                expected_sha256=expected_sha256,
+                progress=self.download_progress.emit,
+                should_stop=self.token,
+                log=self.log.emit
+            )
+            span["bytes"] = os.path.getsize(target_path)
+        if expected_sha256:
+            # Already hashed during the download; no need to re-verify later
+            get_inventory().mark_verified(target_path, expected_sha256)